@@ -17,6 +17,24 @@ class Settings(BaseSettings):
     minio_bucket_raw: str = "roborouter-raw"
     minio_bucket_processed: str = "roborouter-processed"
     presign_expires_seconds: int = 3600
+    # Presigned artifact URL cache: "memory" (per process) or "sqlite" (shared by a node's workers)
+    presign_cache_backend: str = "memory"
+    presign_cache_sqlite_path: str = "cache/presign.sqlite"
+    presign_cache_max_entries: int = 10_000
+    # Shared MinIO HTTP connection pool
+    minio_pool_maxsize: int = 32  # connections kept per endpoint; size for parallel part uploads
+    minio_pool_block: bool = True  # wait for a free connection instead of opening throwaway ones
+    minio_connect_timeout_s: float = 5.0
+    minio_read_timeout_s: float = 300.0
+    minio_http_retries: int = 3
+    minio_transfer_workers: int = 8  # concurrent objects in upload_many/download_many
+    # Per-process object metadata (size/content type/etag) cache used by artifact lookups
+    object_meta_cache_max_entries: int = 10_000
+    object_meta_cache_ttl_s: float = 300.0
+    # Node-local LRU cache of downloaded objects, shared by all worker processes
+    artifact_cache_enabled: bool = True
+    artifact_cache_dir: str = "cache/artifacts"
+    artifact_cache_max_bytes: int = 10 * 1024**3  # 0 disables eviction
 
     # CORS
     cors_origins: list[str] = ["http://localhost:5173", "http://127.0.0.1:5173"]
@@ -24,6 +42,14 @@ class Settings(BaseSettings):
     rate_limit_rpm: int = 120
     quota_rpm_per_key: int = 0  # 0 disables per-key quota
     retention_days: int = 30
+    cleanup_batch_scenes: int = 200  # scenes per bulk-delete + commit step
+    cleanup_job_workers: int = 1
+    cleanup_job_queue_max: int = 1  # one background retention cleanup at a time
+
+    # Uploads
+    upload_max_bytes: int = 20 * 1024**3  # 0 disables the limit
+    upload_chunk_bytes: int = 8 * 1024 * 1024
+    upload_direct_part_bytes: int = 64 * 1024 * 1024  # presigned multipart part size (min 5 MiB)
 
     # Ingest (PDAL) defaults
     ingest_voxel_size_m: float = 0.05
@@ -32,14 +58,43 @@ class Settings(BaseSettings):
     ingest_intensity_min: float = 0.0
     ingest_intensity_max: float = 1.0
 
+    # Tiled ingest for large LAS/LAZ inputs (XY tiles with an overlap buffer, processed in parallel)
+    ingest_tiled_enabled: bool = False
+    ingest_tiled_min_points: int = 20_000_000
+    ingest_tile_size_m: float = 250.0
+    ingest_tile_buffer_m: float = 2.0
+    ingest_tile_workers: int = 0  # 0 = one per CPU
+    # NumPy/SciPy filters used when PDAL is not installed or fails
+    ingest_numpy_fallback: bool = True
+    ingest_numpy_chunk_points: int = 2_000_000
+    ingest_numpy_tile_size_m: float = 100.0  # XY tile processed at once; bounds peak memory (margin: ingest_tile_buffer_m)
+    # Per-scene XY tile index written alongside the processed cloud (adds a split + upload per ingest)
+    ingest_tile_index_enabled: bool = False
+    ingest_tile_index_size_m: float = 50.0
+    # Optional per-attribute .npy columns written next to the processed cloud
+    ingest_columnar_enabled: bool = False
+    ingest_columnar_columns: str = "x,y,z,intensity,classification"
+
+    # Background ingest jobs (per-process worker pool)
+    ingest_job_workers: int = 2
+    ingest_job_queue_max: int = 32
+    # POST /ingest/batch
+    ingest_batch_concurrency: int = 4
+    ingest_batch_max_items: int = 500
+
     # Change detection defaults
     change_voxel_size_m: float = 0.10
     change_min_points_per_voxel: int = 3
 
-    # Registration (Open3D) defaults
+    # Registration defaults (Open3D FGR+ICP, or the NumPy/SciPy ICP engine)
+    reg_engine: str = "auto"  # auto | open3d | numpy | stub
     reg_voxel_size_m: float = 0.05
     reg_fgr_max_corr_mult: float = 1.5
     reg_icp_max_iter: int = 50
+    reg_icp_tolerance: float = 1e-6  # relative fitness/RMSE change that counts as converged (numpy engine)
+    reg_normal_k: int = 20  # neighbours for normal estimation (numpy engine)
+    reg_residual_sample_points: int = 0  # aligned points used for residuals; 0 = all
+    reg_residual_hist_bins: int = 50
 
     # Segmentation (MinkowskiEngine/KPConv)
     seg_use_minkowski: bool = False
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = "queued"  # queued | running | succeeded | failed
+    stage: str = "queued"
+    progress: float = 0.0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def update(self, stage: str, progress: float) -> None:
+        self.stage = stage
+        self.progress = round(min(1.0, max(self.progress, float(progress))), 3)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "meta": self.meta,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class JobManager:
+    """Bounded local worker pool for long-running work (per-process, in-memory).
+
+    At most ``max_workers`` jobs run at once and at most ``max_pending`` are queued or running;
+    further submissions raise QueueFullError. The most recent ``keep_finished`` finished jobs stay
+    queryable.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, keep_finished: int = 1000) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(1, int(max_pending))
+        self.keep_finished = max(1, int(keep_finished))
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        return self._executor
+
+    def active_count(self) -> int:
+        with self._lock:
+            return sum(1 for j in self._jobs.values() if not j.done)
+
+    def submit(
+        self,
+        kind: str,
+        fn: Callable[[Job], Dict[str, Any]],
+        *,
+        meta: Optional[Dict[str, Any]] = None,
+        on_finish: Optional[Callable[[], None]] = None,
+    ) -> Job:
+        job = Job(id=str(uuid.uuid4()), kind=kind, meta=dict(meta or {}))
+        with self._lock:
+            if sum(1 for j in self._jobs.values() if not j.done) >= self.max_pending:
+                raise QueueFullError(f"{kind} queue is full ({self.max_pending} pending)")
+            self._jobs[job.id] = job
+            self._evict_locked()
+        self._pool().submit(self._run, job, fn, on_finish)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], Dict[str, Any]], on_finish: Optional[Callable[[], None]]) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        status = "failed"
+        try:
+            job.result = fn(job)
+            status = "succeeded"
+        except Exception as exc:
+            # HTTPException carries the user-facing message in .detail
+            job.error = str(getattr(exc, "detail", None) or exc) or exc.__class__.__name__
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+        if on_finish is not None:
+            try:
+                on_finish()
+            except Exception:
+                logger.exception("Job %s cleanup failed", job.id)
+        # Publish the terminal state last so pollers never see a finished job mid-cleanup
+        job.finished_at = time.time()
+        if status == "succeeded":
+            job.update("done", 1.0)
+        else:
+            job.stage = "failed"
+        job.status = status
+
+    def _evict_locked(self) -> None:
+        finished = [jid for jid, j in self._jobs.items() if j.done]
+        for jid in finished[: max(0, len(finished) - self.keep_finished)]:
+            self._jobs.pop(jid, None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None, limit: int = 50) -> List[Job]:
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if kind is None or j.kind == kind]
+        return list(reversed(jobs))[: max(1, limit)]
+
+
+_MANAGERS: Dict[str, JobManager] = {}
+_MANAGERS_LOCK = threading.Lock()
+
+
+def get_job_manager(kind: str = "ingest") -> JobManager:
+    """Return the process-wide pool for ``kind``, sized by ``<kind>_job_workers``/``<kind>_job_queue_max``."""
+    with _MANAGERS_LOCK:
+        mgr = _MANAGERS.get(kind)
+        if mgr is None:
+            mgr = JobManager(
+                max_workers=int(getattr(settings, f"{kind}_job_workers", 2)),
+                max_pending=int(getattr(settings, f"{kind}_job_queue_max", 32)),
+            )
+            _MANAGERS[kind] = mgr
+        return mgr
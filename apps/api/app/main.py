@@ -26,6 +26,7 @@ from .routers.runs import router as runs_router
 from .routers.models import router as models_router
 from .routers.gates import router as gates_router
 from .routers.upload import router as upload_router
+from .storage.minio_client import provision_buckets
 
 
 app = FastAPI(
@@ -144,6 +145,12 @@ def _get_open3d_info() -> Dict[str, Any]:
         return {"available": False, "version": None}
 
 
+@app.on_event("startup")
+def provision_storage() -> None:
+    # Create the configured buckets once so object writes skip the per-call existence check
+    provision_buckets()
+
+
 @app.get("/health")
 def health() -> Dict[str, Any]:
     return {
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, String
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Float, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -83,3 +83,64 @@ class AuditLog(Base):
     )
 
 
+
+
+class IngestHash(Base):
+    """Content-addressed ingest index: raw input hash + ingest settings -> processed artifact."""
+
+    __tablename__ = "ingest_hashes"
+    __table_args__ = (
+        UniqueConstraint("input_sha256", "settings_key", name="uq_ingest_hashes_input_settings"),
+        Index("ix_ingest_hashes_output_sha256", "output_sha256"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    input_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    settings_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    output_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    input_size_bytes = Column(BigInteger, nullable=True)
+    scene_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("scenes.id", ondelete="CASCADE"), nullable=False
+    )
+    artifact_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("artifacts.id", ondelete="CASCADE"), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+
+
+class SceneTile(Base):
+    """One fixed-size XY tile of a scene's processed cloud, stored as its own object."""
+
+    __tablename__ = "scene_tiles"
+    __table_args__ = (
+        UniqueConstraint("scene_id", "ix", "iy", name="uq_scene_tiles_scene_cell"),
+        Index("ix_scene_tiles_scene_bbox", "scene_id", "minx", "maxx", "miny", "maxy"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    scene_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("scenes.id", ondelete="CASCADE"), nullable=False
+    )
+    artifact_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("artifacts.id", ondelete="CASCADE"), nullable=False
+    )
+    ix: Mapped[int] = mapped_column(nullable=False)
+    iy: Mapped[int] = mapped_column(nullable=False)
+    tile_size = Column(Float, nullable=False)
+    minx = Column(Float, nullable=False)
+    miny = Column(Float, nullable=False)
+    minz = Column(Float, nullable=False)
+    maxx = Column(Float, nullable=False)
+    maxy = Column(Float, nullable=False)
+    maxz = Column(Float, nullable=False)
+    point_count = Column(BigInteger, nullable=False)
+    uri: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
@@ -4,7 +4,7 @@ import time
 from typing import Callable
 
 from fastapi import FastAPI, Request
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, CollectorRegistry, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, CollectorRegistry, generate_latest
 from starlette.responses import Response
 
 
@@ -35,6 +35,24 @@ REQUEST_LATENCY = Histogram(
     ["service", "method", "endpoint"],
     buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
 )
+MINIO_POOL = Gauge(
+    "roborouter_minio_pool",
+    "MinIO HTTP connection pool counters (in_use, idle, opened, requests, waits)",
+    ["service", "stat"],
+)
+PRESIGN_CACHE = Counter(
+    "roborouter_presign_cache_total",
+    "Artifact presigned URL lookups by cache result (hit, miss)",
+    ["service", "result"],
+)
+
+
+def _refresh_pool_metrics() -> None:
+    from .storage.minio_client import pool_stats
+
+    stats = pool_stats()
+    for stat in ("in_use", "idle", "opened", "requests", "waits"):
+        MINIO_POOL.labels(SERVICE_NAME, stat).set(float(stats[stat]))
 
 
 def setup_metrics(app: FastAPI) -> None:
@@ -50,6 +68,7 @@ def setup_metrics(app: FastAPI) -> None:
 
     @app.get("/metrics")
     def metrics() -> Response:  # type: ignore[override]
+        _refresh_pool_metrics()
         data = generate_latest()
         return Response(content=data, media_type=CONTENT_TYPE_LATEST)
 
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from ..utils.tracing import span
+from .numpy_ingest import ensure_uncompressed
+from .pdal import LasHeader
+
+
+# Attribute name -> on-disk dtype of its .npy column
+COLUMN_DTYPES: Dict[str, str] = {
+    "x": "<f8",
+    "y": "<f8",
+    "z": "<f8",
+    "intensity": "<u2",
+    "classification": "u1",
+    "return_number": "u1",
+}
+DEFAULT_COLUMNS = ("x", "y", "z", "intensity", "classification")
+
+
+def _record_dtype(header: LasHeader) -> np.dtype:
+    # Formats 6-10 moved classification to its own byte and widened the return fields
+    legacy = header.point_format < 6
+    return np.dtype({
+        "names": ["X", "Y", "Z", "intensity", "returns", "classification"],
+        "formats": ["<i4", "<i4", "<i4", "<u2", "u1", "u1"],
+        "offsets": [0, 4, 8, 12, 14, 15 if legacy else 16],
+        "itemsize": header.record_length,
+    })
+
+
+def _decode(name: str, rec: np.ndarray, header: LasHeader) -> np.ndarray:
+    legacy = header.point_format < 6
+    if name in ("x", "y", "z"):
+        axis = "xyz".index(name)
+        return rec[name.upper()] * header.scale[axis] + header.offset[axis]
+    if name == "intensity":
+        return rec["intensity"]
+    if name == "classification":
+        return rec["classification"] & (0x1F if legacy else 0xFF)
+    if name == "return_number":
+        return rec["returns"] & (0x07 if legacy else 0x0F)
+    raise KeyError(name)
+
+
+def write_columns(
+    las_path: str,
+    out_dir: str,
+    *,
+    columns: Sequence[str] = DEFAULT_COLUMNS,
+    chunk_points: int = 2_000_000,
+) -> Dict[str, str]:
+    """Write one ``<name>.npy`` per attribute of a LAS/LAZ cloud; returns {name: path}.
+
+    Columns are filled chunk-wise through ``np.lib.format.open_memmap`` so memory stays bounded,
+    and readers can ``np.load(..., mmap_mode="r")`` only the attributes they need.
+    """
+    unknown = [c for c in columns if c not in COLUMN_DTYPES]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    src, header = ensure_uncompressed(las_path, str(out), chunk_points=chunk_points)
+    try:
+        n = header.point_count
+        records = np.memmap(src, dtype=_record_dtype(header), mode="r", offset=header.point_data_offset, shape=(n,))
+        paths = {c: str(out / f"{c}.npy") for c in columns}
+        with span("columnar.write"):
+            arrays = {
+                c: np.lib.format.open_memmap(paths[c], mode="w+", dtype=np.dtype(COLUMN_DTYPES[c]), shape=(n,))
+                for c in columns
+            }
+            for start in range(0, n, chunk_points):
+                stop = min(n, start + chunk_points)
+                rec = records[start:stop]
+                for c, arr in arrays.items():
+                    arr[start:stop] = _decode(c, rec, header)
+            for arr in arrays.values():
+                arr.flush()
+            del arrays
+        return paths
+    finally:
+        if src != las_path:
+            Path(src).unlink(missing_ok=True)
+
+
+def load_columns(col_dir: str, names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """Memory-map the requested columns (all present columns when ``names`` is None)."""
+    base = Path(col_dir)
+    wanted = list(names) if names is not None else [c for c in COLUMN_DTYPES if (base / f"{c}.npy").exists()]
+    return {c: np.load(base / f"{c}.npy", mmap_mode="r") for c in wanted}
+
+
+def xyz_from_columns(cols: Dict[str, np.ndarray]) -> np.ndarray:
+    """Stack x/y/z columns into an (n, 3) array."""
+    return np.column_stack([cols["x"], cols["y"], cols["z"]])
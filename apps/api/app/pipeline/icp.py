@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class IcpResult:
+    transformation: np.ndarray  # 4x4, maps source onto target
+    iterations: int
+    converged: bool
+    fitness: float  # share of source points with a correspondence within max_correspondence
+    inlier_rmse: float
+    history: list[float] = field(default_factory=list)  # inlier RMSE per iteration
+
+
+def voxel_downsample(xyz: np.ndarray, voxel_size: float) -> np.ndarray:
+    """Centroid of the points in each occupied voxel (Open3D ``voxel_down_sample`` semantics)."""
+    if len(xyz) == 0 or voxel_size <= 0:
+        return xyz
+    keys = np.floor((xyz - xyz.min(axis=0)) / voxel_size).astype(np.int64)
+    dims = keys.max(axis=0) + 1
+    if float(dims[0]) * float(dims[1]) * float(dims[2]) < 2.0**62:
+        packed = (keys[:, 0] * dims[1] + keys[:, 1]) * dims[2] + keys[:, 2]
+        _, inverse, counts = np.unique(packed, return_inverse=True, return_counts=True)
+    else:
+        _, inverse, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    sums = np.zeros((len(counts), 3), dtype=np.float64)
+    np.add.at(sums, inverse, xyz)
+    return sums / counts[:, None]
+
+
+def estimate_normals(xyz: np.ndarray, k: int = 20, *, chunk_points: int = 200_000) -> np.ndarray:
+    """Unit normals from the smallest-eigenvalue eigenvector of each point's k-NN covariance."""
+    from scipy.spatial import cKDTree  # type: ignore
+
+    n = len(xyz)
+    normals = np.zeros((n, 3), dtype=np.float64)
+    if n < 3:
+        normals[:, 2] = 1.0
+        return normals
+    k = max(3, min(int(k), n))
+    tree = cKDTree(xyz)
+    for start in range(0, n, chunk_points):
+        stop = min(n, start + chunk_points)
+        _, idx = tree.query(xyz[start:stop], k=k, workers=-1)
+        nbrs = xyz[idx]  # (m, k, 3)
+        centered = nbrs - nbrs.mean(axis=1, keepdims=True)
+        cov = np.einsum("mki,mkj->mij", centered, centered) / k
+        _, vecs = np.linalg.eigh(cov)  # ascending eigenvalues, batched
+        normals[start:stop] = vecs[:, :, 0]
+    return normals
+
+
+def _rotation_from_euler(rx: float, ry: float, rz: float) -> np.ndarray:
+    cx, sx, cy, sy, cz, sz = np.cos(rx), np.sin(rx), np.cos(ry), np.sin(ry), np.cos(rz), np.sin(rz)
+    return np.array([
+        [cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz],
+        [cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz],
+        [-sy, sx * cy, cx * cy],
+    ])
+
+
+def _point_to_plane_step(src: np.ndarray, dst: np.ndarray, normals: np.ndarray) -> Optional[np.ndarray]:
+    """Linearised point-to-plane update (small-angle), or None when the system is degenerate."""
+    a = np.hstack([np.cross(src, normals), normals])  # (n, 6)
+    b = np.einsum("ij,ij->i", dst - src, normals)
+    ata = a.T @ a
+    if np.linalg.cond(ata) > 1e12:
+        return None
+    x = np.linalg.solve(ata, a.T @ b)
+    t = np.eye(4)
+    t[:3, :3] = _rotation_from_euler(x[0], x[1], x[2])
+    t[:3, 3] = x[3:]
+    return t
+
+
+def _point_to_point_step(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Closed-form rigid update (Kabsch/SVD) minimising point-to-point distances."""
+    mu_s, mu_d = src.mean(axis=0), dst.mean(axis=0)
+    u, _, vt = np.linalg.svd((src - mu_s).T @ (dst - mu_d))
+    d = np.sign(np.linalg.det(vt.T @ u.T)) or 1.0
+    r = vt.T @ np.diag([1.0, 1.0, d]) @ u.T
+    t = np.eye(4)
+    t[:3, :3] = r
+    t[:3, 3] = mu_d - r @ mu_s
+    return t
+
+
+def icp_point_to_plane(
+    source: np.ndarray,
+    target: np.ndarray,
+    *,
+    max_correspondence: float,
+    max_iter: int = 50,
+    tolerance: float = 1e-6,
+    abs_tolerance: float = 1e-9,
+    normal_k: int = 20,
+    init: Optional[np.ndarray] = None,
+) -> IcpResult:
+    """Point-to-plane ICP of ``source`` onto ``target`` (both (n, 3) arrays, usually downsampled).
+
+    Each iteration does one batched cKDTree query (all cores) for correspondences within
+    ``max_correspondence`` and one 6x6 least-squares solve; a near-singular system (e.g. a
+    single plane) falls back to an SVD point-to-point step. Stops when both the fitness and the
+    inlier RMSE change by less than ``tolerance`` (relative), like Open3D's ICPConvergenceCriteria,
+    or by less than ``abs_tolerance`` so an exact fit (RMSE at rounding noise) also converges.
+    """
+    from scipy.spatial import cKDTree  # type: ignore
+
+    transform = np.eye(4) if init is None else np.asarray(init, dtype=np.float64).copy()
+    if len(source) == 0 or len(target) == 0:
+        return IcpResult(transformation=transform, iterations=0, converged=False, fitness=0.0, inlier_rmse=0.0)
+    tree = cKDTree(target)
+    normals = estimate_normals(target, normal_k)
+
+    fitness = rmse = 0.0
+    history: list[float] = []
+    converged = False
+    iterations = 0
+    for iterations in range(1, max(1, int(max_iter)) + 1):
+        moved = source @ transform[:3, :3].T + transform[:3, 3]
+        dist, idx = tree.query(moved, k=1, distance_upper_bound=max_correspondence, workers=-1)
+        valid = np.isfinite(dist)
+        n_valid = int(np.count_nonzero(valid))
+        if n_valid < 6:
+            break
+        new_fitness = n_valid / len(source)
+        new_rmse = float(np.sqrt(np.mean(dist[valid] ** 2)))
+        history.append(new_rmse)
+        if iterations > 1 and abs(new_fitness - fitness) <= max(tolerance * fitness, abs_tolerance) \
+                and abs(new_rmse - rmse) <= max(tolerance * rmse, abs_tolerance):
+            fitness, rmse, converged = new_fitness, new_rmse, True
+            break
+        fitness, rmse = new_fitness, new_rmse
+        src, dst = moved[valid], target[idx[valid]]
+        step = _point_to_plane_step(src, dst, normals[idx[valid]])
+        if step is None:
+            step = _point_to_point_step(src, dst)
+        transform = step @ transform
+    return IcpResult(
+        transformation=transform, iterations=iterations, converged=converged, fitness=fitness, inlier_rmse=rmse, history=history
+    )
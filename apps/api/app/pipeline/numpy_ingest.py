@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import logging
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from ..utils.tracing import span
+from .pdal import LasHeader, PipelineResult, StageMetadata, has_pdal, read_las_header, run_pipeline
+
+
+logger = logging.getLogger(__name__)
+
+
+def has_scipy() -> bool:
+    try:
+        import scipy.spatial  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+def has_laspy() -> bool:
+    try:
+        import laspy  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+def las_field_view(path: str, header: LasHeader) -> np.memmap:
+    # X/Y/Z/Intensity sit at the same offsets in every point format (0-10)
+    dtype = np.dtype({
+        "names": ["X", "Y", "Z", "intensity"],
+        "formats": ["<i4", "<i4", "<i4", "<u2"],
+        "offsets": [0, 4, 8, 12],
+        "itemsize": header.record_length,
+    })
+    return np.memmap(path, dtype=dtype, mode="r", offset=header.point_data_offset, shape=(header.point_count,))
+
+
+def las_xyz(path: str, header: LasHeader, *, chunk_points: int = 2_000_000) -> np.ndarray:
+    """Scaled (n, 3) float64 coordinates of an uncompressed LAS file, decoded chunk-wise."""
+    fields = las_field_view(path, header)
+    scale = np.asarray(header.scale, dtype=np.float64)
+    offset = np.asarray(header.offset, dtype=np.float64)
+    n = header.point_count
+    xyz = np.empty((n, 3), dtype=np.float64)
+    for start in range(0, n, chunk_points):
+        stop = min(n, start + chunk_points)
+        rec = fields[start:stop]
+        for axis, name in enumerate(("X", "Y", "Z")):
+            xyz[start:stop, axis] = rec[name] * scale[axis] + offset[axis]
+    return xyz
+
+
+def _record_view(path: str, header: LasHeader) -> np.memmap:
+    dtype = np.dtype((np.void, header.record_length))
+    return np.memmap(path, dtype=dtype, mode="r", offset=header.point_data_offset, shape=(header.point_count,))
+
+
+def convert_las(src: str, dst: str, *, compress: bool, chunk_points: int) -> None:
+    import laspy  # type: ignore
+
+    with laspy.open(src) as reader:
+        with laspy.open(dst, mode="w", header=reader.header, do_compress=compress) as writer:
+            for pts in reader.chunk_iterator(chunk_points):
+                writer.write_points(pts)
+
+
+def ensure_uncompressed(las_path: str, work_dir: str, *, chunk_points: int = 2_000_000) -> Tuple[str, LasHeader]:
+    """Return (path, header) of an uncompressed LAS copy of ``las_path`` (itself when already LAS).
+
+    LAZ is decompressed with laspy when installed, otherwise with PDAL.
+    """
+    header = read_las_header(las_path)
+    if header is None:
+        raise ValueError("Not a LAS/LAZ file")
+    if not header.compressed:
+        return las_path, header
+    dst = str(Path(work_dir) / f"{Path(las_path).stem}.decompressed.las")
+    with span("las.decompress"):
+        if has_laspy():
+            convert_las(las_path, dst, compress=False, chunk_points=chunk_points)
+        elif has_pdal():
+            run_pipeline({"pipeline": [
+                {"type": "readers.las", "filename": las_path},
+                {"type": "writers.las", "filename": dst, "compression": "none", "forward": "all"},
+            ]})
+        else:
+            raise RuntimeError("Decompressing LAZ requires laspy or PDAL")
+    header = read_las_header(dst)
+    if header is None:
+        raise ValueError("Failed to decompress LAZ input")
+    return dst, header
+
+
+def voxel_first_indices(xyz: np.ndarray, leaf: float, *, origin: Optional[np.ndarray] = None) -> np.ndarray:
+    """Indices of the first point in each occupied voxel, in input order.
+
+    Voxels are aligned on ``origin`` (default: the points' minimum corner).
+    """
+    if len(xyz) == 0 or leaf <= 0:
+        return np.arange(len(xyz))
+    keys = np.floor((xyz - (xyz.min(axis=0) if origin is None else origin)) / leaf).astype(np.int64)
+    keys -= keys.min(axis=0)
+    dims = keys.max(axis=0) + 1
+    if float(dims[0]) * float(dims[1]) * float(dims[2]) < 2.0**62:
+        # Pack (i, j, k) into one int64 key; far cheaper to unique than rows
+        packed = (keys[:, 0] * dims[1] + keys[:, 1]) * dims[2] + keys[:, 2]
+        _, first = np.unique(packed, return_index=True)
+    else:
+        _, first = np.unique(keys, axis=0, return_index=True)
+    return np.sort(first)
+
+
+def xyz_bounds(xyz: np.ndarray) -> Dict[str, float]:
+    if len(xyz) == 0:
+        return {"minx": 0.0, "miny": 0.0, "minz": 0.0, "maxx": 0.0, "maxy": 0.0, "maxz": 0.0}
+    lo, hi = xyz.min(axis=0), xyz.max(axis=0)
+    return {
+        "minx": float(lo[0]), "miny": float(lo[1]), "minz": float(lo[2]),
+        "maxx": float(hi[0]), "maxy": float(hi[1]), "maxz": float(hi[2]),
+    }
+
+
+def write_las_subset(src: str, header: LasHeader, keep: np.ndarray, dst: str, bounds: Dict[str, float], *, chunk_points: int = 2_000_000) -> int:
+    """Copy the kept point records of an uncompressed LAS file, preserving header fields and (E)VLRs.
+
+    ``keep`` is either a boolean mask over all records or an array of record indices, written in
+    the given order (tile-ordered index arrays need not be ascending).
+    """
+    idx = np.flatnonzero(keep) if keep.dtype == bool else np.asarray(keep, dtype=np.int64)
+    with open(src, "rb") as f:
+        prefix = bytearray(f.read(header.point_data_offset))
+        evlrs = b""
+        if header.evlr_count and header.evlr_start:
+            f.seek(header.evlr_start)
+            evlrs = f.read()
+    count = int(len(idx))
+    prefix[104] &= 0x3F  # output is never compressed here
+    legacy = count if (header.point_format < 6 and count <= 0xFFFFFFFF) else 0
+    struct.pack_into("<I", prefix, 107, legacy)
+    struct.pack_into("<5I", prefix, 111, 0, 0, 0, 0, 0)
+    struct.pack_into(
+        "<6d", prefix, 179,
+        bounds["maxx"], bounds["minx"], bounds["maxy"], bounds["miny"], bounds["maxz"], bounds["minz"],
+    )
+    if header.header_size >= 235:
+        struct.pack_into("<Q", prefix, 227, 0)  # waveform packets are not carried over
+    if header.header_size >= 375:
+        evlr_start = header.point_data_offset + count * header.record_length if evlrs else 0
+        struct.pack_into("<QI", prefix, 235, evlr_start, header.evlr_count if evlrs else 0)
+        struct.pack_into("<Q", prefix, 247, count)
+        struct.pack_into("<15Q", prefix, 255, *([0] * 15))
+
+    records = _record_view(src, header)
+    with open(dst, "wb") as out:
+        out.write(prefix)
+        for start in range(0, count, chunk_points):
+            out.write(np.asarray(records[idx[start:start + chunk_points]]).tobytes())
+        out.write(evlrs)
+    return count
+
+
+# Bounded-memory processing: points are bucketed into XY tiles (record indices spilled to disk),
+# and each tile is loaded with a ``buffer`` margin so k-NN queries near its edges still see their
+# neighbours. Peak memory follows the largest tile, not the whole cloud. Tile edges sit on voxel
+# boundaries, so the voxel grid never splits a voxel across tiles.
+
+
+class _TileBuckets:
+    """Per-tile record indices (core points and buffer-margin points) spilled to ``root``."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.tiles: Set[Tuple[int, int]] = set()
+
+    def _path(self, tile: Tuple[int, int], kind: str) -> Path:
+        return self.root / f"{tile[0]}_{tile[1]}.{kind}"
+
+    def append(self, tile: Tuple[int, int], kind: str, idx: np.ndarray) -> None:
+        if kind == "core":
+            self.tiles.add(tile)
+        with open(self._path(tile, kind), "ab") as f:
+            f.write(np.ascontiguousarray(idx, dtype=np.int64).tobytes())
+
+    def load(self, tile: Tuple[int, int], kind: str) -> np.ndarray:
+        path = self._path(tile, kind)
+        if not path.exists():
+            return np.zeros(0, dtype=np.int64)
+        return np.fromfile(path, dtype=np.int64)
+
+
+def _scaled_xyz(rec: np.ndarray, scale: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    return np.stack([rec[name] * scale[axis] + offset[axis] for axis, name in enumerate(("X", "Y", "Z"))], axis=1)
+
+
+def _bucket_tiles(
+    fields: np.memmap,
+    scale: np.ndarray,
+    offset: np.ndarray,
+    origin: np.ndarray,
+    tile_size: float,
+    buffer: float,
+    buckets: _TileBuckets,
+    *,
+    voxel_size: float,
+    chunk_points: int,
+) -> None:
+    n = len(fields)
+    per_tile = max(1, round(tile_size / voxel_size)) if voxel_size > 0 else 0
+    for start in range(0, n, chunk_points):
+        stop = min(n, start + chunk_points)
+        xy = _scaled_xyz(fields[start:stop], scale, offset)[:, :2] - origin[:2]
+        if per_tile:
+            # Derived from the voxel keys themselves so a voxel can never straddle two tiles
+            tij = np.floor(xy / voxel_size).astype(np.int64) // per_tile
+        else:
+            tij = np.floor(xy / tile_size).astype(np.int64)
+        local = xy - tij * tile_size
+        # Neighbouring tiles whose buffered box also contains the point (-1, 0 or +1 per axis)
+        step = np.where(local < buffer, -1, np.where(local > tile_size - buffer, 1, 0))
+        idx = np.arange(start, stop, dtype=np.int64)
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            if (dx, dy) == (0, 0):
+                sel = np.ones(len(idx), dtype=bool)
+                target = tij
+            else:
+                sel = ((step[:, 0] != 0) if dx else True) & ((step[:, 1] != 0) if dy else True)
+                target = tij + step * np.array([dx, dy])
+            kind = "core" if (dx, dy) == (0, 0) else "buf"
+            if not np.any(sel):
+                continue
+            keys, inverse = np.unique(target[sel], axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            chosen = idx[sel]
+            for k, key in enumerate(keys):
+                buckets.append((int(key[0]), int(key[1])), kind, chosen[inverse == k])
+
+
+def run_numpy_ingest(
+    input_path: str,
+    output_path: str,
+    *,
+    voxel_size: float,
+    stddev_mult: float,
+    mean_k: int,
+    intensity_min: float,
+    intensity_max: float,
+    chunk_points: int = 2_000_000,
+    tile_size: float = 100.0,
+    buffer: float = 2.0,
+) -> PipelineResult:
+    """Pure NumPy/SciPy version of ``build_ingest_pipeline``'s stages for hosts without PDAL.
+
+    Statistical outlier removal (cKDTree k-NN) -> voxel grid (first point per hashed voxel key)
+    -> intensity range. Records are read through a memmap and processed per XY tile of about
+    ``tile_size`` metres with a ``buffer`` margin, so memory is bounded by the largest tile. The
+    outlier threshold stays global: a first pass stores each point's mean k-NN distance in a
+    disk-backed array, a second pass filters. Output records are written in tile order.
+    Reprojection is not performed; the input SRS VLRs are preserved. LAZ output requires laspy
+    with a LAZ backend; LAZ input is decompressed with laspy or PDAL.
+    """
+    header = read_las_header(input_path)
+    if header is None:
+        raise ValueError("NumPy ingest requires a LAS/LAZ input")
+    work_dir = Path(output_path).parent
+    scratch_dir = Path(tempfile.mkdtemp(prefix="numpy_ingest_", dir=str(work_dir)))
+    try:
+        src, header = ensure_uncompressed(input_path, str(scratch_dir), chunk_points=chunk_points)
+        n = header.point_count
+        fields = las_field_view(src, header)
+        scale = np.asarray(header.scale, dtype=np.float64)
+        offset = np.asarray(header.offset, dtype=np.float64)
+        b = header.bounds
+        origin = np.array([b["minx"], b["miny"], b["minz"]], dtype=np.float64)
+        if voxel_size > 0:
+            tile_size = max(1, round(tile_size / voxel_size)) * voxel_size
+        buffer = min(max(0.0, buffer), tile_size / 2.0)
+
+        stages: Dict[str, StageMetadata] = {
+            "readers.las": StageMetadata(name="readers.las", count=n, bounds=dict(b), srs=header.srs),
+        }
+        buckets = _TileBuckets(scratch_dir / "tiles")
+        with span("ingest.numpy.bucket"):
+            _bucket_tiles(fields, scale, offset, origin, tile_size, buffer, buckets, voxel_size=voxel_size, chunk_points=chunk_points)
+        tiles = sorted(buckets.tiles)
+
+        # Pass 1: mean k-NN distance of every point, seen with its tile's buffer margin
+        use_outlier = mean_k > 0 and n > mean_k and has_scipy()
+        if mean_k > 0 and n > mean_k and not use_outlier:
+            logger.warning("SciPy not installed; skipping statistical outlier removal")
+        mean_dist: Optional[np.memmap] = None
+        threshold = np.inf
+        if use_outlier:
+            from scipy.spatial import cKDTree  # type: ignore
+
+            mean_dist = np.memmap(scratch_dir / "mean_dist.f8", dtype=np.float64, mode="w+", shape=(n,))
+            total = total_sq = 0.0
+            finite = 0
+            with span("ingest.numpy.outlier"):
+                for tile in tiles:
+                    core = buckets.load(tile, "core")
+                    pts = _scaled_xyz(fields[np.concatenate([core, buckets.load(tile, "buf")])], scale, offset)
+                    tree = cKDTree(pts)
+                    md = np.empty(len(core), dtype=np.float64)
+                    for start in range(0, len(core), chunk_points):
+                        stop = min(len(core), start + chunk_points)
+                        # k + 1 because every point is its own nearest neighbour; too few neighbours -> inf
+                        dist, _ = tree.query(pts[start:stop], k=mean_k + 1, workers=-1)
+                        md[start:stop] = dist[:, 1:].mean(axis=1)
+                    mean_dist[core] = md
+                    ok = md[np.isfinite(md)]
+                    total += float(ok.sum())
+                    total_sq += float((ok * ok).sum())
+                    finite += len(ok)
+            if finite:
+                mu = total / finite
+                threshold = mu + stddev_mult * float(np.sqrt(max(0.0, total_sq / finite - mu * mu)))
+
+        # Pass 2: outlier threshold -> voxel grid -> intensity range, kept indices spilled to disk
+        counts = {"outlier": 0, "voxel": 0, "range": 0}
+        lo = np.full(3, np.inf)
+        hi = np.full(3, -np.inf)
+        keep_path = scratch_dir / "keep.idx"
+        with span("ingest.numpy.filter"), open(keep_path, "wb") as keep_file:
+            for tile in tiles:
+                core = buckets.load(tile, "core")
+                if mean_dist is not None:
+                    core = core[np.asarray(mean_dist[core]) <= threshold]
+                counts["outlier"] += len(core)
+                rec = fields[core]
+                xyz = _scaled_xyz(rec, scale, offset)
+                first = voxel_first_indices(xyz, voxel_size, origin=origin)
+                core, xyz, intensity = core[first], xyz[first], rec["intensity"][first]
+                counts["voxel"] += len(core)
+                ok = (intensity >= intensity_min) & (intensity <= intensity_max)
+                core, xyz = core[ok], xyz[ok]
+                counts["range"] += len(core)
+                if len(core):
+                    lo = np.minimum(lo, xyz.min(axis=0))
+                    hi = np.maximum(hi, xyz.max(axis=0))
+                    keep_file.write(core.astype(np.int64).tobytes())
+        stages["filters.statisticaloutlier"] = StageMetadata(name="filters.statisticaloutlier", count=counts["outlier"])
+        stages["filters.voxelgrid"] = StageMetadata(name="filters.voxelgrid", count=counts["voxel"])
+        stages["filters.range"] = StageMetadata(name="filters.range", count=counts["range"])
+
+        if counts["range"]:
+            bounds = {
+                "minx": float(lo[0]), "miny": float(lo[1]), "minz": float(lo[2]),
+                "maxx": float(hi[0]), "maxy": float(hi[1]), "maxz": float(hi[2]),
+            }
+            keep = np.memmap(keep_path, dtype=np.int64, mode="r", shape=(counts["range"],))
+        else:
+            bounds = xyz_bounds(np.zeros((0, 3)))
+            keep = np.zeros(0, dtype=np.int64)
+        out_las = output_path
+        compress = output_path.lower().endswith(".laz") and has_laspy()
+        if compress:
+            out_las = str(scratch_dir / f"{Path(output_path).stem}.out.las")
+        with span("ingest.numpy.write"):
+            count = write_las_subset(src, header, keep, out_las, bounds, chunk_points=chunk_points)
+            del keep, fields, mean_dist
+            if compress:
+                try:
+                    convert_las(out_las, output_path, compress=True, chunk_points=chunk_points)
+                except Exception:
+                    logger.warning("LAZ compression unavailable; writing uncompressed LAS", exc_info=True)
+                    shutil.copyfile(out_las, output_path)
+        stages["filters.info"] = StageMetadata(name="filters.info", count=count, bounds=bounds, srs=header.srs)
+        return PipelineResult(stages=stages)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
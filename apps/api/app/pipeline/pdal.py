@@ -1,16 +1,144 @@
 from __future__ import annotations
 
 import json
+import math
+import os
 import shutil
+import struct
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 def has_pdal() -> bool:
     return shutil.which("pdal") is not None
 
 
+@dataclass(frozen=True)
+class LasHeader:
+    version: str
+    point_format: int
+    compressed: bool
+    point_count: int
+    scale: Tuple[float, float, float]
+    offset: Tuple[float, float, float]
+    bounds: Dict[str, float]
+    srs: Optional[str]
+    header_size: int = 227
+    point_data_offset: int = 227
+    record_length: int = 20
+    evlr_start: int = 0
+    evlr_count: int = 0
+
+
+# GeoKeyDirectory keys that carry an EPSG code (projected, geographic)
+_GEOKEY_EPSG = (3072, 2048)
+
+
+def _srs_from_geokeys(data: bytes) -> Optional[str]:
+    if len(data) < 8:
+        return None
+    n_keys = struct.unpack_from("<H", data, 6)[0]
+    keys: Dict[int, int] = {}
+    for i in range(n_keys):
+        off = 8 + i * 8
+        if off + 8 > len(data):
+            break
+        key_id, location, _count, value = struct.unpack_from("<4H", data, off)
+        # location 0 means the value is stored inline
+        if location == 0:
+            keys[key_id] = value
+    for key_id in _GEOKEY_EPSG:
+        code = keys.get(key_id)
+        if code and code != 32767:  # 32767 = user-defined
+            return f"EPSG:{code}"
+    return None
+
+
+def _srs_from_vlrs(f, start: int, count: int, *, extended: bool = False) -> Optional[str]:  # type: ignore[no-untyped-def]
+    """Scan (E)VLRs for LASF_Projection records; WKT wins over GeoTIFF keys."""
+    header_size = 60 if extended else 54
+    wkt: Optional[str] = None
+    geokeys: Optional[str] = None
+    f.seek(start)
+    for _ in range(count):
+        hdr = f.read(header_size)
+        if len(hdr) < header_size:
+            break
+        user_id = hdr[2:18].split(b"\0", 1)[0].decode("ascii", "ignore")
+        record_id = struct.unpack_from("<H", hdr, 18)[0]
+        length = struct.unpack_from("<Q" if extended else "<H", hdr, 20)[0]
+        if user_id == "LASF_Projection" and record_id in (2112, 34735):
+            payload = f.read(length)
+            if record_id == 2112:
+                wkt = payload.split(b"\0", 1)[0].decode("utf-8", "ignore").strip() or None
+            else:
+                geokeys = _srs_from_geokeys(payload)
+        else:
+            f.seek(length, os.SEEK_CUR)
+    return wkt or geokeys
+
+
+@lru_cache(maxsize=256)
+def _read_las_header_cached(path: str, size: int, mtime_ns: int) -> Optional[LasHeader]:
+    # size/mtime_ns are part of the cache key so rewritten files are re-read
+    with open(path, "rb") as f:
+        head = f.read(375)
+        if len(head) < 227 or head[:4] != b"LASF":
+            return None
+        major, minor = head[24], head[25]
+        header_size = struct.unpack_from("<H", head, 94)[0]
+        point_data_offset = struct.unpack_from("<I", head, 96)[0]
+        record_length = struct.unpack_from("<H", head, 105)[0]
+        n_vlrs = struct.unpack_from("<I", head, 100)[0]
+        raw_format = head[104]
+        point_count = struct.unpack_from("<I", head, 107)[0]
+        scale = struct.unpack_from("<3d", head, 131)
+        offset = struct.unpack_from("<3d", head, 155)
+        maxx, minx, maxy, miny, maxz, minz = struct.unpack_from("<6d", head, 179)
+        evlr_start, n_evlrs = 0, 0
+        if (major, minor) >= (1, 4) and len(head) >= 255:
+            evlr_start, n_evlrs = struct.unpack_from("<QI", head, 235)
+            point_count = struct.unpack_from("<Q", head, 247)[0] or point_count
+        srs = _srs_from_vlrs(f, header_size, n_vlrs)
+        if not srs and n_evlrs and evlr_start:
+            srs = _srs_from_vlrs(f, evlr_start, n_evlrs, extended=True)
+    return LasHeader(
+        version=f"{major}.{minor}",
+        # LAZ sets the top bits of the point format id to flag compression
+        point_format=raw_format & 0x3F,
+        compressed=bool(raw_format & 0xC0),
+        point_count=int(point_count),
+        scale=(float(scale[0]), float(scale[1]), float(scale[2])),
+        offset=(float(offset[0]), float(offset[1]), float(offset[2])),
+        bounds={"minx": minx, "miny": miny, "minz": minz, "maxx": maxx, "maxy": maxy, "maxz": maxz},
+        srs=srs,
+        header_size=int(header_size),
+        point_data_offset=int(point_data_offset),
+        record_length=int(record_length),
+        evlr_start=int(evlr_start),
+        evlr_count=int(n_evlrs),
+    )
+
+
+def read_las_header(file_path: str) -> Optional[LasHeader]:
+    """Read the LAS/LAZ public header block (and projection VLRs) in-process.
+
+    Results are cached per (path, size, mtime), so repeated lookups during one ingest cost a stat.
+    Returns None for non-LAS inputs or unreadable files.
+    """
+    try:
+        p = Path(file_path).resolve()
+        st = p.stat()
+        return _read_las_header_cached(str(p), st.st_size, st.st_mtime_ns)
+    except Exception:
+        return None
+
+
 def build_ingest_pipeline(
     input_path: str,
     output_path: str,
@@ -21,7 +149,16 @@ def build_ingest_pipeline(
     intensity_min: float,
     intensity_max: float,
     out_srs: Optional[str] | None = None,
+    with_info: bool = False,
+    keep_expression: Optional[str] = None,
 ) -> Dict:
+    """Build the ingest pipeline JSON.
+
+    With ``with_info`` a ``filters.info`` stage is placed before the writer so that
+    ``run_pipeline(..., metadata=True)`` reports output count/bounds/SRS in the same pass.
+    ``keep_expression`` filters points (before reprojection) after the other filters ran;
+    tiled ingest uses it to drop a tile's overlap buffer.
+    """
     # Reader autodetect for common formats (E57/PLY/LAS/LAZ). Fallback to implicit reader via path string.
     reader_stage: str | Dict[str, str]
     lower = input_path.lower()
@@ -40,18 +177,235 @@ def build_ingest_pipeline(
         {"type": "filters.voxelgrid", "leaf_x": voxel_size, "leaf_y": voxel_size, "leaf_z": voxel_size},
         {"type": "filters.range", "limits": f"Intensity[{intensity_min}:{intensity_max}]"},
     ]
+    if keep_expression:
+        stages.append({"type": "filters.expression", "expression": keep_expression})
     if out_srs:
         stages.append({"type": "filters.reprojection", "out_srs": out_srs})
+    if with_info:
+        stages.append({"type": "filters.info", "tag": "output_info"})
     stages.append({"type": "writers.las", "filename": output_path})
     return {"pipeline": stages}
 
 
-def run_pipeline(pipeline: Dict) -> None:
+@dataclass
+class StageMetadata:
+    name: str
+    count: Optional[int] = None
+    bounds: Optional[Dict[str, float]] = None
+    srs: Optional[str] = None
+
+
+@dataclass
+class PipelineResult:
+    """Per-stage metadata reported by a single ``pdal pipeline --metadata`` run."""
+
+    stages: Dict[str, StageMetadata]
+
+    @property
+    def input(self) -> Optional[StageMetadata]:
+        return next((m for n, m in self.stages.items() if n.startswith("readers.")), None)
+
+    @property
+    def output(self) -> Optional[StageMetadata]:
+        return self.stages.get("filters.info")
+
+
+def _bounds_from_metadata(md: Dict) -> Optional[Dict[str, float]]:
+    b = md.get("bbox") or md.get("bounds") or md.get("minmax") or md
+    if not isinstance(b, dict):
+        return None
+    # filters.info nests the native bbox one level down
+    if isinstance(b.get("native"), dict):
+        b = b["native"].get("bbox", b["native"])
+    try:
+        return {
+            "minx": float(b["minx"]),
+            "miny": float(b["miny"]),
+            "minz": float(b.get("minz", 0.0)),
+            "maxx": float(b["maxx"]),
+            "maxy": float(b["maxy"]),
+            "maxz": float(b.get("maxz", 0.0)),
+        }
+    except Exception:
+        return None
+
+
+def _srs_from_metadata(md: Dict) -> Optional[str]:
+    block = md.get("srs")
+    if isinstance(block, dict):
+        return block.get("proj4") or block.get("prettywkt") or block.get("wkt") or block.get("horizontal") or None
+    for key in ("comp_spatialreference", "spatialreference"):
+        if isinstance(md.get(key), str) and md[key]:
+            return md[key]
+    return None
+
+
+def parse_pipeline_metadata(meta: Dict) -> PipelineResult:
+    stages: Dict[str, StageMetadata] = {}
+    raw = meta.get("stages", meta.get("metadata", {})) if isinstance(meta, dict) else {}
+    for name, md in (raw or {}).items():
+        # Repeated stages are reported as a list; the last one describes the final state
+        if isinstance(md, list):
+            md = md[-1] if md else {}
+        if not isinstance(md, dict):
+            continue
+        count = md.get("count", md.get("num_points"))
+        stages[name] = StageMetadata(
+            name=name,
+            count=int(count) if isinstance(count, (int, float)) else None,
+            bounds=_bounds_from_metadata(md),
+            srs=_srs_from_metadata(md),
+        )
+    return PipelineResult(stages=stages)
+
+
+def run_pipeline(pipeline: Dict, *, metadata: bool = False) -> Optional[PipelineResult]:
+    """Execute a pipeline via ``pdal pipeline --stdin``.
+
+    With ``metadata=True`` PDAL writes its stage metadata to a temp file during the same run
+    and the parsed result is returned, so callers need no follow-up ``pdal info`` passes.
+    """
     cmd = ["pdal", "pipeline", "--stdin"]
-    subprocess.run(cmd, input=json.dumps(pipeline), text=True, check=True)
+    if not metadata:
+        subprocess.run(cmd, input=json.dumps(pipeline), text=True, check=True)
+        return None
+    with tempfile.TemporaryDirectory() as td:
+        meta_path = str(Path(td) / "metadata.json")
+        subprocess.run(cmd + ["--metadata", meta_path], input=json.dumps(pipeline), text=True, check=True)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return parse_pipeline_metadata(json.load(f))
+        except Exception:
+            return PipelineResult(stages={})
+
+
+@dataclass(frozen=True)
+class Tile:
+    ix: int
+    iy: int
+    core: Dict[str, float]
+    buffered: Dict[str, float]
+    last_x: bool
+    last_y: bool
+
+    @property
+    def name(self) -> str:
+        return f"{self.ix}_{self.iy}"
+
+    def crop_bounds(self) -> str:
+        b = self.buffered
+        return f"([{b['minx']!r}, {b['maxx']!r}], [{b['miny']!r}, {b['maxy']!r}])"
+
+    def core_expression(self) -> str:
+        # Half-open cells so seam points land in exactly one tile; the last row/column is closed
+        c = self.core
+        x_op = "<=" if self.last_x else "<"
+        y_op = "<=" if self.last_y else "<"
+        return f"X >= {c['minx']!r} && X {x_op} {c['maxx']!r} && Y >= {c['miny']!r} && Y {y_op} {c['maxy']!r}"
+
+
+def plan_tiles(bounds: Dict[str, float], tile_size: float, buffer: float) -> List[Tile]:
+    """Split XY bounds into a grid of ``tile_size`` cells, each padded by ``buffer``."""
+    if tile_size <= 0:
+        raise ValueError("tile_size must be positive")
+    minx, miny, maxx, maxy = bounds["minx"], bounds["miny"], bounds["maxx"], bounds["maxy"]
+    nx = max(1, math.ceil((maxx - minx) / tile_size))
+    ny = max(1, math.ceil((maxy - miny) / tile_size))
+    tiles: List[Tile] = []
+    for ix in range(nx):
+        for iy in range(ny):
+            core = {
+                "minx": minx + ix * tile_size,
+                "miny": miny + iy * tile_size,
+                "maxx": min(maxx, minx + (ix + 1) * tile_size),
+                "maxy": min(maxy, miny + (iy + 1) * tile_size),
+            }
+            buffered = {
+                "minx": core["minx"] - buffer,
+                "miny": core["miny"] - buffer,
+                "maxx": core["maxx"] + buffer,
+                "maxy": core["maxy"] + buffer,
+            }
+            tiles.append(Tile(ix, iy, core, buffered, ix == nx - 1, iy == ny - 1))
+    return tiles
+
+
+def should_tile(input_path: str, *, tile_size: float, min_points: int) -> Optional[LasHeader]:
+    """Return the input header when a LAS/LAZ file is large enough to be worth tiling."""
+    header = read_las_header(input_path)
+    if header is None or header.point_count < min_points:
+        return None
+    b = header.bounds
+    if (b["maxx"] - b["minx"]) <= tile_size and (b["maxy"] - b["miny"]) <= tile_size:
+        return None
+    return header
+
+
+def run_tiled_ingest(
+    input_path: str,
+    output_path: str,
+    work_dir: str,
+    *,
+    tile_size: float,
+    buffer: float,
+    workers: int = 0,
+    **pipeline_kwargs: Any,
+) -> PipelineResult:
+    """Run the ingest pipeline per XY tile in parallel and merge the results.
+
+    1. One PDAL pass reads the input and writes every buffered tile (crop branches).
+    2. Each tile runs the regular ingest pipeline in its own ``pdal`` process; the
+       outlier filter sees the buffer, then points outside the tile core are dropped.
+    3. A final pass merges the tile outputs into ``output_path``.
+    """
+    header = read_las_header(input_path)
+    if header is None:
+        raise ValueError("tiled ingest requires a LAS/LAZ input")
+    tiles = plan_tiles(header.bounds, tile_size, buffer)
+    tiles_dir = Path(work_dir) / "tiles"
+    tiles_dir.mkdir(parents=True, exist_ok=True)
+
+    split: List[Any] = [{"type": "readers.las", "filename": input_path, "tag": "src"}]
+    for t in tiles:
+        split.append({"type": "filters.crop", "inputs": ["src"], "bounds": t.crop_bounds(), "tag": f"crop_{t.name}"})
+        split.append({"type": "writers.las", "inputs": [f"crop_{t.name}"], "filename": str(tiles_dir / f"in_{t.name}.las")})
+    run_pipeline({"pipeline": split})
+
+    jobs: List[Tuple[Tile, str, str]] = []
+    for t in tiles:
+        tile_in = str(tiles_dir / f"in_{t.name}.las")
+        tile_header = read_las_header(tile_in)
+        if tile_header is None or tile_header.point_count == 0:
+            continue
+        jobs.append((t, tile_in, str(tiles_dir / f"out_{t.name}.las")))
+
+    def _process(job: Tuple[Tile, str, str]) -> str:
+        t, tile_in, tile_out = job
+        run_pipeline(build_ingest_pipeline(tile_in, tile_out, keep_expression=t.core_expression(), **pipeline_kwargs))
+        return tile_out
+
+    # Work happens in child pdal processes, so threads are enough to keep all cores busy
+    max_workers = workers if workers > 0 else (os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs) or 1))) as pool:
+        tile_outputs = list(pool.map(_process, jobs))
+
+    # Tiles whose points were all filtered out would only add empty readers to the merge
+    merge: List[Any] = [p for p in tile_outputs if getattr(read_las_header(p), "point_count", 1) > 0]
+    merge += [{"type": "filters.merge"}, {"type": "filters.info", "tag": "output_info"}, {"type": "writers.las", "filename": output_path}]
+    merged = run_pipeline({"pipeline": merge}, metadata=True) or PipelineResult(stages={})
+    # The merge pass reads the filtered tiles; the input stage must describe the source file
+    stages: Dict[str, StageMetadata] = {
+        "readers.las": StageMetadata(name="readers.las", count=header.point_count, bounds=dict(header.bounds), srs=header.srs),
+    }
+    stages.update((n, m) for n, m in merged.stages.items() if not n.startswith("readers."))
+    stages["tiles"] = StageMetadata(name="tiles", count=len(jobs))
+    return PipelineResult(stages=stages)
 
 
 def get_point_count(file_path: str) -> Optional[int]:
+    header = read_las_header(file_path)
+    if header is not None:
+        return header.point_count
     if not has_pdal():
         return None
     try:
@@ -73,7 +427,11 @@ def get_bounds_and_srs(file_path: str) -> Tuple[Optional[Dict[str, float]], Opti
     """Return (bounds, srs_wkt_or_name) using pdal info where possible.
 
     Bounds contains minx,miny,minz,maxx,maxy,maxz. SRS may be a WKT or EPSG string.
+    LAS/LAZ files are answered from the header reader without spawning PDAL.
     """
+    header = read_las_header(file_path)
+    if header is not None:
+        return dict(header.bounds), header.srs
     if not has_pdal():
         return None, None
     try:
@@ -1,11 +1,30 @@
 from __future__ import annotations
 
 import logging
+import shutil
+import struct
+import tempfile
 from dataclasses import dataclass
-from typing import Tuple
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
 
 from ..utils.tracing import span
 from ..config import settings
+from .columnar import load_columns, xyz_from_columns
+from .icp import icp_point_to_plane, voxel_downsample
+from .numpy_ingest import (
+    convert_las,
+    ensure_uncompressed,
+    has_laspy,
+    has_scipy,
+    las_field_view,
+    las_xyz,
+    write_las_subset,
+    xyz_bounds,
+)
+from .pdal import LasHeader, read_las_header
 
 logger = logging.getLogger(__name__)
 
@@ -26,19 +45,71 @@ def has_open3d() -> bool:
         return False
 
 
-def _register_with_open3d(input_path: str, output_path: str) -> RegistrationResult:
+def sample_indices(n: int, sample_size: int, *, seed: int = 0) -> np.ndarray:
+    """Sorted indices of a reproducible random sample of ``sample_size`` out of ``n`` (all when 0 or >= n)."""
+    if sample_size <= 0 or sample_size >= n:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(seed).choice(n, size=sample_size, replace=False))
+
+
+def nearest_distances(points: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Distance from each of ``points`` to its nearest neighbour in ``target`` (one cKDTree query on all cores)."""
+    if len(points) == 0 or len(target) == 0:
+        return np.zeros(0, dtype=np.float64)
+    from scipy.spatial import cKDTree  # type: ignore
+
+    dist, _ = cKDTree(target).query(points, k=1, workers=-1)
+    return np.asarray(dist, dtype=np.float64)
+
+
+def residual_stats(dists: np.ndarray, inlier_threshold: float, *, bins: int = 50, sample_keep: int = 1000) -> Dict[str, Any]:
+    """RMSE, inlier ratio, percentiles and a histogram of NN residuals.
+
+    ``rmse`` is over inliers (residual <= ``inlier_threshold``), like ICP's inlier RMSE; ``rmse_all``
+    covers every residual. The histogram spans [0, 3 * threshold] with larger residuals counted in
+    ``overflow``, so histograms of different scans share bins.
+    """
+    d = np.asarray(dists, dtype=np.float64)
+    n = int(d.size)
+    if n == 0:
+        return {"rmse": 0.0, "rmse_all": 0.0, "inlier_ratio": 1.0, "inlier_threshold": float(inlier_threshold), "sample_count": 0}
+    inliers = d <= inlier_threshold
+    n_in = int(np.count_nonzero(inliers))
+    sq = d * d
+    upper = 3.0 * inlier_threshold if inlier_threshold > 0 else float(d.max()) or 1.0
+    counts, edges = np.histogram(d, bins=max(1, bins), range=(0.0, upper))
+    p50, p95 = np.percentile(d, [50, 95])
+    return {
+        "rmse": float(np.sqrt(sq[inliers].mean())) if n_in else float(np.sqrt(sq.mean())),
+        "rmse_all": float(np.sqrt(sq.mean())),
+        "mean": float(d.mean()),
+        "median": float(p50),
+        "p95": float(p95),
+        "max": float(d.max()),
+        "inlier_ratio": n_in / n,
+        "inlier_threshold": float(inlier_threshold),
+        "sample_count": n,
+        "histogram": {
+            "edges": [float(e) for e in edges],
+            "counts": [int(c) for c in counts],
+            "overflow": int(np.count_nonzero(d > upper)),
+        },
+        "residuals_sample": [float(r) for r in d[:sample_keep]],
+    }
+
+
+def _register_with_open3d(input_path: str, output_path: str, target_path: Optional[str] = None) -> RegistrationResult:
     """Open3D pipeline: voxel downsample → FPFH → FGR → ICP refine.
 
-    Note: With a single input, we self-register (identity) to validate pipeline and compute metrics.
+    Note: Without ``target_path`` we self-register (identity) to validate pipeline and compute metrics.
     Writes a PLY/PCD aligned output if output extension is unsupported by Open3D.
     """
     import json
-    import math
     import open3d as o3d  # type: ignore
 
-    # Read once; use the same cloud as both source and target for now (identity transform)
+    # Without a target, use the same cloud as both source and target (identity transform)
     source_full = o3d.io.read_point_cloud(input_path)
-    target_full = source_full
+    target_full = o3d.io.read_point_cloud(target_path) if target_path else source_full
 
     # Parameters (could be surfaced via config)
     voxel_size = float(settings.reg_voxel_size_m)
@@ -67,7 +138,6 @@ def _register_with_open3d(input_path: str, output_path: str) -> RegistrationResu
 
     init = fgr_result.transformation if fgr_result and fgr_result.transformation is not None else o3d.geometry.get_rotation_matrix_from_xyz((0, 0, 0))
     if isinstance(init, list):  # defensive; ensure 4x4
-        import numpy as np  # type: ignore
         init = np.eye(4)
 
     # ICP refine (point-to-plane)
@@ -88,47 +158,219 @@ def _register_with_open3d(input_path: str, output_path: str) -> RegistrationResu
         out_path = output_path + ".ply"
     o3d.io.write_point_cloud(out_path, aligned)
 
-    # Compute residuals (NN distances after alignment) on a sampled subset
+    # Residuals: NN distance from every aligned point (or a sample) to the target, one batched query
     # For self-registration, residuals should be near zero.
-    import numpy as np  # type: ignore
     src_pts = np.asarray(aligned.points)
     tgt_pts = np.asarray(target_full.points)
-    residuals = []
-    if len(src_pts) > 0 and len(tgt_pts) > 0:
-        # Simple KDTree via Open3D
-        kdt = o3d.geometry.KDTreeFlann(target_full)
-        step = max(1, len(src_pts) // 5000)
-        for i in range(0, len(src_pts), step):
-            [_, idx, dist2] = kdt.search_knn_vector_3d(aligned.points[i], 1)
-            if len(dist2) > 0:
-                residuals.append(float(math.sqrt(dist2[0])))
-
-    # Metrics
-    rmse = float(icp_result.inlier_rmse) if icp_result and hasattr(icp_result, "inlier_rmse") else (sum(residuals) / len(residuals) if residuals else 0.0)
-    inlier_ratio = float(len([r for r in residuals if r <= distance_threshold_icp]) / len(residuals)) if residuals else 1.0
+    sample = sample_indices(len(src_pts), int(settings.reg_residual_sample_points))
+    if has_scipy():
+        dists = nearest_distances(src_pts[sample], tgt_pts)
+    else:
+        dists = np.asarray(aligned.select_by_index(sample.tolist()).compute_point_cloud_distance(target_full))
+    stats = residual_stats(dists, distance_threshold_icp, bins=int(settings.reg_residual_hist_bins))
+    stats["point_count"] = int(len(src_pts))
+    rmse = float(stats["rmse"])
+    inlier_ratio = float(stats["inlier_ratio"])
 
     residuals_path = out_path + ".residuals.json"
     try:
         with open(residuals_path, "w", encoding="utf-8") as f:
-            json.dump({"rmse": rmse, "inlier_ratio": inlier_ratio, "sample_count": len(residuals), "residuals_sample": residuals[:1000]}, f)
+            json.dump(stats, f)
     except Exception:
         pass
 
     return RegistrationResult(rmse=rmse, inlier_ratio=inlier_ratio, aligned_path=out_path, residuals_path=residuals_path)
 
 
-def register_clouds(input_path: str, output_path: str) -> RegistrationResult:
-    """Stub registration.
+def _is_column_dir(path: str) -> bool:
+    return Path(path).is_dir() and all((Path(path) / f"{c}.npy").exists() for c in ("x", "y", "z"))
+
+
+def _read_xyz(path: str, work_dir: str) -> Tuple[np.ndarray, Optional[Tuple[str, LasHeader]]]:
+    """(n, 3) coordinates of a LAS/LAZ, ``.npy``, whitespace/comma separated XYZ text file or a
+    columnar export directory, plus the uncompressed LAS source and header for LAS/LAZ inputs."""
+    lower = path.lower()
+    if _is_column_dir(path):
+        # Only the x/y/z columns are read (memory-mapped), never the other attributes
+        return np.ascontiguousarray(xyz_from_columns(load_columns(path, ("x", "y", "z"))), dtype=np.float64), None
+    if lower.endswith((".las", ".laz")):
+        src, header = ensure_uncompressed(path, work_dir)
+        return las_xyz(src, header), (src, header)
+    if lower.endswith(".npy"):
+        xyz = np.load(path)
+    else:
+        xyz = np.loadtxt(path, delimiter="," if lower.endswith(".csv") else None, ndmin=2)
+    return np.ascontiguousarray(xyz[:, :3], dtype=np.float64), None
+
+
+_INT32_MIN, _INT32_MAX = -(2**31), 2**31 - 1
+
+
+def _las_offsets(xyz: np.ndarray, header: LasHeader) -> Tuple[float, float, float]:
+    """Header offsets under which the aligned coordinates fit LAS's int32 records.
+
+    Keeps the input's offset per axis where it still fits, else re-centres it on the aligned
+    data; raises ValueError when an axis spans more than int32 at the header's scale.
+    """
+    offsets = list(header.offset)
+    if len(xyz) == 0:
+        return offsets[0], offsets[1], offsets[2]
+    lo, hi = xyz.min(axis=0), xyz.max(axis=0)
+    for axis in range(3):
+        scale = header.scale[axis]
+        if round((lo[axis] - offsets[axis]) / scale) >= _INT32_MIN and round((hi[axis] - offsets[axis]) / scale) <= _INT32_MAX:
+            continue
+        if (hi[axis] - lo[axis]) / scale >= float(_INT32_MAX - _INT32_MIN):
+            raise ValueError(f"Aligned {'XYZ'[axis]} range does not fit LAS int32 coordinates at scale {scale}")
+        offsets[axis] = float(np.round((lo[axis] + hi[axis]) / 2.0 / scale) * scale)
+    return offsets[0], offsets[1], offsets[2]
+
+
+def _write_aligned(input_path: str, las: Optional[Tuple[str, LasHeader]], xyz: np.ndarray, output_path: str, work_dir: str) -> str:
+    """Write the aligned coordinates in the input's format; returns the path written.
+
+    LAS/LAZ inputs keep every record and VLR; only X/Y/Z (and the header bounds) change.
+    """
+    lower = input_path.lower()
+    if las is not None:
+        out_path = output_path if output_path.lower().endswith((".las", ".laz")) else output_path + ".las"
+        src, header = las
+        compress = out_path.lower().endswith(".laz") and has_laspy()
+        las_path = str(Path(work_dir) / "aligned.out.las") if compress else out_path
+        offsets = _las_offsets(xyz, header)
+        write_las_subset(src, header, np.arange(header.point_count), las_path, xyz_bounds(xyz))
+        if offsets != tuple(header.offset):
+            # The transform moved the cloud out of the input offset's int32 window
+            with open(las_path, "r+b") as f:
+                f.seek(155)
+                f.write(struct.pack("<3d", *offsets))
+        fields = np.memmap(las_path, dtype=las_field_view(src, header).dtype, mode="r+", offset=header.point_data_offset, shape=(header.point_count,))
+        for axis, name in enumerate(("X", "Y", "Z")):
+            fields[name] = np.round((xyz[:, axis] - offsets[axis]) / header.scale[axis]).astype(np.int32)
+        fields.flush()
+        del fields
+        if compress:
+            try:
+                convert_las(las_path, out_path, compress=True, chunk_points=2_000_000)
+            except Exception:
+                logger.warning("LAZ compression unavailable; writing uncompressed LAS", exc_info=True)
+                shutil.copyfile(las_path, out_path)
+        return out_path
+    if lower.endswith(".npy") or _is_column_dir(input_path):
+        out_path = output_path if output_path.lower().endswith(".npy") else output_path + ".npy"
+        np.save(out_path, xyz)
+        return out_path
+    out_path = output_path if output_path.lower().endswith((".xyz", ".txt", ".csv")) else output_path + ".xyz"
+    np.savetxt(out_path, xyz, fmt="%.6f", delimiter="," if out_path.lower().endswith(".csv") else " ")
+    return out_path
+
+
+def _register_with_numpy(input_path: str, output_path: str, target_path: Optional[str] = None) -> RegistrationResult:
+    """NumPy/SciPy pipeline: voxel downsample -> point-to-plane ICP -> residuals on the full cloud.
 
-    If Open3D is available, this is where FGR+ICP would run and write `output_path`.
-    For now, we simulate success and write placeholder outputs.
+    There is no global (feature-based) stage, so inputs are assumed roughly pre-aligned (same CRS);
+    ICP correspondences are searched within ``reg_voxel_size_m * reg_fgr_max_corr_mult``. Without
+    ``target_path`` the cloud is registered against itself, like the Open3D path.
     """
-    if has_open3d() and (input_path.endswith(".ply") or input_path.endswith(".pcd")):
+    import json
+
+    voxel_size = float(settings.reg_voxel_size_m)
+    max_corr = voxel_size * float(settings.reg_fgr_max_corr_mult)
+    inlier_threshold = voxel_size * 0.7
+    work_dir = tempfile.mkdtemp(prefix="registration_", dir=str(Path(output_path).parent))
+    try:
+        source, las = _read_xyz(input_path, work_dir)
+        # Separate scratch dir: a target with the same file name must not clobber the source's LAS copy
+        target = _read_xyz(target_path, tempfile.mkdtemp(dir=work_dir))[0] if target_path else source
+        with span("registration.numpy.downsample"):
+            src_ds = voxel_downsample(source, voxel_size)
+            tgt_ds = voxel_downsample(target, voxel_size)
+        with span("registration.numpy.icp"):
+            icp = icp_point_to_plane(
+                src_ds,
+                tgt_ds,
+                max_correspondence=max_corr,
+                max_iter=int(settings.reg_icp_max_iter),
+                tolerance=float(settings.reg_icp_tolerance),
+                normal_k=int(settings.reg_normal_k),
+            )
+        aligned = source @ icp.transformation[:3, :3].T + icp.transformation[:3, 3]
+        out_path = _write_aligned(input_path, las, aligned, output_path, work_dir)
+        with span("registration.numpy.residuals"):
+            sample = sample_indices(len(aligned), int(settings.reg_residual_sample_points))
+            stats = residual_stats(nearest_distances(aligned[sample], target), inlier_threshold, bins=int(settings.reg_residual_hist_bins))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    stats.update({
+        "engine": "numpy",
+        "point_count": int(len(aligned)),
+        "transformation": icp.transformation.tolist(),
+        "icp": {
+            "iterations": icp.iterations,
+            "converged": icp.converged,
+            "fitness": icp.fitness,
+            "inlier_rmse": icp.inlier_rmse,
+            "downsampled_points": [int(len(src_ds)), int(len(tgt_ds))],
+        },
+    })
+    residuals_path = out_path + ".residuals.json"
+    try:
+        with open(residuals_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+    except Exception:
+        pass
+    return RegistrationResult(
+        rmse=float(stats["rmse"]), inlier_ratio=float(stats["inlier_ratio"]), aligned_path=out_path, residuals_path=residuals_path
+    )
+
+
+def _numpy_readable(path: str) -> bool:
+    if _is_column_dir(path):
+        return True
+    lower = path.lower()
+    if lower.endswith((".las", ".laz")):
+        return read_las_header(path) is not None
+    return lower.endswith((".npy", ".xyz", ".txt", ".csv"))
+
+
+def select_engine(input_path: str, engine: Optional[str] = None) -> str:
+    """Resolve ``engine`` (default ``reg_engine``): "auto" picks Open3D for PLY/PCD when installed,
+    else the NumPy engine for inputs it can read when SciPy is installed, else the stub."""
+    engine = (engine or settings.reg_engine or "auto").lower()
+    if engine != "auto":
+        return engine
+    if has_open3d() and input_path.lower().endswith((".ply", ".pcd")):
+        return "open3d"
+    if has_scipy() and _numpy_readable(input_path):
+        return "numpy"
+    return "stub"
+
+
+def register_clouds(input_path: str, output_path: str, *, target_path: Optional[str] = None, engine: Optional[str] = None) -> RegistrationResult:
+    """Register ``input_path`` onto ``target_path`` (itself when omitted) and write the aligned cloud.
+
+    Either path may be a scene's columnar export directory (``x.npy``/``y.npy``/``z.npy``), which
+    the NumPy engine reads without decoding the full point records.
+
+    ``engine`` is "open3d" (FGR + ICP), "numpy" (SciPy point-to-plane ICP), "stub" or "auto"
+    (default: ``settings.reg_engine``). A failing engine falls back to the stub, which writes
+    placeholder outputs.
+    """
+    chosen = select_engine(input_path, engine)
+    if chosen == "open3d":
         try:
             with span("registration.open3d"):
-                return _register_with_open3d(input_path, output_path)
+                return _register_with_open3d(input_path, output_path, target_path)
         except Exception:
             logger.exception("Open3D registration failed; falling back to stub")
+    elif chosen == "numpy":
+        try:
+            with span("registration.numpy"):
+                result = _register_with_numpy(input_path, output_path, target_path)
+            logger.info("Registered %s -> %s | rmse=%.4f inlier=%.3f", input_path, result.aligned_path, result.rmse, result.inlier_ratio)
+            return result
+        except Exception:
+            logger.exception("NumPy registration failed; falling back to stub")
 
     with span("registration.stub"):
         # Placeholder: write empty files
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+import math
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..utils.tracing import span
+from .numpy_ingest import _scaled_xyz, _TileBuckets, ensure_uncompressed, las_field_view, write_las_subset, xyz_bounds
+from .pdal import has_pdal, read_las_header, run_pipeline
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TileIndexEntry:
+    ix: int
+    iy: int
+    bounds: Dict[str, float]
+    point_count: int
+    path: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.ix}_{self.iy}"
+
+
+def _tile_coord(value: float, origin: float, tile_size: float) -> int:
+    return int(math.floor((value - origin) / tile_size))
+
+
+def _split_with_pdal(las_path: str, out_dir: Path, tile_size: float, origin_x: float, origin_y: float, suffix: str) -> List[TileIndexEntry]:
+    pipeline = {
+        "pipeline": [
+            {"type": "readers.las", "filename": las_path},
+            {"type": "filters.splitter", "length": float(tile_size), "origin_x": origin_x, "origin_y": origin_y},
+            {
+                "type": "writers.las",
+                "filename": str(out_dir / f"split_#{suffix}"),
+                "compression": "laszip" if suffix == ".laz" else "none",
+                "forward": "all",
+            },
+        ]
+    }
+    run_pipeline(pipeline)
+    entries: List[TileIndexEntry] = []
+    for path in sorted(out_dir.glob(f"split_*{suffix}")):
+        hdr = read_las_header(str(path))
+        if hdr is None or hdr.point_count == 0:
+            continue
+        b = hdr.bounds
+        # The splitter numbers views sequentially; recover the grid cell from the tile's centre
+        ix = _tile_coord((b["minx"] + b["maxx"]) / 2.0, origin_x, tile_size)
+        iy = _tile_coord((b["miny"] + b["maxy"]) / 2.0, origin_y, tile_size)
+        dest = out_dir / f"{ix}_{iy}{suffix}"
+        path.rename(dest)
+        entries.append(TileIndexEntry(ix=ix, iy=iy, bounds=dict(b), point_count=hdr.point_count, path=str(dest)))
+    return entries
+
+
+def _split_with_numpy(las_path: str, out_dir: Path, tile_size: float, origin_x: float, origin_y: float, chunk_points: int) -> List[TileIndexEntry]:
+    """Split in two streaming passes so memory follows ``chunk_points`` and the largest tile.
+
+    Pass 1 reads the records chunk by chunk and spills each point's index to its cell's bucket
+    file; pass 2 writes one tile at a time from its (ascending) bucket.
+    """
+    src, header = ensure_uncompressed(las_path, str(out_dir), chunk_points=chunk_points)
+    fields = las_field_view(src, header)
+    scale, offset = np.asarray(header.scale), np.asarray(header.offset)
+    origin = np.array([origin_x, origin_y])
+    scratch = Path(tempfile.mkdtemp(prefix=".split_", dir=str(out_dir)))
+    try:
+        buckets = _TileBuckets(scratch)
+        for start in range(0, len(fields), chunk_points):
+            stop = min(len(fields), start + chunk_points)
+            xy = _scaled_xyz(fields[start:stop], scale, offset)[:, :2]
+            cells = np.floor((xy - origin) / tile_size).astype(np.int64)
+            # One stable sort per chunk groups it by cell; each group keeps input order
+            keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+            order = np.argsort(inverse.reshape(-1), kind="stable")
+            bounds = np.searchsorted(inverse.reshape(-1)[order], np.arange(len(keys) + 1))
+            for k, key in enumerate(keys):
+                buckets.append((int(key[0]), int(key[1])), "core", start + order[bounds[k]:bounds[k + 1]])
+        entries: List[TileIndexEntry] = []
+        for cx, cy in sorted(buckets.tiles):
+            idx = buckets.load((cx, cy), "core")
+            tile_bounds = xyz_bounds(_scaled_xyz(fields[idx], scale, offset))
+            dest = out_dir / f"{cx}_{cy}.las"
+            count = write_las_subset(src, header, idx, str(dest), tile_bounds, chunk_points=chunk_points)
+            entries.append(TileIndexEntry(ix=cx, iy=cy, bounds=tile_bounds, point_count=count, path=str(dest)))
+    finally:
+        del fields
+        shutil.rmtree(scratch, ignore_errors=True)
+        if src != las_path:
+            Path(src).unlink(missing_ok=True)
+    return entries
+
+
+def build_tile_index(
+    las_path: str,
+    out_dir: str,
+    tile_size: float,
+    *,
+    origin: Optional[tuple[float, float]] = None,
+    chunk_points: int = 2_000_000,
+) -> List[TileIndexEntry]:
+    """Split a processed cloud into fixed-size XY tiles, one LAS/LAZ file per occupied cell.
+
+    Cells are ``tile_size`` squares anchored at ``origin`` (default: the cloud's min x/y), so
+    tile (ix, iy) covers [origin + ix*size, origin + (ix+1)*size). PDAL's filters.splitter is
+    used when available; otherwise the cloud is split in-process with NumPy, streaming
+    ``chunk_points`` records at a time.
+    """
+    if tile_size <= 0:
+        raise ValueError("tile_size must be positive")
+    header = read_las_header(las_path)
+    if header is None or header.point_count == 0:
+        return []
+    if origin is None:
+        origin = (header.bounds["minx"], header.bounds["miny"])
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    with span("ingest.tile_index"):
+        if has_pdal():
+            try:
+                suffix = ".laz" if header.compressed else ".las"
+                return _split_with_pdal(las_path, out, tile_size, origin[0], origin[1], suffix)
+            except Exception:
+                logger.warning("PDAL tile split failed; falling back to NumPy", exc_info=True)
+        return _split_with_numpy(las_path, out, tile_size, origin[0], origin[1], chunk_points)
+
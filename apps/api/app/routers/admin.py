@@ -3,15 +3,15 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import delete, select
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from ..config import settings
 from ..db import SessionLocal
-from ..models import Artifact, Metric, AuditLog, Scene
+from ..jobs import Job, QueueFullError, get_job_manager
+from ..storage.cleanup import run_retention_cleanup
 from ..storage.minio_client import get_minio_client
-from ..storage.utils import parse_s3_uri
 
 
 from ..deps import require_api_key, require_role, require_oidc_user
@@ -20,40 +20,52 @@ from ..deps import require_api_key, require_role, require_oidc_user
 router = APIRouter(dependencies=[Depends(require_api_key), Depends(require_role("admin")), Depends(require_oidc_user)])
 
 
-@router.post("/admin/cleanup")
-def cleanup_old_records() -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+def _cleanup(cutoff: datetime, job: Job | None = None) -> Dict[str, Any]:
     db: Session = SessionLocal()
     try:
-        cutoff = datetime.utcnow() - timedelta(days=int(settings.retention_days))
-        # Find scenes older than cutoff
-        scenes = db.execute(select(Scene).where(Scene.created_at < cutoff)).scalars().all()
-        # Best-effort S3 cleanup for their artifacts
-        try:
-            client = get_minio_client()
-            for s in scenes:
-                arts = db.execute(select(Artifact).where(Artifact.scene_id == s.id)).scalars().all()
-                for a in arts:
-                    if a.uri and a.uri.startswith("s3://"):
-                        try:
-                            bucket, key = parse_s3_uri(a.uri)
-                            client.remove_object(bucket, key)
-                        except Exception:
-                            pass
-        except Exception:
-            pass
-
-        a = db.execute(delete(Artifact).where(Artifact.created_at < cutoff)).rowcount or 0
-        m = db.execute(delete(Metric).where(Metric.created_at < cutoff)).rowcount or 0
-        l = db.execute(delete(AuditLog).where(AuditLog.created_at < cutoff)).rowcount or 0
-        s_del = db.execute(delete(Scene).where(Scene.created_at < cutoff)).rowcount or 0
-        db.commit()
-        return {"deleted": {"scenes": int(s_del), "artifacts": int(a), "metrics": int(m), "audit_logs": int(l)}, "cutoff": cutoff.isoformat(), "retention_days": settings.retention_days}
+        res = run_retention_cleanup(
+            db,
+            get_minio_client(),
+            cutoff,
+            batch_scenes=settings.cleanup_batch_scenes,
+            progress=job.update if job is not None else None,
+        )
+        return {**res, "cutoff": cutoff.isoformat(), "retention_days": settings.retention_days}
     finally:
         db.close()
 
 
+@router.post("/admin/cleanup")
+def cleanup_old_records(background: bool = False) -> Any:  # type: ignore[no-untyped-def]
+    """Delete scenes, artifacts, metrics and audit logs older than ``retention_days``.
+
+    Objects are removed with bulk deletes in scene batches, each committed as it completes, so a
+    run that times out or dies is resumed by calling this again. With ``background=true`` the
+    cleanup runs as a job (one at a time) polled at ``GET /admin/cleanup/jobs/{job_id}``.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=int(settings.retention_days))
+    if not background:
+        return _cleanup(cutoff)
+    try:
+        job = get_job_manager("cleanup").submit("cleanup", lambda j: _cleanup(cutoff, j), meta={"cutoff": cutoff.isoformat()})
+    except QueueFullError:
+        raise HTTPException(status_code=409, detail="A cleanup is already running")
+    status_url = f"/admin/cleanup/jobs/{job.id}"
+    return JSONResponse(
+        {"job_id": job.id, "status": job.status, "status_url": status_url},
+        status_code=202,
+        headers={"Location": status_url},
+    )
+
+
 @router.delete("/admin/cleanup")
-def cleanup_old_records_delete() -> Dict[str, Any]:  # type: ignore[no-untyped-def]
-    return cleanup_old_records()
+def cleanup_old_records_delete(background: bool = False) -> Any:  # type: ignore[no-untyped-def]
+    return cleanup_old_records(background)
 
 
+@router.get("/admin/cleanup/jobs/{job_id}")
+def get_cleanup_job(job_id: str) -> Dict[str, Any]:
+    job = get_job_manager("cleanup").get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import re
 import uuid
-from typing import Any, Dict
+from email.utils import formatdate
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from minio.error import S3Error
 import time
 from sqlalchemy.orm import Session
 
 from ..db import SessionLocal
 from ..models import Artifact
-from ..storage.minio_client import get_minio_client, presigned_get_url
+from ..schemas import ArtifactResolveRequest
+from ..storage.minio_client import get_minio_client, open_object, presigned_get_url, stat_many, stream_object
+from ..storage.object_meta import ObjectMeta, get_object_meta_cache, object_meta
+from ..storage.presign_cache import get_presign_cache, presign_key
+from ..observability import PRESIGN_CACHE, SERVICE_NAME
 from ..config import settings
 from ..storage.utils import parse_s3_uri
-from sqlalchemy import select
+from sqlalchemy import and_, func, select
 from ..deps import require_api_key, require_role, require_oidc_user
 
 
@@ -27,77 +34,68 @@ def get_artifact_url(artifact_id: uuid.UUID, filename: str | None = None, as_att
         art = db.get(Artifact, artifact_id)
         if not art:
             raise HTTPException(status_code=404, detail="Artifact not found")
-        client = get_minio_client()
-        size_bytes: int | None = None
-        content_type: str | None = None
-        last_modified: float | None = None
-        if art.uri.startswith("s3://"):
-            bucket, key = parse_s3_uri(art.uri)
-            # Simple in-process cache for presigned URLs
-            url = _get_cached_url(str(artifact_id))
-            if not url:
-                headers = None
-                if filename or as_attachment:
-                    disp = f"attachment; filename=\"{filename or key.split('/')[-1]}\"" if as_attachment else f"inline; filename=\"{filename or key.split('/')[-1]}\""
-                    headers = {"response-content-disposition": disp}
-                url = presigned_get_url(client, bucket, key, expires=settings.presign_expires_seconds, response_headers=headers)
-                _cache_url(str(artifact_id), url, settings.presign_expires_seconds)
-            expires_in = _ttl_remaining(str(artifact_id))
-            try:
-                stat = client.stat_object(bucket, key)
-                size_bytes = getattr(stat, "size", None)
-                content_type = getattr(stat, "content_type", None)
-                # stat.last_modified is datetime
-                lm = getattr(stat, "last_modified", None)
-                if lm is not None:
-                    last_modified = lm.timestamp()
-                etag = getattr(stat, "etag", None)
-            except Exception:
-                etag = None
-        else:
-            url = art.uri
-            expires_in = None
-        return {
-            "artifact_id": str(artifact_id),
-            "type": art.type,
-            "url": url,
-            "uri": art.uri,
-            "expires_in_seconds": expires_in,
-            "size_bytes": size_bytes,
-            "content_type": content_type,
-            "last_modified": last_modified,
-            "etag": etag if 'etag' in locals() else None,
-        }
+        return _artifact_entry(get_minio_client(), art, filename=filename, as_attachment=as_attachment)
     finally:
         db.close()
 
 
-_URL_CACHE: Dict[str, tuple[str, float]] = {}
+def _artifact_entry(
+    client: Any, art: Artifact, *, filename: str | None = None, as_attachment: bool = False, include_meta: bool = True
+) -> Dict[str, Any]:
+    """URL and object metadata of an artifact row, as returned by ``GET /artifacts/{id}``."""
+    url = art.uri
+    expires_in: int | None = None
+    meta = None
+    if art.uri.startswith("s3://"):
+        bucket, key = parse_s3_uri(art.uri)
+        url, expires_in = _presigned_url(client, art.id, bucket, key, filename=filename, as_attachment=as_attachment)
+        if include_meta:
+            try:
+                # Cached (filled at upload time); stat_object only on a miss
+                meta = object_meta(client, bucket, key)
+            except Exception:
+                meta = None
+    return {
+        "artifact_id": str(art.id),
+        "type": art.type,
+        "url": url,
+        "uri": art.uri,
+        "expires_in_seconds": expires_in,
+        **_meta_fields(meta),
+    }
 
 
-def _cache_url(artifact_id: str, url: str, ttl_s: int) -> None:
-    _URL_CACHE[artifact_id] = (url, time.time() + float(ttl_s) * 0.9)
+def _meta_fields(meta: Optional[ObjectMeta]) -> Dict[str, Any]:
+    return {
+        "size_bytes": meta.size if meta else None,
+        "content_type": meta.content_type if meta else None,
+        "last_modified": meta.last_modified if meta else None,
+        "etag": meta.etag if meta else None,
+    }
 
 
-def _get_cached_url(artifact_id: str) -> str | None:
-    rec = _URL_CACHE.get(artifact_id)
-    if not rec:
-        return None
-    url, expires_at = rec
-    if time.time() >= expires_at:
-        _URL_CACHE.pop(artifact_id, None)
-        return None
-    return url
+def _presigned_url(
+    client: Any, artifact_id: uuid.UUID, bucket: str, key: str, *, filename: str | None = None, as_attachment: bool = False
+) -> Tuple[str, int]:
+    """Presigned GET URL for an artifact and its remaining lifetime in seconds, via the presign cache.
 
-
-def _ttl_remaining(artifact_id: str) -> int | None:
-    rec = _URL_CACHE.get(artifact_id)
-    if not rec:
-        return None
-    url, expires_at = rec
-    import time as _t
-    left = int(max(0, expires_at - _t.time()))
-    return left
+    URLs are cached per (artifact, disposition, filename) since the disposition is signed into them.
+    """
+    disposition = None
+    if filename or as_attachment:
+        disposition = "attachment" if as_attachment else "inline"
+        filename = filename or key.split("/")[-1]
+    cache = get_presign_cache()
+    cache_key = presign_key(str(artifact_id), disposition, filename)
+    rec = cache.get(cache_key)
+    PRESIGN_CACHE.labels(SERVICE_NAME, "hit" if rec else "miss").inc()
+    if rec is None:
+        headers = {"response-content-disposition": f"{disposition}; filename=\"{filename}\""} if disposition else None
+        url = presigned_get_url(client, bucket, key, expires=settings.presign_expires_seconds, response_headers=headers)
+        # Hand out a cached URL only while it still has a tenth of its lifetime left
+        rec = (url, time.time() + float(settings.presign_expires_seconds) * 0.9)
+        cache.put(cache_key, *rec)
+    return rec[0], int(max(0, rec[1] - time.time()))
 
 
 @router.get("/artifacts/latest")
@@ -115,10 +113,76 @@ def get_latest_artifact(scene_id: uuid.UUID, type: str) -> Dict[str, Any]:  # ty
         db.close()
 
 
+@router.post("/artifacts/resolve")
+def resolve_artifacts(payload: ArtifactResolveRequest) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Resolve many artifacts to URLs in one call.
+
+    Takes either ``artifact_ids`` or a ``scene_id`` (optionally narrowed to ``types``); rows come
+    from a single query, URLs from the presign cache and metadata-cache misses are stat'ed
+    concurrently. The response maps artifact id to the same entry ``GET /artifacts/{id}`` returns;
+    for a scene, ``latest`` maps each type to its newest id. Scene mode returns at most ``limit``
+    artifacts, newest first (``truncated`` says whether more exist), or with ``latest_only`` just
+    the newest of each type.
+    """
+    if (payload.artifact_ids is None) == (payload.scene_id is None):
+        raise HTTPException(status_code=400, detail="Provide either artifact_ids or scene_id")
+    db: Session = SessionLocal()
+    try:
+        q = select(Artifact)
+        truncated = False
+        if payload.artifact_ids is not None:
+            q = q.where(Artifact.id.in_(payload.artifact_ids))
+            rows = list(db.execute(q.order_by(Artifact.created_at.desc())).scalars().all())
+        else:
+            scope = [Artifact.scene_id == payload.scene_id]
+            if payload.types:
+                scope.append(Artifact.type.in_(payload.types))
+            q = q.where(*scope)
+            if payload.latest_only:
+                newest = (
+                    select(Artifact.type, func.max(Artifact.created_at).label("created_at"))
+                    .where(*scope)
+                    .group_by(Artifact.type)
+                    .subquery()
+                )
+                q = q.join(newest, and_(Artifact.type == newest.c.type, Artifact.created_at == newest.c.created_at))
+            rows = list(db.execute(q.order_by(Artifact.created_at.desc()).limit(payload.limit + 1)).scalars().all())
+            truncated = len(rows) > payload.limit
+            rows = rows[:payload.limit]
+        client = get_minio_client()
+        artifacts = {
+            str(art.id): _artifact_entry(
+                client, art, filename=payload.filename, as_attachment=payload.as_attachment, include_meta=False
+            )
+            for art in rows
+        }
+        if payload.include_meta:
+            objects = {str(art.id): parse_s3_uri(art.uri) for art in rows if art.uri.startswith("s3://")}
+            metas = stat_many(client, objects.values())
+            for aid, obj in objects.items():
+                artifacts[aid].update(_meta_fields(metas.get(obj)))
+        out: Dict[str, Any] = {"artifacts": artifacts}
+        if payload.artifact_ids is not None:
+            out["missing"] = [str(i) for i in dict.fromkeys(payload.artifact_ids) if str(i) not in artifacts]
+        else:
+            latest: Dict[str, str] = {}
+            for art in rows:  # newest first
+                latest.setdefault(art.type, str(art.id))
+            if payload.latest_only:
+                artifacts = {aid: artifacts[aid] for aid in latest.values()}  # one per type even on created_at ties
+                out["artifacts"] = artifacts
+            out["latest"] = latest
+            out["missing_types"] = [t for t in (payload.types or []) if t not in latest]
+            out["truncated"] = truncated
+        return out
+    finally:
+        db.close()
+
+
 @router.post("/artifacts/refresh/{artifact_id}")
 def refresh_artifact_url(artifact_id: uuid.UUID) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
-    """Invalidate local presign cache and return a fresh URL."""
-    _URL_CACHE.pop(str(artifact_id), None)
+    """Invalidate the presign cache for the artifact and return a fresh URL."""
+    get_presign_cache().invalidate(str(artifact_id))
     return get_artifact_url(artifact_id)
 
 
@@ -135,13 +199,7 @@ def artifact_head(artifact_id: uuid.UUID) -> Dict[str, Any]:  # type: ignore[no-
             bucket, key = parse_s3_uri(art.uri)
             client = get_minio_client()
             try:
-                stat = client.stat_object(bucket, key)
-                meta.update({
-                    "size_bytes": getattr(stat, "size", None),
-                    "content_type": getattr(stat, "content_type", None),
-                    "last_modified": getattr(stat, "last_modified", None).timestamp() if getattr(stat, "last_modified", None) else None,
-                    "etag": getattr(stat, "etag", None),
-                })
+                meta.update(_meta_fields(object_meta(client, bucket, key)))
             except Exception:
                 pass
         return meta
@@ -162,43 +220,169 @@ def delete_artifact(artifact_id: uuid.UUID) -> Dict[str, Any]:  # type: ignore[n
                 bucket, key = parse_s3_uri(art.uri)
                 client = get_minio_client()
                 client.remove_object(bucket, key)
+                get_object_meta_cache().invalidate(bucket, key)
             except Exception:
                 # ignore removal failures
                 pass
         db.delete(art)
         db.commit()
         # Best-effort cache invalidation
-        _URL_CACHE.pop(str(artifact_id), None)
+        get_presign_cache().invalidate(str(artifact_id))
         return {"status": "ok", "deleted": str(artifact_id)}
     finally:
         db.close()
 
 
-@router.get("/artifacts/{artifact_id}/csv", response_class=PlainTextResponse)
-def artifact_as_csv(artifact_id: uuid.UUID) -> str:  # type: ignore[no-untyped-def]
-    """For change_delta artifacts containing a JSON object, return CSV of key,count."""
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Resolve a single-range ``Range`` header to inclusive (start, end); None means the whole object.
+
+    Multi-range and non-byte requests are served whole (allowed by RFC 9110); unsatisfiable ranges
+    raise 416.
+    """
+    if not header:
+        return None
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None
+    first, last = m.group(1), m.group(2)
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        n = int(last)
+        if n == 0 or size == 0:
+            raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+        return max(0, size - n), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [t.strip() for t in header.split(",")]
+    # Weak comparison, as If-None-Match requires
+    return any(t.removeprefix("W/").strip('"') == etag for t in tags)
+
+
+def _s3_artifact(artifact_id: uuid.UUID) -> Tuple[Artifact, str, str]:
     db: Session = SessionLocal()
     try:
         art = db.get(Artifact, artifact_id)
         if not art:
             raise HTTPException(status_code=404, detail="Artifact not found")
-        if art.type != "change_delta":
-            raise HTTPException(status_code=400, detail="CSV view only supported for change_delta")
-        # Fetch JSON over presigned URL
-        info = get_artifact_url(artifact_id)
-        import json, urllib.request
-        with urllib.request.urlopen(info["url"]) as resp:  # type: ignore
-            text = resp.read().decode("utf-8")
-        try:
-            data = json.loads(text)
-        except Exception:
-            raise HTTPException(status_code=400, detail="Artifact is not valid JSON")
-        if not isinstance(data, dict):
-            raise HTTPException(status_code=400, detail="Unexpected JSON format")
-        rows = ["type,count"]
-        for k, v in data.items():
-            rows.append(f"{k},{v}")
-        return "\n".join(rows) + "\n"
+        if not art.uri.startswith("s3://"):
+            raise HTTPException(status_code=400, detail="Artifact content is not stored in the object store")
+        bucket, key = parse_s3_uri(art.uri)
+        return art, bucket, key
     finally:
         db.close()
 
+
+@router.get("/artifacts/{artifact_id}/content")
+def artifact_content(
+    artifact_id: uuid.UUID,
+    filename: str | None = None,
+    as_attachment: bool = False,
+    range_header: str | None = Header(default=None, alias="Range"),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+    if_range: str | None = Header(default=None, alias="If-Range"),
+) -> Response:  # type: ignore[no-untyped-def]
+    """Stream an artifact's bytes through the API's pooled object-store client.
+
+    Honours a single byte ``Range`` (206, or 416 when unsatisfiable), ``If-Range`` with an ETag and
+    ``If-None-Match`` (304), so clients can resume downloads or read parts of large artifacts
+    without a presigned URL.
+    """
+    _, bucket, key = _s3_artifact(artifact_id)
+    client = get_minio_client()
+
+    def _fresh_meta() -> ObjectMeta:
+        # Keys such as overlays/residuals_{scene}.json are overwritten by re-runs on any worker
+        get_object_meta_cache().invalidate(bucket, key)
+        return object_meta(client, bucket, key)
+
+    try:
+        meta = object_meta(client, bucket, key)
+        if _etag_matches(if_none_match, meta.etag or "") or not meta.size:
+            # Never answer 304 (or an empty body) from possibly stale cached metadata
+            meta = _fresh_meta()
+    except Exception as exc:
+        raise HTTPException(status_code=404, detail="Artifact object not found") from exc
+
+    for attempt in range(2):
+        size = int(meta.size or 0)
+        etag = meta.etag or ""
+        headers: Dict[str, str] = {"Accept-Ranges": "bytes"}
+        if etag:
+            headers["ETag"] = f'"{etag}"'
+        if meta.last_modified is not None:
+            headers["Last-Modified"] = formatdate(meta.last_modified, usegmt=True)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        if filename or as_attachment:
+            name = filename or key.split("/")[-1]
+            headers["Content-Disposition"] = f'{"attachment" if as_attachment else "inline"}; filename="{name}"'
+
+        # A stale If-Range validator means "send the whole (changed) object instead"
+        rng = _parse_range(range_header, size) if (not if_range or _etag_matches(if_range, etag)) else None
+        status = 200
+        offset, length = 0, 0
+        if rng is not None:
+            offset, end = rng
+            length = end - offset + 1
+            status = 206
+        if size == 0:
+            headers["Content-Length"] = "0"
+            return Response(status_code=status, headers=headers, media_type=meta.content_type or "application/octet-stream")
+        try:
+            # If-Match pins the GET to the object the headers above describe
+            resp_headers, body = open_object(client, bucket, key, offset=offset, length=length, if_match=etag or None)
+        except S3Error as exc:
+            if attempt == 0 and exc.code in ("PreconditionFailed", "InvalidRange"):
+                try:
+                    meta = _fresh_meta()
+                except Exception as meta_exc:
+                    raise HTTPException(status_code=404, detail="Artifact object not found") from meta_exc
+                continue
+            raise HTTPException(status_code=502, detail="Failed to read artifact") from exc
+        except Exception as exc:
+            raise HTTPException(status_code=502, detail="Failed to read artifact") from exc
+        # Length (and range) come from the GET itself, never from cached metadata
+        headers["Content-Length"] = str(resp_headers.get("Content-Length") or (length if status == 206 else size))
+        if status == 206:
+            headers["Content-Range"] = str(resp_headers.get("Content-Range") or f"bytes {offset}-{offset + length - 1}/{size}")
+        return StreamingResponse(body, status_code=status, headers=headers, media_type=meta.content_type or "application/octet-stream")
+    raise HTTPException(status_code=502, detail="Artifact changed while it was being read")
+
+
+@router.get("/artifacts/{artifact_id}/csv", response_class=PlainTextResponse)
+def artifact_as_csv(artifact_id: uuid.UUID) -> str:  # type: ignore[no-untyped-def]
+    """For change_delta artifacts containing a JSON object, return CSV of key,count."""
+    art, bucket, key = _s3_artifact(artifact_id)
+    if art.type != "change_delta":
+        raise HTTPException(status_code=400, detail="CSV view only supported for change_delta")
+    # Read the JSON straight from the object store over the pooled client
+    import json
+    try:
+        text = b"".join(stream_object(get_minio_client(), bucket, key)).decode("utf-8")
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail="Failed to read artifact") from exc
+    try:
+        data = json.loads(text)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Artifact is not valid JSON") from exc
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Unexpected JSON format")
+    rows = ["type,count"]
+    for k, v in data.items():
+        rows.append(f"{k},{v}")
+    return "\n".join(rows) + "\n"
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import tempfile
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy import select
@@ -16,7 +16,7 @@ from ..utils.decision_log import write_decision
 from ..utils.crs import validate_crs
 from ..observability import EXPORT_COUNT, EXPORT_LATENCY, SERVICE_NAME
 from ..exporters.exporters import export_potree, export_laz, export_gltf, export_webm
-from ..storage.minio_client import get_minio_client, upload_file
+from ..storage.minio_client import get_minio_client, raise_for_failures, upload_file, upload_many
 from ..utils.sign import sign_dict
 
 
@@ -73,7 +73,15 @@ def export_artifact(scene_id: uuid.UUID, type: str, crs: str = "EPSG:3857", drac
                 obj_prefix = f"exports/potree/{scene_id}"
                 index_local = f"{out_dir}/index.html"
                 obj = f"{obj_prefix}/index.html"
-                upload_file(client, "roborouter-processed", obj, index_local, content_type="text/html; charset=utf-8")
+                # Upload the whole converter output (octree tiles included) concurrently
+                from pathlib import Path as _Path
+                items: List[Tuple[str, ...]] = [
+                    (f"{obj_prefix}/{p.relative_to(out_dir).as_posix()}", str(p))
+                    for p in sorted(_Path(out_dir).rglob("*"))
+                    if p.is_file() and p.name != "index.html"
+                ]
+                items.append((obj, index_local, "text/html; charset=utf-8"))
+                raise_for_failures(upload_many(client, "roborouter-processed", items))
                 uri = f"s3://roborouter-processed/{obj}"
             elif type.lower() == "potree_zip":
                 out_dir = f"{td}/potree_{scene_id}"
@@ -83,13 +91,13 @@ def export_artifact(scene_id: uuid.UUID, type: str, crs: str = "EPSG:3857", drac
                 zip_base = f"{td}/potree_{scene_id}"
                 zip_path = _shutil.make_archive(zip_base, 'zip', out_dir)
                 obj = f"exports/potree/{scene_id}.zip"
-                upload_file(client, "roborouter-processed", obj, zip_path, content_type="application/zip")
-                # Upload manifest alongside
-                try:
-                    manifest_obj = f"exports/potree/{scene_id}.manifest.json"
-                    upload_file(client, "roborouter-processed", manifest_obj, f"{out_dir}/manifest.json", content_type="application/json")
-                except Exception:
-                    pass
+                # Upload manifest alongside (best-effort)
+                manifest_obj = f"exports/potree/{scene_id}.manifest.json"
+                zip_res, _ = upload_many(client, "roborouter-processed", [
+                    (obj, zip_path, "application/zip"),
+                    (manifest_obj, f"{out_dir}/manifest.json", "application/json"),
+                ])
+                raise_for_failures([zip_res])
                 uri = f"s3://roborouter-processed/{obj}"
             elif type.lower() == "laz":
                 out_laz = f"{td}/{scene_id}.laz"
@@ -1,25 +1,62 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import shutil
 import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ..config import settings
-from ..db import Base, engine, get_db
-from ..models import Artifact, Metric, Scene, AuditLog
-from ..pipeline.pdal import build_ingest_pipeline, has_pdal, run_pipeline, get_point_count, get_bounds_and_srs
-from ..schemas import IngestRequest, IngestResponse
-from ..storage.minio_client import get_minio_client, upload_file, upload_file_stream, download_file
+from ..db import Base, SessionLocal, engine
+from ..jobs import Job, QueueFullError, get_job_manager
+from ..models import Artifact, IngestHash, Metric, Scene, SceneTile, AuditLog
+from ..pipeline.pdal import (
+    PipelineResult,
+    StageMetadata,
+    build_ingest_pipeline,
+    get_bounds_and_srs,
+    get_point_count,
+    has_pdal,
+    run_pipeline,
+    run_tiled_ingest,
+    should_tile,
+)
+from ..pipeline.columnar import write_columns
+from ..pipeline.numpy_ingest import run_numpy_ingest
+from ..pipeline.tile_index import build_tile_index
+from ..schemas import IngestBatchItemResult, IngestBatchRequest, IngestBatchResponse, IngestRequest, IngestResponse
+from ..storage.minio_client import (
+    copy_object,
+    download_file_hashed,
+    get_minio_client,
+    raise_for_failures,
+    upload_file,
+    upload_file_stream,
+    upload_many,
+)
+from ..storage.artifact_cache import get_artifact_cache
+from ..storage.columns import COLUMN_ARTIFACT_PREFIX, column_artifacts
+from ..storage.tiles import tiles_in_bbox
+from ..storage.utils import parse_s3_uri
 from ..utils.crs import validate_crs
 from ..utils.hash import sha256_file
 from ..utils.sign import sign_dict
+from ..utils.spool import spool_upload
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["Ingest"])
 
 
@@ -28,37 +65,11 @@ def startup() -> None:
     Base.metadata.create_all(bind=engine)
 
 
-@router.post("/ingest", response_model=IngestResponse)
-def ingest(payload: IngestRequest, db: Session = Depends(get_db)) -> IngestResponse:
-    if not validate_crs(payload.crs):
-        raise HTTPException(status_code=400, detail="Invalid CRS")
-    scene = Scene(source_uri=payload.source_uri, crs=payload.crs, sensor_meta=payload.sensor_meta)
-    db.add(scene)
-    db.commit()
-    db.refresh(scene)
-
-    client = get_minio_client()
-    artifact_ids: list[uuid.UUID] = []
-
-    with tempfile.TemporaryDirectory() as td:
-        input_path = payload.source_uri
-        # Allow s3://bucket/key source
-        if input_path.startswith("s3://"):
-            try:
-                bucket = input_path.split("/", 3)[2]
-                key = input_path.split("/", 3)[3]
-                local_in = str(Path(td) / Path(key).name)
-                download_file(client, bucket, key, local_in)
-                input_path = local_in
-            except Exception:
-                raise HTTPException(status_code=400, detail="Failed to download S3 source")
-        if not Path(input_path).exists():
-            raise HTTPException(status_code=400, detail="Source file not found")
-        output_path = str(Path(td) / f"{scene.id}.laz")
-
-        used_pdal = False
-        if has_pdal():
-            pipeline = build_ingest_pipeline(
+def _run_numpy_fallback(input_path: str, output_path: str) -> Tuple[str, Optional[PipelineResult]]:
+    """Run the NumPy/SciPy ingest filters; on failure an empty output is written."""
+    if settings.ingest_numpy_fallback:
+        try:
+            return "numpy", run_numpy_ingest(
                 input_path,
                 output_path,
                 voxel_size=settings.ingest_voxel_size_m,
@@ -66,208 +77,706 @@ def ingest(payload: IngestRequest, db: Session = Depends(get_db)) -> IngestRespo
                 mean_k=settings.ingest_outlier_mean_k,
                 intensity_min=settings.ingest_intensity_min,
                 intensity_max=settings.ingest_intensity_max,
-                out_srs=payload.crs,
+                chunk_points=settings.ingest_numpy_chunk_points,
+                tile_size=settings.ingest_numpy_tile_size_m,
+                buffer=settings.ingest_tile_buffer_m,
             )
+        except Exception:
+            logger.exception("NumPy ingest fallback failed")
+    Path(output_path).touch()
+    return "none", None
+
+
+def _ingest_engine() -> str:
+    if has_pdal():
+        return "pdal"
+    return "numpy" if settings.ingest_numpy_fallback else "none"
+
+
+def _run_ingest_stages(input_path: str, output_path: str, crs: str, work_dir: str) -> Tuple[str, Optional[PipelineResult]]:
+    """Run the PDAL ingest stages, tiled across processes when the input is large enough.
+
+    Returns (engine, result) where engine is "pdal", "numpy" (PDAL missing or failed) or "none"
+    (no engine succeeded and an empty output was written).
+    """
+    if not has_pdal():
+        return _run_numpy_fallback(input_path, output_path)
+    pipeline_kwargs: Dict[str, Any] = {
+        "voxel_size": settings.ingest_voxel_size_m,
+        "stddev_mult": settings.ingest_outlier_multiplier,
+        "mean_k": settings.ingest_outlier_mean_k,
+        "intensity_min": settings.ingest_intensity_min,
+        "intensity_max": settings.ingest_intensity_max,
+        "out_srs": crs,
+    }
+    try:
+        if settings.ingest_tiled_enabled and should_tile(
+            input_path, tile_size=settings.ingest_tile_size_m, min_points=settings.ingest_tiled_min_points
+        ):
             try:
-                run_pipeline(pipeline)
-                used_pdal = True
+                return "pdal", run_tiled_ingest(
+                    input_path,
+                    output_path,
+                    work_dir,
+                    tile_size=settings.ingest_tile_size_m,
+                    buffer=settings.ingest_tile_buffer_m,
+                    workers=settings.ingest_tile_workers,
+                    **pipeline_kwargs,
+                )
             except Exception:
-                # Graceful fallback when PDAL fails at runtime
-                Path(output_path).touch()
-        else:
-            Path(output_path).touch()
+                logger.exception("Tiled ingest failed; retrying as a single pipeline")
+        pipeline = build_ingest_pipeline(input_path, output_path, with_info=True, **pipeline_kwargs)
+        return "pdal", run_pipeline(pipeline, metadata=True)
+    except Exception:
+        # Graceful fallback when PDAL fails at runtime
+        logger.exception("PDAL ingest failed; falling back to NumPy filters")
+        return _run_numpy_fallback(input_path, output_path)
+
+
+def _stage_info(stage: Optional[StageMetadata], path: str) -> Tuple[Optional[int], Optional[Dict[str, float]], Optional[str]]:
+    """Prefer metadata PDAL reported during the run; fill gaps from the file header."""
+    count = stage.count if stage else None
+    bounds = stage.bounds if stage else None
+    srs = stage.srs if stage else None
+    if bounds is None or srs is None:
+        b, s = get_bounds_and_srs(path)
+        bounds = bounds if bounds is not None else b
+        srs = srs if srs is not None else s
+    if count is None:
+        count = get_point_count(path)
+    return count, bounds, srs
+
+
+# Metrics recorded by every ingest; copied verbatim when an ingest is deduplicated
+_INGEST_METRICS = ("point_count_in", "point_count_out", "density", "completeness", "used_pdal", "used_numpy", "reprojection_ok", "tile_count")
 
-        object_name = f"ingest/{scene.id}.laz"
-        # Use streaming for large files
-        try:
-            if Path(output_path).stat().st_size > 64 * 1024 * 1024:
-                upload_file_stream(client, settings.minio_bucket_processed, object_name, output_path)
-            else:
-                upload_file(client, settings.minio_bucket_processed, object_name, output_path)
-        except Exception:
-            upload_file(client, settings.minio_bucket_processed, object_name, output_path)
 
-        art = Artifact(scene_id=scene.id, type="ingested", uri=f"s3://{settings.minio_bucket_processed}/{object_name}")
-        db.add(art)
+def _ingest_settings_key(crs: str, engine: str) -> str:
+    """Hash of everything besides the input bytes that determines the processed output."""
+    params = {
+        "crs": crs,
+        # The NumPy fallback does not reproject, so its outputs are keyed apart from PDAL's
+        "engine": engine,
+        "voxel_size": settings.ingest_voxel_size_m,
+        "mean_k": settings.ingest_outlier_mean_k,
+        "multiplier": settings.ingest_outlier_multiplier,
+        "intensity_min": settings.ingest_intensity_min,
+        "intensity_max": settings.ingest_intensity_max,
+        # A reuse copies the earlier scene's tiles and columns, so their settings are part of the output too
+        "tile_size": settings.ingest_tile_index_size_m if settings.ingest_tile_index_enabled else None,
+        "columns": settings.ingest_columnar_columns if settings.ingest_columnar_enabled else None,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _audit_ingest(scene: Scene, crs: str, provenance: Dict[str, Any]) -> AuditLog:
+    try:
+        sig = sign_dict({"scene_id": str(scene.id), "source_uri": scene.source_uri, "crs": crs})
+        if sig:
+            provenance["signature"] = sig
+    except Exception:
+        pass
+    return AuditLog(scene_id=scene.id, action="ingest", details=provenance)
+
+
+def _record_rows(db: Session, rows: List[Any], deferred: Optional[List[Any]]) -> None:
+    """Commit audit/metric rows now, or hand them to a batch that bulk-inserts them at the end."""
+    if deferred is not None:
+        deferred.extend(rows)
+        return
+    db.add_all(rows)
+    db.commit()
+
+
+def _index_tiles(db: Session, client: Any, scene: Scene, art: Artifact, output_path: str, work_dir: str) -> int:
+    """Split the processed cloud into XY tiles, upload each and record its bounds (best-effort)."""
+    if not settings.ingest_tile_index_enabled:
+        return 0
+    try:
+        entries = build_tile_index(
+            output_path,
+            str(Path(work_dir) / "tiles"),
+            settings.ingest_tile_index_size_m,
+            chunk_points=settings.ingest_numpy_chunk_points,
+        )
+        names = [f"tiles/{scene.id}/{e.name}{Path(e.path).suffix}" for e in entries]
+        raise_for_failures(upload_many(client, settings.minio_bucket_processed, list(zip(names, (e.path for e in entries), strict=True))))
+        for e, object_name in zip(entries, names, strict=True):
+            db.add(SceneTile(
+                scene_id=scene.id,
+                artifact_id=art.id,
+                ix=e.ix,
+                iy=e.iy,
+                tile_size=settings.ingest_tile_index_size_m,
+                point_count=e.point_count,
+                uri=f"s3://{settings.minio_bucket_processed}/{object_name}",
+                **e.bounds,
+            ))
         db.commit()
-        db.refresh(art)
-        artifact_ids.append(art.id)
-        # Audit provenance with basic metadata when available
-        in_bounds, in_srs = (get_bounds_and_srs(input_path) if has_pdal() else (None, None))
-        out_bounds, out_srs = (get_bounds_and_srs(output_path) if has_pdal() else (None, None))
-        provenance: Dict[str, Any] = {
-            "source_uri": payload.source_uri,
-            "output_uri": f"s3://{settings.minio_bucket_processed}/{object_name}",
-            "crs": payload.crs,
-            "used_pdal": used_pdal,
-            "input_bounds": in_bounds,
-            "input_srs": in_srs,
-            "output_bounds": out_bounds,
-            "output_srs": out_srs,
-        }
-        try:
-            sig = sign_dict({"scene_id": str(scene.id), "source_uri": payload.source_uri, "crs": payload.crs})
-            if sig:
-                provenance["signature"] = sig
-        except Exception:
-            pass
-        db.add(AuditLog(scene_id=scene.id, action="ingest", details=provenance))
+        return len(entries)
+    except Exception:
+        db.rollback()
+        logger.warning("Tile index for scene %s failed", scene.id, exc_info=True)
+        return 0
+
+
+def _copy_tiles(db: Session, client: Any, src_scene_id: uuid.UUID, scene: Scene, art: Artifact) -> int:
+    """Give a deduplicated scene its own copies of the source scene's tiles."""
+    try:
+        tiles = tiles_in_bbox(db, src_scene_id)
+        for t in tiles:
+            src_bucket, src_key = parse_s3_uri(t.uri)
+            object_name = f"tiles/{scene.id}/{Path(src_key).name}"
+            copy_object(client, src_bucket, src_key, settings.minio_bucket_processed, object_name)
+            db.add(SceneTile(
+                scene_id=scene.id,
+                artifact_id=art.id,
+                ix=t.ix,
+                iy=t.iy,
+                tile_size=t.tile_size,
+                minx=t.minx, miny=t.miny, minz=t.minz,
+                maxx=t.maxx, maxy=t.maxy, maxz=t.maxz,
+                point_count=t.point_count,
+                uri=f"s3://{settings.minio_bucket_processed}/{object_name}",
+            ))
         db.commit()
+        return len(tiles)
+    except Exception:
+        db.rollback()
+        logger.warning("Copying tiles from scene %s failed", src_scene_id, exc_info=True)
+        return 0
 
-    # Metrics: attempt real counts with PDAL, otherwise fall back to zeros
-    count_in = get_point_count(payload.source_uri) if has_pdal() else None
-    processed_local = output_path if has_pdal() else None
-    count_out = get_point_count(processed_local) if processed_local else None
-    _, srs_in = (get_bounds_and_srs(payload.source_uri) if has_pdal() else (None, None))
-    _, srs_out = (get_bounds_and_srs(processed_local) if (has_pdal() and processed_local) else (None, None))
-    # Validate reprojection when available (best-effort)
-    reprojection_ok = 0.0
+
+def _write_columns(db: Session, client: Any, scene: Scene, output_path: str, work_dir: str) -> List[uuid.UUID]:
+    """Store the processed cloud as per-attribute .npy columns, one artifact each (best-effort)."""
+    if not settings.ingest_columnar_enabled:
+        return []
     try:
-        if isinstance(srs_out, str) and (payload.crs in srs_out or payload.crs.split(":")[0] in srs_out):
-            reprojection_ok = 1.0
+        columns = [c.strip() for c in settings.ingest_columnar_columns.split(",") if c.strip()]
+        paths = write_columns(
+            output_path,
+            str(Path(work_dir) / "columns"),
+            columns=columns,
+            chunk_points=settings.ingest_numpy_chunk_points,
+        )
+        names = {name: f"columns/{scene.id}/{name}.npy" for name in paths}
+        raise_for_failures(upload_many(
+            client,
+            settings.minio_bucket_processed,
+            [(names[name], path) for name, path in paths.items()],
+            content_type="application/octet-stream",
+        ))
+        arts = [
+            Artifact(
+                scene_id=scene.id,
+                type=f"{COLUMN_ARTIFACT_PREFIX}{name}",
+                uri=f"s3://{settings.minio_bucket_processed}/{object_name}",
+            )
+            for name, object_name in names.items()
+        ]
+        db.add_all(arts)
+        db.commit()
+        return [a.id for a in arts]
     except Exception:
-        reprojection_ok = 0.0
-    completeness = (float(count_out) / float(count_in)) if (count_in and count_out and count_in > 0) else 0.0
-    density = float(count_out) if count_out else 0.0
-    metrics = {
-        "point_count_in": float(count_in) if count_in else 0.0,
-        "point_count_out": float(count_out) if count_out else 0.0,
-        "density": density,
-        "completeness": completeness,
-        "used_pdal": 1.0 if used_pdal else 0.0,
-        "reprojection_ok": reprojection_ok,
-    }
-    # Hash and dedupe detection (best-effort)
+        db.rollback()
+        logger.warning("Columnar export for scene %s failed", scene.id, exc_info=True)
+        return []
+
+
+def _copy_columns(db: Session, client: Any, src_scene_id: uuid.UUID, scene: Scene) -> List[uuid.UUID]:
+    if not settings.ingest_columnar_enabled:
+        return []
     try:
-        ing_sha = int(sha256_file(output_path), 16) % 1_000_000
-        metrics["ingested_sha256"] = float(ing_sha)
-        existing = db.execute(select(Metric).where(Metric.name == "ingested_sha256", Metric.scene_id != scene.id)).scalars().all()
-        hit = any(int(m.value) == ing_sha for m in existing)
-        metrics["dedupe_hit"] = 1.0 if hit else 0.0
+        arts: List[Artifact] = []
+        for name, src in column_artifacts(db, src_scene_id).items():
+            src_bucket, src_key = parse_s3_uri(src.uri)
+            object_name = f"columns/{scene.id}/{name}.npy"
+            copy_object(client, src_bucket, src_key, settings.minio_bucket_processed, object_name)
+            arts.append(Artifact(scene_id=scene.id, type=src.type, uri=f"s3://{settings.minio_bucket_processed}/{object_name}"))
+        db.add_all(arts)
+        db.commit()
+        return [a.id for a in arts]
     except Exception:
-        metrics.setdefault("dedupe_hit", 0.0)
-    for k, v in metrics.items():
-        db.add(Metric(scene_id=scene.id, name=k, value=float(v)))
+        db.rollback()
+        logger.warning("Copying columns from scene %s failed", src_scene_id, exc_info=True)
+        return []
+
+
+def _reuse_ingested(
+    db: Session,
+    client: Any,
+    scene: Scene,
+    crs: str,
+    input_sha: str,
+    settings_key: str,
+    original_filename: Optional[str],
+    deferred: Optional[List[Any]] = None,
+) -> Optional[IngestResponse]:
+    """On an exact input+settings hit, copy the earlier processed object server-side instead of reprocessing."""
+    hit = db.execute(
+        select(IngestHash).where(IngestHash.input_sha256 == input_sha, IngestHash.settings_key == settings_key)
+    ).scalars().first()
+    if not hit or hit.scene_id == scene.id:
+        return None
+    src = db.get(Artifact, hit.artifact_id)
+    if not src or not src.uri.startswith("s3://"):
+        return None
+    object_name = f"ingest/{scene.id}.laz"
+    try:
+        src_bucket, src_key = parse_s3_uri(src.uri)
+        # Each scene owns its object so deleting the original scene cannot break this one
+        copy_object(client, src_bucket, src_key, settings.minio_bucket_processed, object_name)
+    except Exception:
+        logger.warning("Dedupe copy from %s failed; reprocessing", src.uri, exc_info=True)
+        return None
+
+    output_uri = f"s3://{settings.minio_bucket_processed}/{object_name}"
+    art = Artifact(scene_id=scene.id, type="ingested", uri=output_uri)
+    db.add(art)
     db.commit()
+    db.refresh(art)
+    prior = db.execute(
+        select(Metric).where(Metric.scene_id == hit.scene_id, Metric.name.in_(_INGEST_METRICS)).order_by(Metric.created_at.asc())
+    ).scalars().all()
+    metrics = {m.name: float(m.value) for m in prior}
+    metrics["dedupe_hit"] = 1.0
+    metrics["tile_count"] = float(_copy_tiles(db, client, hit.scene_id, scene, art))
+    column_ids = _copy_columns(db, client, hit.scene_id, scene)
+    provenance: Dict[str, Any] = {"source_uri": scene.source_uri}
+    if original_filename:
+        provenance["original_filename"] = original_filename
+    provenance.update({
+        "output_uri": output_uri,
+        "crs": crs,
+        "input_sha256": input_sha,
+        "output_sha256": hit.output_sha256,
+        "dedupe_of": {"scene_id": str(hit.scene_id), "artifact_id": str(hit.artifact_id)},
+    })
+    rows: List[Any] = [_audit_ingest(scene, crs, provenance)]
+    rows.extend(Metric(scene_id=scene.id, name=k, value=float(v)) for k, v in metrics.items())
+    _record_rows(db, rows, deferred)
+    return IngestResponse(scene_id=scene.id, artifact_ids=[art.id, *column_ids], metrics=metrics)
 
-    return IngestResponse(scene_id=scene.id, artifact_ids=artifact_ids, metrics=metrics)
 
+def create_scene(source_uri: str, crs: str, sensor_meta: Optional[Dict[str, Any]]) -> uuid.UUID:
+    db: Session = SessionLocal()
+    try:
+        scene = Scene(source_uri=source_uri, crs=crs, sensor_meta=sensor_meta)
+        db.add(scene)
+        db.commit()
+        db.refresh(scene)
+        return scene.id
+    finally:
+        db.close()
 
-@router.post("/ingest/stream", response_model=IngestResponse)
-async def ingest_stream(file: UploadFile = File(...), crs: str = "EPSG:3857", db: Session = Depends(get_db)) -> IngestResponse:  # type: ignore[no-untyped-def]
-    if not validate_crs(crs):
-        raise HTTPException(status_code=400, detail="Invalid CRS")
 
-    scene = Scene(source_uri=f"stream://{file.filename}", crs=crs, sensor_meta={"content_type": file.content_type})
-    db.add(scene)
-    db.commit()
-    db.refresh(scene)
-
-    client = get_minio_client()
-    artifact_ids: list[uuid.UUID] = []
-
-    with tempfile.TemporaryDirectory() as td:
-        temp_input_path = Path(td) / file.filename
-        with open(temp_input_path, "wb") as f:
-            while True:
-                chunk = await file.read(8 * 1024 * 1024)
-                if not chunk:
-                    break
-                f.write(chunk)
-
-        output_path = str(Path(td) / f"{scene.id}.laz")
-
-        used_pdal = False
-        if has_pdal():
-            pipeline = build_ingest_pipeline(
-                str(temp_input_path),
-                output_path,
-                voxel_size=settings.ingest_voxel_size_m,
-                stddev_mult=settings.ingest_outlier_multiplier,
-                mean_k=settings.ingest_outlier_mean_k,
-                intensity_min=settings.ingest_intensity_min,
-                intensity_max=settings.ingest_intensity_max,
-                out_srs=crs,
-            )
+def discard_scene(scene_id: uuid.UUID) -> None:
+    """Delete a scene whose ingest was never queued, so a 503 retry does not leave an orphan row."""
+    db: Session = SessionLocal()
+    try:
+        scene = db.get(Scene, scene_id)
+        if scene is not None:
+            db.delete(scene)
+            db.commit()
+    except Exception:
+        db.rollback()
+        logger.warning("Removing unqueued scene %s failed", scene_id, exc_info=True)
+    finally:
+        db.close()
+
+
+def _ingest_scene(
+    scene_id: uuid.UUID,
+    source: str,
+    crs: str,
+    *,
+    original_filename: Optional[str] = None,
+    input_digest: Optional[Tuple[str, int]] = None,
+    progress: Optional[Callable[[str, float], None]] = None,
+    client: Any = None,
+    deferred: Optional[List[Any]] = None,
+) -> IngestResponse:
+    """Process one source (local path or s3:// URI) into the scene's ingested artifact.
+
+    Shared by the synchronous endpoints, background jobs and batches; ``progress(stage, fraction)``
+    is called as the ingest advances. ``input_digest`` is the (sha256, size) of a local source when
+    the caller already hashed it while receiving the bytes. Batches pass a shared ``client`` and a
+    ``deferred`` list that collects the AuditLog/Metric rows instead of committing them here.
+    """
+    report = progress or (lambda stage, fraction: None)
+    db: Session = SessionLocal()
+    try:
+        scene = db.get(Scene, scene_id)
+        if not scene:
+            raise HTTPException(status_code=404, detail="Scene not found")
+        client = client or get_minio_client()
+        artifact_ids: list[uuid.UUID] = []
+        rows: List[Any] = []
+
+        with tempfile.TemporaryDirectory() as td:
+            input_path = source
+            # Allow s3://bucket/key source
+            if input_path.startswith("s3://"):
+                report("fetching", 0.05)
+                try:
+                    bucket, key = parse_s3_uri(input_path)
+                    local_in = str(Path(td) / Path(key).name)
+                    cache = get_artifact_cache()
+                    if cache is not None:
+                        # Re-ingests of the same object (new settings, retries) read it from disk
+                        input_digest = cache.materialize_hashed(client, bucket, key, local_in)
+                    else:
+                        input_digest = download_file_hashed(client, bucket, key, local_in)
+                    input_path = local_in
+                except Exception:
+                    raise HTTPException(status_code=400, detail="Failed to download S3 source")
+            if not Path(input_path).exists():
+                raise HTTPException(status_code=400, detail="Source file not found")
+            output_path = str(Path(td) / f"{scene.id}.laz")
+
+            input_sha, input_size = input_digest or (sha256_file(input_path), Path(input_path).stat().st_size)
+            settings_key = _ingest_settings_key(crs, _ingest_engine())
+            reused = _reuse_ingested(db, client, scene, crs, input_sha, settings_key, original_filename, deferred)
+            if reused is not None:
+                return reused
+
+            report("processing", 0.1)
+            ingest_engine, pdal_result = _run_ingest_stages(input_path, output_path, crs, td)
+            used_pdal = ingest_engine == "pdal"
+
+            report("uploading", 0.7)
+            object_name = f"ingest/{scene.id}.laz"
+            # Stream the upload and hash the processed output from the same read
+            output_sha: str | None = None
             try:
-                run_pipeline(pipeline)
-                used_pdal = True
+                output_sha = upload_file_stream(client, settings.minio_bucket_processed, object_name, output_path)
             except Exception:
-                Path(output_path).touch()
-        else:
-            Path(output_path).touch()
+                upload_file(client, settings.minio_bucket_processed, object_name, output_path)
+
+            report("recording", 0.9)
+            art = Artifact(scene_id=scene.id, type="ingested", uri=f"s3://{settings.minio_bucket_processed}/{object_name}")
+            db.add(art)
+            db.commit()
+            db.refresh(art)
+            artifact_ids.append(art.id)
+            # Audit provenance from the PDAL run's own metadata, falling back to in-process header reads
+            count_in, in_bounds, in_srs = _stage_info(pdal_result.input if pdal_result else None, input_path)
+            count_out, out_bounds, out_srs = _stage_info(pdal_result.output if pdal_result else None, output_path)
+            provenance: Dict[str, Any] = {"source_uri": scene.source_uri}
+            if original_filename:
+                provenance["original_filename"] = original_filename
+            provenance.update({
+                "output_uri": f"s3://{settings.minio_bucket_processed}/{object_name}",
+                "crs": crs,
+                "used_pdal": used_pdal,
+                "engine": ingest_engine,
+                "input_bounds": in_bounds,
+                "input_srs": in_srs,
+                "output_bounds": out_bounds,
+                "output_srs": out_srs,
+            })
+
+            if output_sha is None:
+                try:
+                    output_sha = sha256_file(output_path)
+                except Exception:
+                    output_sha = None
+            provenance["input_sha256"] = input_sha
+            provenance["output_sha256"] = output_sha
+            rows.append(_audit_ingest(scene, crs, provenance))
+
+            # Index real outputs only; placeholder outputs must never satisfy a later lookup
+            if ingest_engine != "none":
+                db.add(IngestHash(
+                    input_sha256=input_sha,
+                    settings_key=_ingest_settings_key(crs, ingest_engine),
+                    output_sha256=output_sha,
+                    input_size_bytes=input_size,
+                    scene_id=scene.id,
+                    artifact_id=art.id,
+                ))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # A concurrent ingest of the same input indexed it first
+                    db.rollback()
 
-        object_name = f"ingest/{scene.id}.laz"
+            tile_count = 0
+            if ingest_engine != "none":
+                report("tiling", 0.95)
+                tile_count = _index_tiles(db, client, scene, art, output_path, td)
+                artifact_ids.extend(_write_columns(db, client, scene, output_path, td))
+
+        # Validate reprojection when available (best-effort)
+        reprojection_ok = 0.0
         try:
-            if Path(output_path).stat().st_size > 64 * 1024 * 1024:
-                upload_file_stream(client, settings.minio_bucket_processed, object_name, output_path)
-            else:
-                upload_file(client, settings.minio_bucket_processed, object_name, output_path)
+            if isinstance(out_srs, str) and (crs in out_srs or crs.split(":")[0] in out_srs):
+                reprojection_ok = 1.0
         except Exception:
-            upload_file(client, settings.minio_bucket_processed, object_name, output_path)
-
-        art = Artifact(scene_id=scene.id, type="ingested", uri=f"s3://{settings.minio_bucket_processed}/{object_name}")
-        db.add(art)
-        db.commit()
-        db.refresh(art)
-        artifact_ids.append(art.id)
-
-        # Audit provenance
-        in_bounds, in_srs = (get_bounds_and_srs(str(temp_input_path)) if has_pdal() else (None, None))
-        out_bounds, out_srs = (get_bounds_and_srs(output_path) if has_pdal() else (None, None))
-        provenance: Dict[str, Any] = {
-            "source_uri": scene.source_uri,
-            "original_filename": file.filename,
-            "output_uri": f"s3://{settings.minio_bucket_processed}/{object_name}",
-            "crs": crs,
-            "used_pdal": used_pdal,
-            "input_bounds": in_bounds,
-            "input_srs": in_srs,
-            "output_bounds": out_bounds,
-            "output_srs": out_srs,
+            reprojection_ok = 0.0
+        completeness = (float(count_out) / float(count_in)) if (count_in and count_out and count_in > 0) else 0.0
+        density = float(count_out) if count_out else 0.0
+        metrics = {
+            "point_count_in": float(count_in) if count_in else 0.0,
+            "point_count_out": float(count_out) if count_out else 0.0,
+            "density": density,
+            "completeness": completeness,
+            "used_pdal": 1.0 if used_pdal else 0.0,
+            "used_numpy": 1.0 if ingest_engine == "numpy" else 0.0,
+            "reprojection_ok": reprojection_ok,
+            "tile_count": float(tile_count),
         }
+        # Dedupe detection: identical processed output already indexed for another scene
         try:
-            sig = sign_dict({"scene_id": str(scene.id), "source_uri": scene.source_uri, "crs": crs})
-            if sig:
-                provenance["signature"] = sig
+            hit = output_sha is not None and db.execute(
+                select(IngestHash.id).where(IngestHash.output_sha256 == output_sha, IngestHash.scene_id != scene.id).limit(1)
+            ).first() is not None
+            metrics["dedupe_hit"] = 1.0 if hit else 0.0
         except Exception:
-            pass
-        db.add(AuditLog(scene_id=scene.id, action="ingest", details=provenance))
-        db.commit()
+            metrics.setdefault("dedupe_hit", 0.0)
+        rows.extend(Metric(scene_id=scene.id, name=k, value=float(v)) for k, v in metrics.items())
+        _record_rows(db, rows, deferred)
+
+        return IngestResponse(scene_id=scene.id, artifact_ids=artifact_ids, metrics=metrics)
+    finally:
+        db.close()
+
+
+def queue_ingest(
+    scene_id: uuid.UUID,
+    source: str,
+    crs: str,
+    *,
+    original_filename: Optional[str] = None,
+    input_digest: Optional[Tuple[str, int]] = None,
+    cleanup_dir: Optional[str] = None,
+) -> Job:
+    """Queue an ingest on the background pool; ``cleanup_dir`` is removed when it finishes.
 
-    # Metrics
-    count_in = get_point_count(str(temp_input_path)) if has_pdal() else None  # type: ignore[arg-type]
-    count_out = get_point_count(output_path) if has_pdal() else None  # type: ignore[arg-type]
-    # Reprojection check best-effort
-    _, srs_in2 = (get_bounds_and_srs(str(temp_input_path)) if has_pdal() else (None, None))
-    _, srs_out2 = (get_bounds_and_srs(output_path) if has_pdal() else (None, None))
-    reprojection_ok2 = 0.0
+    Raises QueueFullError (after removing ``cleanup_dir`` and the not yet ingested scene) when the
+    pool is saturated.
+    """
+
+    def _work(job: Job) -> Dict[str, Any]:
+        res = _ingest_scene(
+            scene_id, source, crs, original_filename=original_filename, input_digest=input_digest, progress=job.update
+        )
+        return res.model_dump(mode="json")
+
+    def _cleanup() -> None:
+        if cleanup_dir:
+            shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+    try:
+        return get_job_manager("ingest").submit(
+            "ingest", _work, meta={"scene_id": str(scene_id), "source_uri": source}, on_finish=_cleanup
+        )
+    except QueueFullError:
+        _cleanup()
+        discard_scene(scene_id)
+        raise
+
+
+def _enqueue_ingest(
+    scene_id: uuid.UUID,
+    source: str,
+    crs: str,
+    *,
+    original_filename: Optional[str] = None,
+    input_digest: Optional[Tuple[str, int]] = None,
+    cleanup_dir: Optional[str] = None,
+) -> JSONResponse:
+    """Queue an ingest on the background pool and answer 202 with the job handle."""
     try:
-        if isinstance(srs_out2, str) and (crs in srs_out2 or crs.split(":")[0] in srs_out2):
-            reprojection_ok2 = 1.0
+        job = queue_ingest(
+            scene_id, source, crs, original_filename=original_filename, input_digest=input_digest, cleanup_dir=cleanup_dir
+        )
+    except QueueFullError as exc:
+        return JSONResponse({"detail": {"message": str(exc)}}, status_code=503, headers={"Retry-After": "30"})
+    status_url = f"/ingest/jobs/{job.id}"
+    return JSONResponse(
+        {"job_id": job.id, "scene_id": str(scene_id), "status": job.status, "status_url": status_url},
+        status_code=202,
+        headers={"Location": status_url},
+    )
+
+
+@router.post("/ingest", response_model=IngestResponse)
+def ingest(payload: IngestRequest, background: bool = False) -> Any:
+    """Ingest a local path or s3:// URI.
+
+    With ``background=true`` the work is queued and 202 Accepted is returned with a job id to poll
+    at ``GET /ingest/jobs/{job_id}``.
+    """
+    if not validate_crs(payload.crs):
+        raise HTTPException(status_code=400, detail="Invalid CRS")
+    if not payload.source_uri.startswith("s3://") and not Path(payload.source_uri).exists():
+        raise HTTPException(status_code=400, detail="Source file not found")
+    scene_id = create_scene(payload.source_uri, payload.crs, payload.sensor_meta)
+    if background:
+        return _enqueue_ingest(scene_id, payload.source_uri, payload.crs)
+    return _ingest_scene(scene_id, payload.source_uri, payload.crs)
+
+
+@router.post("/ingest/stream", response_model=IngestResponse)
+async def ingest_stream(file: UploadFile = File(...), crs: str = "EPSG:3857", background: bool = False) -> Any:  # type: ignore[no-untyped-def]
+    if not validate_crs(crs):
+        raise HTTPException(status_code=400, detail="Invalid CRS")
+    filename = Path(file.filename or "upload.bin").name
+
+    # Spool the upload to a directory owned by this ingest (removed when it finishes)
+    spool_dir = tempfile.mkdtemp(prefix="ingest_stream_")
+    temp_input_path = Path(spool_dir) / filename
+    try:
+        # Hash the raw input as it arrives so ingest never re-reads it for dedupe
+        hasher = await spool_upload(
+            file, temp_input_path, max_bytes=settings.upload_max_bytes, chunk_size=settings.upload_chunk_bytes
+        )
+        scene_id = create_scene(f"stream://{file.filename}", crs, {"content_type": file.content_type})
     except Exception:
-        reprojection_ok2 = 0.0
-    completeness = (float(count_out) / float(count_in)) if (count_in and count_out and count_in > 0) else 0.0
-    density = float(count_out) if count_out else 0.0
-    metrics = {
-        "point_count_in": float(count_in) if count_in else 0.0,
-        "point_count_out": float(count_out) if count_out else 0.0,
-        "density": density,
-        "completeness": completeness,
-        "used_pdal": 1.0 if used_pdal else 0.0,  # type: ignore[name-defined]
-        "reprojection_ok": reprojection_ok2,
-    }
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        raise
+
+    digest = (hasher.hexdigest(), hasher.size)
+    if background:
+        return _enqueue_ingest(
+            scene_id, str(temp_input_path), crs, original_filename=file.filename, input_digest=digest, cleanup_dir=spool_dir
+        )
+    try:
+        return await run_in_threadpool(
+            _ingest_scene, scene_id, str(temp_input_path), crs, original_filename=file.filename, input_digest=digest
+        )
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+
+def _commit_deferred(db: Session, pending: Dict[int, List[Any]], results: List[Optional[IngestBatchItemResult]]) -> None:
+    """Bulk-insert the batch's deferred AuditLog/Metric rows.
+
+    When the single commit fails, rows are retried item by item so one bad row only fails its
+    own item (its scene was ingested, but the audit trail and metrics could not be recorded).
+    """
+    rows = [r for item_rows in pending.values() for r in item_rows]
+    if not rows:
+        return
     try:
-        ing_sha = int(sha256_file(output_path), 16) % 1_000_000
-        metrics["ingested_sha256"] = float(ing_sha)
-        existing = db.execute(select(Metric).where(Metric.name == "ingested_sha256", Metric.scene_id != scene.id)).scalars().all()
-        hit = any(int(m.value) == ing_sha for m in existing)
-        metrics["dedupe_hit"] = 1.0 if hit else 0.0
+        db.add_all(rows)
+        db.commit()
+        return
     except Exception:
-        metrics.setdefault("dedupe_hit", 0.0)
-    for k, v in metrics.items():
-        db.add(Metric(scene_id=scene.id, name=k, value=float(v)))
-    db.commit()
+        db.rollback()
+        logger.warning("Bulk insert of batch audit/metric rows failed; retrying per item", exc_info=True)
+    for i, item_rows in pending.items():
+        try:
+            db.add_all(item_rows)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning("Recording audit/metrics for batch item %d failed", i, exc_info=True)
+            prev = results[i]
+            if prev is not None:
+                results[i] = prev.model_copy(update={
+                    "status": "failed",
+                    "error": f"Ingested, but recording audit/metrics failed: {exc.__class__.__name__}",
+                })
+
+
+@router.post("/ingest/batch", response_model=IngestBatchResponse)
+def ingest_batch(payload: IngestBatchRequest) -> IngestBatchResponse:
+    """Ingest many sources in one call.
+
+    Every item is validated before any work starts; invalid items are reported and skipped. Scene
+    rows are created in one transaction, items run on a bounded pool sharing one MinIO client, and
+    their audit/metric rows are bulk-inserted at the end. Each item reports its own outcome.
+    """
+    items = payload.items
+    if not items:
+        raise HTTPException(status_code=400, detail="No items")
+    if len(items) > settings.ingest_batch_max_items:
+        raise HTTPException(status_code=413, detail=f"At most {settings.ingest_batch_max_items} items per batch")
+
+    results: List[Optional[IngestBatchItemResult]] = [None] * len(items)
+    crs_ok: Dict[str, bool] = {}
+    valid: List[int] = []
+    for i, item in enumerate(items):
+        if item.crs not in crs_ok:
+            crs_ok[item.crs] = validate_crs(item.crs)
+        error = None
+        if not crs_ok[item.crs]:
+            error = "Invalid CRS"
+        elif not item.source_uri.startswith("s3://") and not Path(item.source_uri).exists():
+            error = "Source file not found"
+        if error:
+            results[i] = IngestBatchItemResult(index=i, source_uri=item.source_uri, status="invalid", error=error)
+        else:
+            valid.append(i)
+
+    db: Session = SessionLocal()
+    try:
+        scene_ids: Dict[int, uuid.UUID] = {i: uuid.uuid4() for i in valid}
+        db.add_all([
+            Scene(id=scene_ids[i], source_uri=items[i].source_uri, crs=items[i].crs, sensor_meta=items[i].sensor_meta)
+            for i in valid
+        ])
+        db.commit()
+
+        client = get_minio_client() if valid else None
+        pending: Dict[int, List[Any]] = {}
+
+        def _one(i: int) -> Tuple[IngestResponse, List[Any]]:
+            rows: List[Any] = []
+            res = _ingest_scene(scene_ids[i], items[i].source_uri, items[i].crs, client=client, deferred=rows)
+            return res, rows
+
+        limit = payload.max_concurrency or settings.ingest_batch_concurrency
+        workers = max(1, min(int(limit), settings.ingest_batch_concurrency, len(valid) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-batch") as pool:
+            futures = {pool.submit(_one, i): i for i in valid}
+            for fut in as_completed(futures):
+                i = futures[fut]
+                try:
+                    res, rows = fut.result()
+                    pending[i] = rows
+                    results[i] = IngestBatchItemResult(
+                        index=i,
+                        source_uri=items[i].source_uri,
+                        status="succeeded",
+                        scene_id=res.scene_id,
+                        artifact_ids=res.artifact_ids,
+                        metrics=res.metrics,
+                    )
+                except Exception as exc:
+                    logger.warning("Batch ingest of %s failed", items[i].source_uri, exc_info=True)
+                    results[i] = IngestBatchItemResult(
+                        index=i,
+                        source_uri=items[i].source_uri,
+                        status="failed",
+                        scene_id=scene_ids[i],
+                        error=str(getattr(exc, "detail", None) or exc) or exc.__class__.__name__,
+                    )
+        _commit_deferred(db, pending, results)
+    finally:
+        db.close()
+
+    done = [r for r in results if r is not None]
+    return IngestBatchResponse(
+        total=len(done),
+        succeeded=sum(1 for r in done if r.status == "succeeded"),
+        failed=sum(1 for r in done if r.status != "succeeded"),
+        items=done,
+    )
+
+
+@router.get("/ingest/jobs/{job_id}")
+def get_ingest_job(job_id: str) -> Dict[str, Any]:
+    job = get_job_manager("ingest").get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
 
-    return IngestResponse(scene_id=scene.id, artifact_ids=artifact_ids, metrics=metrics)
 
+@router.get("/ingest/jobs")
+def list_ingest_jobs(limit: int = 50) -> Dict[str, Any]:
+    mgr = get_job_manager("ingest")
+    items: List[Dict[str, Any]] = [j.to_dict() for j in mgr.list("ingest", limit=min(500, max(1, limit)))]
+    return {"items": items, "active": mgr.active_count(), "max_workers": mgr.max_workers, "max_pending": mgr.max_pending}
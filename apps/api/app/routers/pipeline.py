@@ -14,7 +14,7 @@ from ..models import Artifact, Metric, Scene
 from ..pipeline.registration import register_clouds
 from ..pipeline.segmentation import run_segmentation
 from ..pipeline.change_detection import run_change_detection
-from ..storage.minio_client import get_minio_client, upload_file
+from ..storage.minio_client import get_minio_client, raise_for_failures, upload_many
 from ..observability import REQUEST_COUNT, REQUEST_LATENCY, SERVICE_NAME
 import time
 from ..utils.hash import sha256_file
@@ -86,7 +86,11 @@ def pipeline_run(scene_id: uuid.UUID, steps: Optional[List[str]] = None, config_
                         result = register_clouds(input_path, aligned_path)
 
                         aligned_obj = f"registration/aligned_{scene_id}.laz"
-                        upload_file(client, "roborouter-processed", aligned_obj, result.aligned_path)
+                        resid_obj = f"overlays/residuals_{scene_id}.json"
+                        raise_for_failures(upload_many(client, "roborouter-processed", [
+                            (aligned_obj, result.aligned_path),
+                            (resid_obj, result.residuals_path),
+                        ]))
                         art_aligned = Artifact(scene_id=scene_id, type="aligned", uri=f"s3://roborouter-processed/{aligned_obj}")
                         db.add(art_aligned)
                         db.add(Metric(scene_id=scene_id, name="rmse", value=float(result.rmse)))
@@ -96,8 +100,6 @@ def pipeline_run(scene_id: uuid.UUID, steps: Optional[List[str]] = None, config_
                         except Exception:
                             pass
 
-                        resid_obj = f"overlays/residuals_{scene_id}.json"
-                        upload_file(client, "roborouter-processed", resid_obj, result.residuals_path)
                         art_resid = Artifact(scene_id=scene_id, type="residuals", uri=f"s3://roborouter-processed/{resid_obj}")
                         db.add(art_resid)
 
@@ -153,9 +155,11 @@ def pipeline_run(scene_id: uuid.UUID, steps: Optional[List[str]] = None, config_
                     classes_obj = f"segmentation/classes_{scene_id}.json"
                     conf_obj = f"segmentation/confidence_{scene_id}.json"
                     ent_obj = f"segmentation/entropy_{scene_id}.json"
-                    upload_file(client, "roborouter-processed", classes_obj, seg_out["classes_path"])  # type: ignore[index]
-                    upload_file(client, "roborouter-processed", conf_obj, seg_out["confidence_path"])  # type: ignore[index]
-                    upload_file(client, "roborouter-processed", ent_obj, seg_out["entropy_path"])  # type: ignore[index]
+                    raise_for_failures(upload_many(client, "roborouter-processed", [
+                        (classes_obj, seg_out["classes_path"]),  # type: ignore[index]
+                        (conf_obj, seg_out["confidence_path"]),  # type: ignore[index]
+                        (ent_obj, seg_out["entropy_path"]),  # type: ignore[index]
+                    ]))
 
                     art_classes = Artifact(scene_id=scene_id, type="segmentation_classes", uri=f"s3://roborouter-processed/{classes_obj}")
                     art_conf = Artifact(scene_id=scene_id, type="segmentation_confidence", uri=f"s3://roborouter-processed/{conf_obj}")
@@ -223,13 +227,11 @@ def pipeline_run(scene_id: uuid.UUID, steps: Optional[List[str]] = None, config_
 
                     mask_obj = f"change/mask_{scene_id}.json"
                     delta_obj = f"change/delta_{scene_id}.json"
-                    try:
-                        upload_file(client, "roborouter-processed", mask_obj, cd_out["change_mask_path"])  # type: ignore[index]
-                        upload_file(client, "roborouter-processed", delta_obj, cd_out["delta_table_path"])  # type: ignore[index]
-                    except Exception as exc:  # noqa: BLE001
-                        # Log and proceed to record metrics even if uploads fail
-                        import logging
-                        logging.getLogger(__name__).exception("Upload failed: %s", exc)
+                    # Failures are logged per object; metrics are recorded even if uploads fail
+                    upload_many(client, "roborouter-processed", [
+                        (mask_obj, cd_out["change_mask_path"]),  # type: ignore[index]
+                        (delta_obj, cd_out["delta_table_path"]),  # type: ignore[index]
+                    ])
 
                     art_mask = Artifact(scene_id=scene_id, type="change_mask", uri=f"s3://roborouter-processed/{mask_obj}")
                     art_delta = Artifact(scene_id=scene_id, type="change_delta", uri=f"s3://roborouter-processed/{delta_obj}")
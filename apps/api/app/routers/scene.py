@@ -12,8 +12,9 @@ from ..db import SessionLocal
 from ..models import Artifact, AuditLog, Metric, Scene
 from ..schemas import SceneDetail, ArtifactDTO, MetricDTO, AuditDTO
 from ..deps import require_api_key, require_role, require_scene_access
-from ..storage.utils import parse_s3_uri
+from ..storage.cleanup import remove_uris, scene_object_uris
 from ..storage.minio_client import get_minio_client
+from ..storage.tiles import parse_bbox, tiles_in_bbox
 
 
 router = APIRouter(tags=["Scene"])
@@ -105,22 +106,46 @@ def delete_scene(scene_id: uuid.UUID) -> Dict[str, Any]:  # type: ignore[no-unty
         scene = db.get(Scene, scene_id)
         if not scene:
             raise HTTPException(status_code=404, detail="Scene not found")
-        # Best-effort S3 cleanup for related artifacts
+        # Best-effort bulk S3 cleanup for related artifacts; failures are reported, not fatal
         try:
-            arts = db.execute(select(Artifact).where(Artifact.scene_id == scene_id)).scalars().all()
-            client = get_minio_client()
-            for a in arts:
-                if a.uri and a.uri.startswith("s3://"):
-                    try:
-                        bucket, key = parse_s3_uri(a.uri)
-                        client.remove_object(bucket, key)
-                    except Exception:
-                        pass
+            objects = remove_uris(get_minio_client(), scene_object_uris(db, [scene_id])[scene_id])
         except Exception:
-            pass
+            objects = None
         db.delete(scene)
         db.commit()
-        return {"deleted": str(scene_id)}
+        return {"deleted": str(scene_id), "objects": objects}
+    finally:
+        db.close()
+
+
+@router.get("/scene/{scene_id}/tiles")
+def list_scene_tiles(scene_id: uuid.UUID, request: Request, bbox: Optional[str] = None) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Spatial tile index of a scene; ``bbox=minx,miny,maxx,maxy`` limits it to intersecting tiles."""
+    db: Session = SessionLocal()
+    try:
+        try:
+            require_scene_access(scene_id, request)
+        except Exception as _e:
+            raise
+        if not db.get(Scene, scene_id):
+            raise HTTPException(status_code=404, detail="Scene not found")
+        try:
+            box = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        tiles = tiles_in_bbox(db, scene_id, box)
+        items = [
+            {
+                "ix": t.ix,
+                "iy": t.iy,
+                "tile_size": float(t.tile_size),
+                "bounds": {"minx": t.minx, "miny": t.miny, "minz": t.minz, "maxx": t.maxx, "maxy": t.maxy, "maxz": t.maxz},
+                "point_count": int(t.point_count),
+                "uri": t.uri,
+            }
+            for t in tiles
+        ]
+        return {"scene_id": str(scene_id), "bbox": list(box) if box else None, "items": items, "point_count": sum(i["point_count"] for i in items)}
     finally:
         db.close()
 
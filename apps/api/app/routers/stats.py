@@ -8,6 +8,10 @@ from sqlalchemy.orm import Session
 
 from ..db import SessionLocal
 from ..models import Scene, Artifact, Metric
+from ..storage.artifact_cache import get_artifact_cache
+from ..storage.minio_client import pool_stats
+from ..storage.object_meta import get_object_meta_cache
+from ..storage.presign_cache import get_presign_cache
 
 
 router = APIRouter(tags=["Stats"])
@@ -43,6 +47,7 @@ def get_stats() -> Dict[str, Any]:  # type: ignore[no-untyped-def]
         failed = db.execute(select(func.count()).select_from(latest_overall).where(latest_overall.c.rn == 1, latest_overall.c.val == 0.0)).scalar() or 0
         total_scenes = int(scenes)
         pass_rate = (float(passed) / float(passed + failed)) if (passed + failed) > 0 else 0.0
+        cache = get_artifact_cache()
         return {
             "scenes": int(scenes),
             "artifacts": int(artifacts),
@@ -52,6 +57,10 @@ def get_stats() -> Dict[str, Any]:  # type: ignore[no-untyped-def]
             "passed": int(passed),
             "failed": int(failed),
             "pass_rate": pass_rate,
+            "minio_pool": pool_stats(),
+            "artifact_cache": cache.stats() if cache else None,
+            "object_meta_cache": get_object_meta_cache().stats(),
+            "presign_cache": get_presign_cache().stats(),
         }
     finally:
         db.close()
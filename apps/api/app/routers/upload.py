@@ -1,23 +1,66 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Any, Dict
+import hashlib
+import json
 import os
+import shutil
+import tempfile
 import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..jobs import QueueFullError
+from ..schemas import DirectUploadCompleteRequest, DirectUploadInitRequest, DirectUploadPresignRequest
+from ..storage.minio_client import (
+    abort_multipart_upload,
+    complete_multipart_upload,
+    create_multipart_upload,
+    get_minio_client,
+    presigned_part_urls,
+)
+from ..utils.crs import validate_crs
+from ..utils.spool import spool_upload
+from .ingest import create_scene, queue_ingest
 
 
 router = APIRouter(tags=["Upload"])
 
+_COPY_BUF = 1024 * 1024
+
 
 @router.post("/upload")
-async def upload(file: UploadFile = File(...)) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+async def upload(file: UploadFile = File(...), ingest: bool = False, crs: str = "EPSG:3857") -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Stream a file to uploads/ and return its path, size and sha256.
+
+    The body is copied in ``upload_chunk_bytes`` pieces and capped at ``upload_max_bytes`` (413).
+    With ``ingest=true`` the file is spooled straight into an ingest work dir instead and a
+    background ingest is queued on it; the response carries the scene and job ids.
+    """
     if not file or not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
+    if ingest:
+        if not validate_crs(crs):
+            raise HTTPException(status_code=400, detail="Invalid CRS")
+        name = Path(file.filename).name
+        work_dir = _ingest_work_dir()
+        try:
+            hasher = await spool_upload(
+                file, Path(work_dir) / name, max_bytes=settings.upload_max_bytes, chunk_size=settings.upload_chunk_bytes
+            )
+        except Exception:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+        digest = (hasher.hexdigest(), hasher.size)
+        out: Dict[str, Any] = {"size": hasher.size, "sha256": digest[0]}
+        out.update(_ingest_assembled(work_dir, name, crs, input_digest=digest, content_type=file.content_type))
+        return out
     uploads_dir = Path("uploads")
     uploads_dir.mkdir(parents=True, exist_ok=True)
-    dest = uploads_dir / file.filename
+    dest = uploads_dir / Path(file.filename).name
     # Avoid overwriting silently: add suffix if exists
     i = 1
     base = dest.stem
@@ -25,91 +68,487 @@ async def upload(file: UploadFile = File(...)) -> Dict[str, Any]:  # type: ignor
     while dest.exists():
         dest = uploads_dir / f"{base}_{i}{ext}"
         i += 1
-    data = await file.read()
-    dest.write_bytes(data)
-    return {"path": str(dest.resolve())}
+    # Spool under a temp name so a partial upload never appears at the final path
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+    hasher = await spool_upload(file, tmp, max_bytes=settings.upload_max_bytes, chunk_size=settings.upload_chunk_bytes)
+    os.replace(tmp, dest)
+    return {"path": str(dest.resolve()), "size": hasher.size, "sha256": hasher.hexdigest()}
+
+
+# Upload-then-ingest: the assembled file is handed to ingest by renaming it into a work dir that
+# the ingest job owns (and removes when it finishes). The work dirs live under uploads/ so the
+# rename never crosses a filesystem and the bytes are written exactly once.
+
+INGEST_WORK_DIR = Path("uploads/ingest")
+
+
+def _ingest_work_dir() -> str:
+    INGEST_WORK_DIR.mkdir(parents=True, exist_ok=True)
+    return tempfile.mkdtemp(prefix="ingest_upload_", dir=str(INGEST_WORK_DIR))
+
+
+def _ingest_assembled(work_dir: str, name: str, crs: str, *, input_digest: Optional[Tuple[str, int]] = None, content_type: Optional[str] = None) -> Dict[str, Any]:
+    """Queue ingest of ``work_dir/name``; ``work_dir`` is removed once the job finishes or fails to queue."""
+    try:
+        return _start_ingest(
+            str(Path(work_dir) / name),
+            crs,
+            sensor_meta={"content_type": content_type} if content_type else None,
+            original_filename=name,
+            input_digest=input_digest,
+            cleanup_dir=work_dir,
+            source_uri=f"upload://{name}",
+        )
+    except HTTPException:
+        raise  # queue_ingest already removed the work dir
+    except Exception:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
 
 
 # Resumable, chunked upload API (best-effort local implementation)
+#
+# Chunks may arrive in any order and concurrently. Each chunk is streamed to disk while being
+# hashed and is recorded under received/<index>.json once fully written, so a session's state is
+# just the set of files in its directory. When init is given a chunk_size, chunks are written at
+# index * chunk_size straight into one preallocated data file and completion is a rename;
+# otherwise chunks are kept as separate files and concatenated with kernel-side copies.
 
 SESSIONS_DIR = Path("uploads/sessions")
 SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _session_dir(upload_id: str) -> Path:
+    # Upload ids are server-issued UUIDs; anything else could escape SESSIONS_DIR
+    try:
+        uuid.UUID(upload_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail="upload_id not found") from exc
+    session_dir = SESSIONS_DIR / upload_id
+    if not session_dir.exists():
+        raise HTTPException(status_code=404, detail="upload_id not found")
+    return session_dir
+
+
+def _load_session(session_dir: Path) -> Dict[str, Any]:
+    try:
+        return json.loads((session_dir / "session.json").read_text(encoding="utf-8"))
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="session missing metadata") from exc
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _session_total(session_dir: Path, total: Optional[int] = None) -> Optional[int]:
+    """Read the session's total chunk count, pinning it to ``total`` on first use."""
+    path = session_dir / "total"
+    if total is not None:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            with os.fdopen(fd, "w") as f:
+                f.write(str(total))
+            return total
+        except FileExistsError:
+            pass
+    try:
+        return int(path.read_text().strip() or 0) or None
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _received(session_dir: Path) -> Dict[int, Dict[str, Any]]:
+    out: Dict[int, Dict[str, Any]] = {}
+    for p in (session_dir / "received").glob("*.json"):
+        try:
+            out[int(p.stem)] = json.loads(p.read_text(encoding="utf-8"))
+        except (ValueError, OSError):
+            continue
+    return out
+
+
+def _stream_to_file(src: BinaryIO, dest: Path) -> Tuple[int, str]:
+    h = hashlib.sha256()
+    size = 0
+    with open(dest, "wb") as out:
+        while True:
+            buf = src.read(_COPY_BUF)
+            if not buf:
+                break
+            h.update(buf)
+            out.write(buf)
+            size += len(buf)
+    return size, h.hexdigest()
+
+
+def _stream_at_offset(src: BinaryIO, data_path: Path, offset: int, limit: int) -> Tuple[int, str]:
+    """pwrite ``src`` into ``data_path`` at ``offset``; concurrent writers touch disjoint ranges."""
+    h = hashlib.sha256()
+    size = 0
+    fd = os.open(data_path, os.O_WRONLY)
+    try:
+        while True:
+            buf = src.read(_COPY_BUF)
+            if not buf:
+                break
+            if size + len(buf) > limit:
+                raise HTTPException(status_code=400, detail=f"chunk larger than chunk_size ({limit})")
+            h.update(buf)
+            view = memoryview(buf)
+            while view:
+                n = os.pwrite(fd, view, offset + size)
+                view = view[n:]
+                size += n
+    finally:
+        os.close(fd)
+    return size, h.hexdigest()
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, count: int) -> None:
+    """Append ``count`` bytes of src to dst in the kernel (copy_file_range, then sendfile)."""
+    remaining = count
+    copy_range = getattr(os, "copy_file_range", None)
+    while remaining > 0 and copy_range is not None:
+        try:
+            n = copy_range(src_fd, dst_fd, remaining)
+        except OSError:
+            break
+        if n == 0:
+            break
+        remaining -= n
+    if remaining > 0 and hasattr(os, "sendfile"):
+        offset = count - remaining
+        try:
+            while remaining > 0:
+                n = os.sendfile(dst_fd, src_fd, offset, remaining)
+                if n == 0:
+                    break
+                offset += n
+                remaining -= n
+        except OSError:
+            pass
+    # Userspace fallback for platforms/filesystems without either syscall
+    if remaining > 0:
+        os.lseek(src_fd, count - remaining, os.SEEK_SET)
+        while remaining > 0:
+            buf = os.read(src_fd, min(_COPY_BUF, remaining))
+            if not buf:
+                break
+            os.write(dst_fd, buf)
+            remaining -= len(buf)
+
+
+def _concat_chunks(parts: List[Path], dest: Path) -> int:
+    total = 0
+    with open(dest, "wb") as out:
+        for p in parts:
+            size = p.stat().st_size
+            with open(p, "rb") as f:
+                _kernel_copy(f.fileno(), out.fileno(), size)
+            total += size
+    return total
+
+
 @router.post("/upload/chunk/init")
-def init_chunked_upload(filename: str) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
-    """Initialize a chunked upload and return an upload_id."""
+def init_chunked_upload(filename: str, chunk_size: Optional[int] = None, total_size: Optional[int] = None) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Initialize a chunked upload and return an upload_id.
+
+    Passing ``chunk_size`` (every chunk but the last must be exactly that size) enables offset
+    writes into one preallocated file; ``total_size`` lets the server reserve the space up front.
+    """
+    name = Path(filename).name
+    if not name:
+        raise HTTPException(status_code=400, detail="invalid filename")
+    if chunk_size is not None and chunk_size <= 0:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+    if settings.upload_max_bytes and total_size and total_size > settings.upload_max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {settings.upload_max_bytes} bytes")
     upload_id = str(uuid.uuid4())
     session_dir = SESSIONS_DIR / upload_id
     (session_dir / "chunks").mkdir(parents=True, exist_ok=True)
-    (session_dir / "filename").write_text(filename, encoding="utf-8")
-    return {"upload_id": upload_id}
+    (session_dir / "received").mkdir(parents=True, exist_ok=True)
+    if chunk_size:
+        data_path = session_dir / "data"
+        with open(data_path, "wb") as f:
+            if total_size:
+                try:
+                    os.posix_fallocate(f.fileno(), 0, int(total_size))
+                except (AttributeError, OSError):
+                    f.truncate(int(total_size))
+    _write_json_atomic(session_dir / "session.json", {"filename": name, "chunk_size": chunk_size, "total_size": total_size})
+    return {"upload_id": upload_id, "chunk_size": chunk_size}
 
 
 @router.post("/upload/chunk")
-async def upload_chunk(upload_id: str = File(..., alias="upload_id"), chunk_index: int = File(...), total_chunks: int = File(...), chunk: UploadFile = File(...)) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+async def upload_chunk(upload_id: str = File(..., alias="upload_id"), chunk_index: int = File(...), total_chunks: int = File(...), chunk: UploadFile = File(...), sha256: Optional[str] = File(default=None)) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
     """Upload a single chunk for an existing upload_id.
 
-    Stores chunks to uploads/sessions/<upload_id>/chunks/<index>.
+    Chunks may be sent in any order and in parallel; re-sending an index replaces it. When
+    ``sha256`` is given the chunk is rejected (and must be re-sent) if its digest differs.
     """
-    session_dir = SESSIONS_DIR / upload_id
-    if not session_dir.exists():
-        raise HTTPException(status_code=404, detail="upload_id not found")
+    session_dir = _session_dir(upload_id)
+    meta = _load_session(session_dir)
     try:
         idx = int(chunk_index)
         total = int(total_chunks)
-    except Exception:
-        raise HTTPException(status_code=400, detail="invalid chunk indices")
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="invalid chunk indices") from exc
     if idx < 0 or total <= 0 or idx >= total:
         raise HTTPException(status_code=400, detail="chunk_index/total_chunks out of range")
-    target = session_dir / "chunks" / f"{idx:08d}"
-    data = await chunk.read()
-    with open(target, "wb") as f:
-        f.write(data)
-    return {"upload_id": upload_id, "chunk_index": idx, "total_chunks": total}
+    pinned = _session_total(session_dir, total)
+    if pinned != total:
+        raise HTTPException(status_code=409, detail=f"total_chunks mismatch (session has {pinned})")
+
+    chunk_size = meta.get("chunk_size")
+    record = session_dir / "received" / f"{idx:08d}.json"
+    if chunk_size:
+        # The bytes go straight into the shared data file, so an earlier record of this index is
+        # stale from the first write on; drop it now so a failed re-send leaves the chunk missing
+        record.unlink(missing_ok=True)
+        size, digest = await run_in_threadpool(
+            _stream_at_offset, chunk.file, session_dir / "data", idx * int(chunk_size), int(chunk_size)
+        )
+        if idx < total - 1 and size != int(chunk_size):
+            raise HTTPException(status_code=400, detail=f"chunk {idx} must be exactly chunk_size bytes")
+    else:
+        # Write under a unique temp name and rename so concurrent retries never interleave
+        target = session_dir / "chunks" / f"{idx:08d}"
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+        size, digest = await run_in_threadpool(_stream_to_file, chunk.file, tmp)
+        if sha256 and sha256.lower() != digest:
+            tmp.unlink(missing_ok=True)
+        else:
+            os.replace(tmp, target)
+    if sha256 and sha256.lower() != digest:
+        record.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail=f"checksum mismatch for chunk {idx}")
+    _write_json_atomic(record, {"size": size, "sha256": digest})
+    return {"upload_id": upload_id, "chunk_index": idx, "total_chunks": total, "size": size, "sha256": digest}
+
+
+@router.get("/upload/chunk/status")
+def chunked_upload_status(upload_id: str) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Report received and missing chunk indices so an interrupted client can resume."""
+    session_dir = _session_dir(upload_id)
+    meta = _load_session(session_dir)
+    received = _received(session_dir)
+    total = _session_total(session_dir)
+    missing = [i for i in range(total) if i not in received] if total else []
+    return {
+        "upload_id": upload_id,
+        "filename": meta.get("filename"),
+        "chunk_size": meta.get("chunk_size"),
+        "total_chunks": total,
+        "received": sorted(received),
+        "missing": missing,
+        "bytes_received": sum(int(r.get("size", 0)) for r in received.values()),
+        "complete": bool(total) and not missing,
+    }
 
 
 @router.post("/upload/chunk/complete")
-def complete_chunked_upload(upload_id: str) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
-    """Finalize a chunked upload by concatenating chunk files in order to final destination under uploads/."""
-    session_dir = SESSIONS_DIR / upload_id
-    if not session_dir.exists():
-        raise HTTPException(status_code=404, detail="upload_id not found")
-    try:
-        filename = (session_dir / "filename").read_text(encoding="utf-8").strip()
-    except Exception:
-        raise HTTPException(status_code=400, detail="session missing filename")
-    chunks_dir = session_dir / "chunks"
-    parts = sorted([p for p in chunks_dir.glob("*") if p.is_file()])
-    if not parts:
+def complete_chunked_upload(upload_id: str, ingest: bool = False, crs: str = "EPSG:3857") -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Finalize a chunked upload into uploads/<filename>.
+
+    Offset-mode sessions are finalized by truncating and renaming the data file; otherwise the
+    chunk files are concatenated in index order with kernel-side copies. With ``ingest=true`` the
+    file is assembled inside an ingest work dir instead and a background ingest is queued on it;
+    if the ingest queue is full the 503 detail carries the file's uploads/ ``path``.
+    """
+    if ingest and not validate_crs(crs):
+        raise HTTPException(status_code=400, detail="Invalid CRS")
+    session_dir = _session_dir(upload_id)
+    meta = _load_session(session_dir)
+    received = _received(session_dir)
+    if not received:
         raise HTTPException(status_code=400, detail="no chunks uploaded")
-    uploads_dir = Path("uploads")
+    total = _session_total(session_dir) or (max(received) + 1)
+    missing = [i for i in range(total) if i not in received]
+    if missing:
+        raise HTTPException(status_code=400, detail={"message": "missing chunks", "missing": missing[:1000]})
+
+    work_dir = _ingest_work_dir() if ingest else None
+    uploads_dir = Path(work_dir) if work_dir else Path("uploads")
     uploads_dir.mkdir(parents=True, exist_ok=True)
-    dest = uploads_dir / filename
-    with open(dest, "wb") as out:
-        for p in parts:
-            with open(p, "rb") as f:
-                out.write(f.read())
-    # cleanup session best-effort
+    dest = uploads_dir / meta["filename"]
+    size = sum(int(received[i]["size"]) for i in range(total))
     try:
-        for p in parts:
-            try:
-                os.remove(p)
-            except Exception:
-                pass
+        if meta.get("chunk_size"):
+            data_path = session_dir / "data"
+            os.truncate(data_path, size)
+            os.replace(data_path, dest)
+        else:
+            parts = [session_dir / "chunks" / f"{i:08d}" for i in range(total)]
+            tmp = dest.with_name(f".{dest.name}.{upload_id}")
+            _concat_chunks(parts, tmp)
+            os.replace(tmp, dest)
+    except Exception:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+    # Digest over the ordered per-chunk digests; clients holding their chunk hashes can verify it
+    manifest = hashlib.sha256("".join(received[i]["sha256"] for i in range(total)).encode("ascii")).hexdigest()
+    out: Dict[str, Any] = {"size": size, "chunks": total, "manifest_sha256": manifest}
+    if work_dir:
+        # A full ingest queue removes the work dir; keep a hard link in uploads/ until the job is
+        # queued so a 503 hands the assembled file back instead of destroying it
+        keep = Path("uploads") / f".{dest.name}.{upload_id}"
         try:
-            os.remove(session_dir / "filename")
-        except Exception:
-            pass
+            os.link(dest, keep)
+        except OSError:
+            shutil.copyfile(dest, keep)
         try:
-            (session_dir / "chunks").rmdir()
-        except Exception:
-            pass
+            out.update(_ingest_assembled(work_dir, dest.name, crs))
+        except Exception as exc:
+            saved = Path("uploads") / dest.name
+            os.replace(keep, saved)
+            if isinstance(exc, HTTPException) and isinstance(exc.detail, dict):
+                exc.detail["path"] = str(saved.resolve())
+            raise
+        finally:
+            keep.unlink(missing_ok=True)
+            shutil.rmtree(session_dir, ignore_errors=True)
+    else:
+        shutil.rmtree(session_dir, ignore_errors=True)
+        out["path"] = str(dest.resolve())
+    return out
+
+
+# Direct-to-object-store uploads: the API only hands out presigned part URLs and assembles the
+# parts at the end; scan bytes go from the client straight to MinIO.
+
+_MAX_PARTS = 10_000  # S3 multipart limit
+
+
+def _direct_object(object_name: str) -> str:
+    # Only objects created by /upload/direct/init may be presigned or completed through the API
+    if not object_name.startswith("uploads/") or ".." in object_name.split("/"):
+        raise HTTPException(status_code=400, detail="invalid object_name")
+    return object_name
+
+
+def _start_ingest(
+    source: str,
+    crs: str,
+    *,
+    sensor_meta: Optional[Dict[str, Any]] = None,
+    original_filename: Optional[str] = None,
+    input_digest: Optional[Tuple[str, int]] = None,
+    cleanup_dir: Optional[str] = None,
+    source_uri: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Create a scene for ``source`` and queue its ingest; returns the scene/job handle."""
+    scene_id = create_scene(source_uri or source, crs, sensor_meta)
+    try:
+        job = queue_ingest(
+            scene_id, source, crs, original_filename=original_filename, input_digest=input_digest, cleanup_dir=cleanup_dir
+        )
+    except QueueFullError as exc:
+        raise HTTPException(status_code=503, detail={"message": str(exc)}, headers={"Retry-After": "30"}) from exc
+    return {"scene_id": str(scene_id), "job_id": job.id, "status_url": f"/ingest/jobs/{job.id}"}
+
+
+@router.post("/upload/direct/init")
+def init_direct_upload(payload: DirectUploadInitRequest) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Start a multipart upload into the raw bucket and presign a PUT URL per part.
+
+    Clients PUT part ``n`` (bytes ``[(n-1)*part_size, n*part_size)``) to ``parts[n-1].url`` in any
+    order or in parallel, keep each response's ETag, then call ``/upload/direct/complete``.
+    """
+    name = Path(payload.filename).name
+    if not name:
+        raise HTTPException(status_code=400, detail="invalid filename")
+    if settings.upload_max_bytes and payload.size and payload.size > settings.upload_max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {settings.upload_max_bytes} bytes")
+    part_size = int(payload.part_size or settings.upload_direct_part_bytes)
+    if payload.size:
+        # Grow parts rather than exceed the store's part-count limit
+        part_size = max(part_size, -(-payload.size // _MAX_PARTS))
+        count = max(1, -(-payload.size // part_size))
+    else:
+        count = 1
+    bucket = settings.minio_bucket_raw
+    object_name = f"uploads/{uuid.uuid4()}/{name}"
+    client = get_minio_client()
+    try:
+        upload_id = create_multipart_upload(client, bucket, object_name, content_type=payload.content_type)
+        urls = presigned_part_urls(
+            client, bucket, object_name, upload_id, range(1, count + 1), expires=settings.presign_expires_seconds
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail="Object store unavailable") from exc
+    return {
+        "upload_id": upload_id,
+        "bucket": bucket,
+        "object_name": object_name,
+        "part_size": part_size,
+        "parts": [{"part_number": n, "url": u} for n, u in sorted(urls.items())],
+        "expires_in": settings.presign_expires_seconds,
+    }
+
+
+@router.post("/upload/direct/presign")
+def presign_direct_parts(payload: DirectUploadPresignRequest) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Presign (more) part URLs, e.g. for uploads of unknown size or after URLs expired."""
+    object_name = _direct_object(payload.object_name)
+    numbers = sorted(set(payload.part_numbers))
+    if not numbers or numbers[0] < 1 or numbers[-1] > _MAX_PARTS:
+        raise HTTPException(status_code=400, detail=f"part_numbers must be within 1..{_MAX_PARTS}")
+    try:
+        urls = presigned_part_urls(
+            get_minio_client(),
+            settings.minio_bucket_raw,
+            object_name,
+            payload.upload_id,
+            numbers,
+            expires=settings.presign_expires_seconds,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail="Object store unavailable") from exc
+    return {"parts": [{"part_number": n, "url": u} for n, u in sorted(urls.items())], "expires_in": settings.presign_expires_seconds}
+
+
+@router.post("/upload/direct/complete")
+def complete_direct_upload(payload: DirectUploadCompleteRequest) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Assemble the uploaded parts into the final object; with ``ingest=true`` queue its ingest.
+
+    The object is registered as ``s3://<raw bucket>/<object_name>``; ingest reads it from there.
+    """
+    object_name = _direct_object(payload.object_name)
+    if payload.ingest and not validate_crs(payload.crs):
+        raise HTTPException(status_code=400, detail="Invalid CRS")
+    bucket = settings.minio_bucket_raw
+    client = get_minio_client()
+    parts = [(p.part_number, p.etag) for p in payload.parts] if payload.parts is not None else None
+    try:
+        etag = complete_multipart_upload(client, bucket, object_name, payload.upload_id, parts)
+        size = int(client.stat_object(bucket, object_name).size or 0)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail="Failed to complete multipart upload") from exc
+    if settings.upload_max_bytes and size > settings.upload_max_bytes:
         try:
-            session_dir.rmdir()
+            client.remove_object(bucket, object_name)
         except Exception:
             pass
-    except Exception:
-        pass
-    return {"path": str(dest.resolve())}
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {settings.upload_max_bytes} bytes")
+    uri = f"s3://{bucket}/{object_name}"
+    out: Dict[str, Any] = {"uri": uri, "size": size, "etag": etag}
+    if payload.ingest:
+        out.update(_start_ingest(uri, payload.crs, sensor_meta=payload.sensor_meta, original_filename=Path(object_name).name))
+    return out
+
 
+@router.delete("/upload/direct")
+def abort_direct_upload(object_name: str, upload_id: str) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    try:
+        abort_multipart_upload(get_minio_client(), settings.minio_bucket_raw, _direct_object(object_name), upload_id)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail="Failed to abort multipart upload") from exc
+    return {"aborted": upload_id}
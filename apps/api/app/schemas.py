@@ -17,6 +17,68 @@ class IngestResponse(BaseModel):
     artifact_ids: list[uuid.UUID]
     metrics: Dict[str, float]
 
+
+class DirectUploadInitRequest(BaseModel):
+    filename: str
+    size: Optional[int] = Field(default=None, ge=0)
+    part_size: Optional[int] = Field(default=None, ge=5 * 1024 * 1024)
+    content_type: Optional[str] = None
+
+
+class DirectUploadPresignRequest(BaseModel):
+    object_name: str
+    upload_id: str
+    part_numbers: list[int]
+
+
+class UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+
+
+class DirectUploadCompleteRequest(BaseModel):
+    object_name: str
+    upload_id: str
+    parts: Optional[list[UploadedPart]] = None  # listed from the object store when omitted
+    ingest: bool = False
+    crs: str = "EPSG:3857"
+    sensor_meta: Optional[Dict[str, Any]] = None
+
+
+class IngestBatchRequest(BaseModel):
+    items: list[IngestRequest]
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class IngestBatchItemResult(BaseModel):
+    index: int
+    source_uri: str
+    status: str  # succeeded | failed | invalid
+    scene_id: Optional[uuid.UUID] = None
+    artifact_ids: list[uuid.UUID] = Field(default_factory=list)
+    metrics: Dict[str, float] = Field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class IngestBatchResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    items: list[IngestBatchItemResult]
+
+class ArtifactResolveRequest(BaseModel):
+    # Either explicit ids, or a scene plus (optionally) the artifact types wanted from it
+    artifact_ids: Optional[list[uuid.UUID]] = Field(default=None, max_length=500)
+    scene_id: Optional[uuid.UUID] = None
+    types: Optional[list[str]] = None
+    filename: Optional[str] = None
+    as_attachment: bool = False
+    include_meta: bool = True  # size/content type/etag from the object metadata cache
+    # Scene mode only: newest first, at most ``limit`` rows, or just the newest of each type
+    limit: int = Field(default=500, ge=1, le=500)
+    latest_only: bool = False
+
+
 class NavigationMapResponse(BaseModel):
     scene_id: uuid.UUID
     artifact_id: uuid.UUID
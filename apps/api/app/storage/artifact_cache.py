@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from minio import Minio
+
+from ..config import settings
+from ..utils.hash import sha256_file
+from .minio_client import download_file, download_file_hashed
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts fall back to per-process locking
+    fcntl = None  # type: ignore[assignment]
+
+
+# Local on-disk cache of downloaded objects, shared by every worker process on a node.
+#
+# Entries live at objects/<h[:2]>/<h> where h = sha256(bucket, key, etag), so a rewritten object
+# (new etag) is simply a different entry. Fills download into tmp/ and os.replace() into place,
+# so readers never see a partial file; a striped flock makes concurrent misses for the same
+# object download it once. Entry mtimes are the LRU clock: hits touch them, and eviction removes
+# the oldest entries once the directory exceeds ``max_bytes``. Eviction runs without the fill
+# locks, so an entry can vanish right after ``fetch`` returns; ``materialize`` refetches then.
+# Each process tracks the bytes it added since its last scan and only rescans the directory once
+# that estimate crosses ``max_bytes``. Entries may carry a sha256 sidecar under digests/.
+
+_LOCK_STRIPES = 256
+
+
+class ArtifactCache:
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._local = threading.Lock()
+        self._size_lock = threading.Lock()
+        self._scanned_bytes: Optional[int] = None  # directory size at this process's last scan
+        self._added_bytes = 0  # bytes this process filled since then
+        for sub in ("objects", "tmp", "locks", "digests"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+
+    def _key(self, bucket: str, key: str, etag: str) -> str:
+        return hashlib.sha256(f"{bucket}\0{key}\0{etag}".encode("utf-8")).hexdigest()
+
+    def entry_path(self, bucket: str, key: str, etag: str) -> Path:
+        h = self._key(bucket, key, etag)
+        return self.root / "objects" / h[:2] / h
+
+    @contextmanager
+    def _flock(self, name: str, *, blocking: bool = True) -> Iterator[bool]:
+        with open(self.root / "locks" / name, "a+b") as fh:
+            if fcntl is None:
+                acquired = self._local.acquire(blocking)
+                try:
+                    yield acquired
+                finally:
+                    if acquired:
+                        self._local.release()
+                return
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def _digest_path(self, path: Path) -> Path:
+        return self.root / "digests" / path.parent.name / path.name
+
+    def fetch(
+        self,
+        client: Minio,
+        bucket: str,
+        key: str,
+        *,
+        etag: Optional[str] = None,
+        max_retries: int = 3,
+        with_digest: bool = False,
+    ) -> str:
+        """Path of a local copy of the object, downloading it on a miss.
+
+        The returned file is shared with other callers and processes: treat it as read-only.
+        Without ``etag`` the current one is looked up with a HEAD request. ``with_digest`` hashes a
+        miss while it downloads so ``digest`` needs no extra read.
+        """
+        if etag is None:
+            etag = str(client.stat_object(bucket, key).etag or "")
+        etag = etag.strip('"')
+        path = self.entry_path(bucket, key, etag)
+        if self._touch(path):
+            self.hits += 1
+            return str(path)
+        with self._flock(f"{int(path.name[:2], 16) % _LOCK_STRIPES:02x}.lock"):
+            # Another process may have filled it while we waited for the lock
+            if self._touch(path):
+                self.hits += 1
+                return str(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.root / "tmp" / f"{path.name}.{os.getpid()}.{uuid.uuid4().hex}"
+            try:
+                if with_digest:
+                    sha, size = download_file_hashed(client, bucket, key, str(tmp), max_retries=max_retries)
+                    self._write_digest(path, sha, size)
+                else:
+                    download_file(client, bucket, key, str(tmp), max_retries=max_retries)
+                    size = tmp.stat().st_size
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+        self.misses += 1
+        with self._size_lock:
+            self._added_bytes += size
+        self.maybe_evict(keep=path)
+        return str(path)
+
+    def _write_digest(self, path: Path, sha: str, size: int) -> None:
+        dp = self._digest_path(path)
+        dp.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dp.with_name(f"{dp.name}.{os.getpid()}.{uuid.uuid4().hex}")
+        tmp.write_text(f"{sha} {size}\n", encoding="utf-8")
+        os.replace(tmp, dp)
+
+    def digest(self, entry: str) -> Tuple[str, int]:
+        """(sha256, size) of a cache entry, from its sidecar or (once) by hashing it."""
+        path = Path(entry)
+        try:
+            sha, size = self._digest_path(path).read_text(encoding="utf-8").split()
+            return sha, int(size)
+        except (FileNotFoundError, ValueError):
+            sha, size = sha256_file(str(path)), path.stat().st_size
+            self._write_digest(path, sha, size)
+            return sha, size
+
+    def materialize(self, client: Minio, bucket: str, key: str, dest_path: str, *, etag: Optional[str] = None, max_retries: int = 3) -> str:
+        """Place the object at ``dest_path`` via the cache (hard link when possible, else a copy).
+
+        A hard-linked ``dest_path`` shares its inode with the cache entry and must not be modified
+        in place.
+        """
+        return self._materialize(client, bucket, key, dest_path, etag=etag, max_retries=max_retries)[0]
+
+    def materialize_hashed(
+        self, client: Minio, bucket: str, key: str, dest_path: str, *, etag: Optional[str] = None, max_retries: int = 3
+    ) -> Tuple[str, int]:
+        """``materialize`` that returns the object's (sha256, size), like ``download_file_hashed``."""
+        return self._materialize(client, bucket, key, dest_path, etag=etag, max_retries=max_retries, with_digest=True)[1]
+
+    def _materialize(
+        self,
+        client: Minio,
+        bucket: str,
+        key: str,
+        dest_path: str,
+        *,
+        etag: Optional[str],
+        max_retries: int,
+        with_digest: bool = False,
+    ) -> Tuple[str, Tuple[str, int]]:
+        dest = Path(dest_path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        for attempt in range(3):
+            src = self.fetch(client, bucket, key, etag=etag, max_retries=max_retries, with_digest=with_digest)
+            try:
+                digest = self.digest(src) if with_digest else ("", 0)
+                dest.unlink(missing_ok=True)
+                try:
+                    os.link(src, dest)
+                except FileNotFoundError:
+                    raise
+                except OSError:
+                    shutil.copyfile(src, dest)
+                return str(dest), digest
+            except FileNotFoundError:
+                # Evicted by another process between fetch() and the link; fill it again
+                if attempt == 2:
+                    raise
+        raise FileNotFoundError(dest_path)  # pragma: no cover - loop always returns or raises
+
+    def _touch(self, path: Path) -> bool:
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def usage(self) -> Tuple[int, int]:
+        """(entries, bytes) currently stored."""
+        count = size = 0
+        for p in (self.root / "objects").glob("*/*"):
+            try:
+                size += p.stat().st_size
+                count += 1
+            except FileNotFoundError:
+                continue
+        return count, size
+
+    def maybe_evict(self, keep: Optional[Path] = None) -> int:
+        """``evict`` only when this process's running size estimate exceeds ``max_bytes``."""
+        if self.max_bytes <= 0:
+            return 0
+        with self._size_lock:
+            if self._scanned_bytes is not None and self._scanned_bytes + self._added_bytes <= self.max_bytes:
+                return 0
+        return self.evict(keep=keep)
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Remove least recently used entries until the cache fits ``max_bytes``; returns bytes freed.
+
+        Only one process evicts at a time; others skip rather than wait.
+        """
+        if self.max_bytes <= 0:
+            return 0
+        with self._flock("evict.lock", blocking=False) as acquired:
+            if not acquired:
+                return 0
+            entries: List[Tuple[float, int, Path]] = []
+            total = 0
+            for p in (self.root / "objects").glob("*/*"):
+                try:
+                    st = p.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+                total += st.st_size
+            freed = 0
+            for _, size, p in sorted(entries, key=lambda e: e[0]):
+                if total - freed <= self.max_bytes:
+                    break
+                if keep is not None and p == keep:
+                    continue
+                p.unlink(missing_ok=True)
+                self._digest_path(p).unlink(missing_ok=True)
+                freed += size
+                self.evicted += 1
+            with self._size_lock:
+                self._scanned_bytes = total - freed
+                self._added_bytes = 0
+            return freed
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self.usage()
+        return {
+            "dir": str(self.root),
+            "max_bytes": self.max_bytes,
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+        }
+
+
+_CACHE: Optional[ArtifactCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_artifact_cache() -> Optional[ArtifactCache]:
+    """Process-wide cache, or None when ``artifact_cache_enabled`` is off."""
+    global _CACHE
+    if not settings.artifact_cache_enabled:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ArtifactCache(settings.artifact_cache_dir, settings.artifact_cache_max_bytes)
+    return _CACHE
+
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from minio import Minio
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from ..models import Artifact, AuditLog, Metric, Scene, SceneTile
+from .minio_client import remove_many
+from .utils import parse_s3_uri
+
+
+# Reported failures are capped so a broken bucket cannot blow up a response or job result
+_MAX_REPORTED_FAILURES = 100
+
+
+def scene_object_uris(db: Session, scene_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, List[str]]:
+    """Object-store URIs owned by each scene (artifacts and tiles)."""
+    ids = list(scene_ids)
+    out: Dict[uuid.UUID, List[str]] = {sid: [] for sid in ids}
+    if not ids:
+        return out
+    for sid, uri in db.execute(select(Artifact.scene_id, Artifact.uri).where(Artifact.scene_id.in_(ids))).all():
+        out[sid].append(uri)
+    for sid, uri in db.execute(select(SceneTile.scene_id, SceneTile.uri).where(SceneTile.scene_id.in_(ids))).all():
+        out[sid].append(uri)
+    return out
+
+
+def remove_uris(client: Minio, uris: Iterable[str], *, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Bulk-delete the s3:// URIs among ``uris``; returns counts and the failed URIs with reasons."""
+    targets = []
+    for uri in dict.fromkeys(u for u in uris if u and u.startswith("s3://")):
+        try:
+            targets.append(parse_s3_uri(uri))
+        except ValueError:
+            continue
+    results = remove_many(client, targets, max_workers=max_workers)
+    failed = [{"uri": f"s3://{r.bucket}/{r.object_name}", "error": r.error} for r in results if not r.ok]
+    return {"requested": len(results), "removed": len(results) - len(failed), "failed": failed}
+
+
+def _delete_scene_rows(db: Session, scene_ids: List[uuid.UUID]) -> Dict[str, int]:
+    # Tiles and ingest-hash rows go with their artifacts/scenes via ON DELETE CASCADE
+    counts = {
+        "artifacts": db.execute(delete(Artifact).where(Artifact.scene_id.in_(scene_ids))).rowcount or 0,
+        "metrics": db.execute(delete(Metric).where(Metric.scene_id.in_(scene_ids))).rowcount or 0,
+        "audit_logs": db.execute(delete(AuditLog).where(AuditLog.scene_id.in_(scene_ids))).rowcount or 0,
+        "scenes": db.execute(delete(Scene).where(Scene.id.in_(scene_ids))).rowcount or 0,
+    }
+    db.commit()
+    return counts
+
+
+def run_retention_cleanup(
+    db: Session,
+    client: Minio,
+    cutoff: datetime,
+    *,
+    batch_scenes: int = 200,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[str, float], None]] = None,
+) -> Dict[str, Any]:
+    """Delete scenes (and their objects) plus artifacts, metrics and audit logs older than ``cutoff``.
+
+    Work proceeds in batches of ``batch_scenes``: a batch's objects are bulk-deleted first, then
+    the rows of every scene whose objects are all gone are deleted and committed. Progress thus
+    lives in the database itself, so an interrupted run is resumed by simply running it again.
+    Scenes with objects that could not be deleted are kept (and retried on the next run).
+    """
+    deleted = {"scenes": 0, "artifacts": 0, "metrics": 0, "audit_logs": 0}
+    objects: Dict[str, Any] = {"requested": 0, "removed": 0, "failed": []}
+    kept: Set[uuid.UUID] = set()
+    total = int(db.execute(select(func.count(Scene.id)).where(Scene.created_at < cutoff)).scalar() or 0)
+
+    def _merge(res: Dict[str, Any]) -> None:
+        objects["requested"] += res["requested"]
+        objects["removed"] += res["removed"]
+        room = _MAX_REPORTED_FAILURES - len(objects["failed"])
+        objects["failed"].extend(res["failed"][: max(0, room)])
+
+    while True:
+        q = select(Scene.id).where(Scene.created_at < cutoff)
+        if kept:
+            q = q.where(Scene.id.notin_(kept))
+        ids = list(db.execute(q.order_by(Scene.created_at.asc()).limit(max(1, batch_scenes))).scalars().all())
+        if not ids:
+            break
+        by_scene = scene_object_uris(db, ids)
+        res = remove_uris(client, [u for uris in by_scene.values() for u in uris], max_workers=max_workers)
+        _merge(res)
+        bad = {f["uri"] for f in res["failed"]}
+        done = [sid for sid in ids if not bad.intersection(by_scene[sid])]
+        kept.update(sid for sid in ids if sid not in done)
+        if done:
+            for k, n in _delete_scene_rows(db, done).items():
+                deleted[k] += int(n)
+        if progress is not None and total:
+            progress("scenes", 0.9 * min(1.0, (deleted["scenes"] + len(kept)) / total))
+
+    # Old artifacts of newer scenes; artifacts whose objects could not be deleted are kept
+    stuck: Set[uuid.UUID] = set()
+    while True:
+        aq = select(Artifact.id, Artifact.uri).where(Artifact.created_at < cutoff)
+        if kept:
+            aq = aq.where(Artifact.scene_id.notin_(kept))
+        if stuck:
+            aq = aq.where(Artifact.id.notin_(stuck))
+        rows = db.execute(aq.limit(max(1, batch_scenes) * 10)).all()
+        if not rows:
+            break
+        # Tiles cascade with their artifact row, so their objects must go too
+        owned: Dict[uuid.UUID, List[str]] = {aid: [uri] for aid, uri in rows}
+        tiles = db.execute(select(SceneTile.artifact_id, SceneTile.uri).where(SceneTile.artifact_id.in_(list(owned)))).all()
+        for aid, uri in tiles:
+            owned[aid].append(uri)
+        res = remove_uris(client, [u for uris in owned.values() for u in uris], max_workers=max_workers)
+        _merge(res)
+        bad = {f["uri"] for f in res["failed"]}
+        stuck.update(aid for aid, uris in owned.items() if bad.intersection(uris))
+        done_ids = [aid for aid in owned if aid not in stuck]
+        if done_ids:
+            deleted["artifacts"] += int(db.execute(delete(Artifact).where(Artifact.id.in_(done_ids))).rowcount or 0)
+            db.commit()
+
+    deleted["metrics"] += int(db.execute(delete(Metric).where(Metric.created_at < cutoff)).rowcount or 0)
+    deleted["audit_logs"] += int(db.execute(delete(AuditLog).where(AuditLog.created_at < cutoff)).rowcount or 0)
+    db.commit()
+    return {"deleted": deleted, "objects": objects, "kept_scenes": len(kept), "kept_artifacts": len(stuck)}
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import uuid
+from typing import Dict
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import Artifact
+
+
+COLUMN_ARTIFACT_PREFIX = "column_"
+
+
+def column_artifacts(db: Session, scene_id: uuid.UUID) -> Dict[str, Artifact]:
+    """Latest columnar artifact of each attribute for a scene, keyed by column name."""
+    rows = db.execute(
+        select(Artifact)
+        .where(Artifact.scene_id == scene_id, Artifact.type.like(f"{COLUMN_ARTIFACT_PREFIX}%"))
+        .order_by(Artifact.created_at.asc())
+    ).scalars().all()
+    return {a.type[len(COLUMN_ARTIFACT_PREFIX):]: a for a in rows}
+
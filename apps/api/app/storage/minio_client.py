@@ -1,41 +1,204 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union, cast
+import logging
 import mimetypes
+import os
+import threading
 
+import certifi
+import urllib3
 from minio import Minio
+from minio.commonconfig import CopySource
+from minio.datatypes import Part
+from minio.deleteobjects import DeleteObject
+from minio.error import S3Error
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 import time
 
 from ..config import settings
+from ..utils.hash import HashingReader, StreamHasher
+from .object_meta import ObjectMeta, get_object_meta_cache, meta_from_stat, meta_from_write
 
 
-def get_minio_client() -> Minio:
-    return Minio(
-        settings.minio_endpoint,
-        access_key=settings.minio_access_key,
-        secret_key=settings.minio_secret_key,
-        secure=settings.minio_secure,
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# One Minio client (and urllib3 PoolManager) per process, shared by every request and worker
+# thread so TCP/TLS connections are reused. Minio clients are thread-safe but not fork-safe,
+# hence the pid check: a forked worker builds its own pool on first use.
+
+_CLIENT: Optional[Minio] = None
+_CLIENT_PID: Optional[int] = None
+_HTTP: Optional[urllib3.PoolManager] = None
+_CLIENT_LOCK = threading.Lock()
+_POOL_WAITS = 0
+_POOL_WAITS_LOCK = threading.Lock()
+
+
+class _MeteredPoolMixin:
+    # Counts checkouts that found every connection slot taken (a wait when the pool blocks)
+    def _get_conn(self, timeout: Optional[float] = None):  # type: ignore[no-untyped-def]
+        global _POOL_WAITS
+        pool = getattr(self, "pool", None)
+        if pool is not None and pool.empty():
+            with _POOL_WAITS_LOCK:
+                _POOL_WAITS += 1
+        return super()._get_conn(timeout)  # type: ignore[misc]
+
+
+class _MeteredHTTPConnectionPool(_MeteredPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _MeteredHTTPSConnectionPool(_MeteredPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+def _build_http_client() -> urllib3.PoolManager:
+    http = urllib3.PoolManager(
+        num_pools=4,
+        maxsize=max(1, settings.minio_pool_maxsize),
+        block=settings.minio_pool_block,
+        timeout=urllib3.Timeout(connect=settings.minio_connect_timeout_s, read=settings.minio_read_timeout_s),
+        retries=urllib3.Retry(
+            total=settings.minio_http_retries,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
     )
+    http.pool_classes_by_scheme = {"http": _MeteredHTTPConnectionPool, "https": _MeteredHTTPSConnectionPool}
+    return http
+
+
+def get_minio_client() -> Minio:
+    """Process-wide Minio client backed by a pooled, tunable urllib3 PoolManager."""
+    global _CLIENT, _CLIENT_PID, _HTTP
+    pid = os.getpid()
+    client = _CLIENT
+    if client is not None and _CLIENT_PID == pid:
+        return client
+    with _CLIENT_LOCK:
+        if _CLIENT is None or _CLIENT_PID != pid:
+            _HTTP = _build_http_client()
+            _CLIENT = Minio(
+                settings.minio_endpoint,
+                access_key=settings.minio_access_key,
+                secret_key=settings.minio_secret_key,
+                secure=settings.minio_secure,
+                http_client=_HTTP,
+            )
+            _CLIENT_PID = pid
+        return _CLIENT
+
+
+def reset_minio_client() -> None:
+    """Drop the shared client and close its connections (e.g. after settings change)."""
+    global _CLIENT, _CLIENT_PID, _HTTP
+    with _CLIENT_LOCK:
+        if _HTTP is not None and _CLIENT_PID == os.getpid():
+            _HTTP.clear()
+        _CLIENT, _CLIENT_PID, _HTTP = None, None, None
+    with _BUCKETS_LOCK:
+        _KNOWN_BUCKETS.clear()
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection-pool counters of the shared client.
+
+    ``in_use`` is connections currently checked out, ``idle`` open connections waiting for reuse,
+    ``opened`` connections created since start and ``waits`` checkouts that found the pool full.
+    """
+    http = _HTTP if _CLIENT_PID == os.getpid() else None
+    stats: Dict[str, Any] = {
+        "maxsize": max(1, settings.minio_pool_maxsize),
+        "block": settings.minio_pool_block,
+        "pools": 0,
+        "in_use": 0,
+        "idle": 0,
+        "opened": 0,
+        "requests": 0,
+        "waits": _POOL_WAITS,
+    }
+    if http is None:
+        return stats
+    for key in list(http.pools.keys()):
+        pool = http.pools.get(key)
+        if pool is None or pool.pool is None:
+            continue
+        free = list(pool.pool.queue)  # free slots: None (never opened) or an idle connection
+        stats["pools"] += 1
+        stats["in_use"] += pool.pool.maxsize - len(free)
+        stats["idle"] += sum(1 for c in free if c is not None)
+        stats["opened"] += int(pool.num_connections)
+        stats["requests"] += int(pool.num_requests)
+    return stats
+
+
+# Buckets known to exist in this process. Object writes only check the bucket the first time;
+# a NoSuchBucket error (bucket removed behind our back) drops the entry so the retry recreates it.
+
+_KNOWN_BUCKETS: set[str] = set()
+_BUCKETS_LOCK = threading.Lock()
 
 
 def ensure_bucket(client: Minio, bucket: str) -> None:
+    if bucket in _KNOWN_BUCKETS:
+        return
     if not client.bucket_exists(bucket):
-        client.make_bucket(bucket)
+        try:
+            client.make_bucket(bucket)
+        except S3Error as exc:
+            # Another worker created it between the check and the create
+            if exc.code not in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists"):
+                raise
+    with _BUCKETS_LOCK:
+        _KNOWN_BUCKETS.add(bucket)
 
 
-def upload_file(client: Minio, bucket: str, object_name: str, file_path: str, *, content_type: Optional[str] = None, max_retries: int = 3) -> None:
-    ensure_bucket(client, bucket)
-    guessed, _ = mimetypes.guess_type(object_name)
-    ct = content_type or guessed or "application/octet-stream"
+def forget_bucket(bucket: str) -> None:
+    with _BUCKETS_LOCK:
+        _KNOWN_BUCKETS.discard(bucket)
+
+
+def _forget_if_missing(exc: Exception, bucket: str) -> None:
+    if isinstance(exc, S3Error) and exc.code == "NoSuchBucket":
+        forget_bucket(bucket)
+
+
+def provision_buckets(client: Optional[Minio] = None) -> List[str]:
+    """Create the configured buckets once at startup; returns the ones now known to exist.
+
+    Best-effort: when the store is unreachable the buckets are checked lazily on first write.
+    """
+    client = client or get_minio_client()
+    ready: List[str] = []
+    for bucket in dict.fromkeys([settings.minio_bucket_raw, settings.minio_bucket_processed]):
+        try:
+            ensure_bucket(client, bucket)
+            ready.append(bucket)
+        except Exception:
+            logger.warning("Could not provision bucket %s", bucket, exc_info=True)
+    return ready
+
+
+def _with_retries(op: Callable[[], T], *, max_retries: int = 3, bucket: Optional[str] = None) -> T:
+    """Run ``op`` with the shared exponential backoff (0.5 s doubling, capped at 4 s)."""
     attempt = 0
     delay = 0.5
     while True:
         try:
-            client.fput_object(bucket, object_name, file_path, content_type=ct)
-            return
-        except Exception:
+            return op()
+        except Exception as exc:
+            if bucket is not None:
+                _forget_if_missing(exc, bucket)
             attempt += 1
             if attempt > max_retries:
                 raise
@@ -43,24 +206,50 @@ def upload_file(client: Minio, bucket: str, object_name: str, file_path: str, *,
             delay = min(4.0, delay * 2)
 
 
-def upload_file_stream(client: Minio, bucket: str, object_name: str, file_path: str, *, content_type: Optional[str] = None, part_size: int = 5 * 1024 * 1024, max_retries: int = 3) -> None:
-    ensure_bucket(client, bucket)
+def upload_file(client: Minio, bucket: str, object_name: str, file_path: str, *, content_type: Optional[str] = None, max_retries: int = 3) -> None:
+    guessed, _ = mimetypes.guess_type(object_name)
+    ct = content_type or guessed or "application/octet-stream"
+
+    def _put() -> None:
+        ensure_bucket(client, bucket)
+        res = client.fput_object(bucket, object_name, file_path, content_type=ct)
+        size = Path(file_path).stat().st_size
+        get_object_meta_cache().put(bucket, object_name, meta_from_write(res, size=size, content_type=ct))
+
+    _with_retries(_put, max_retries=max_retries, bucket=bucket)
+
+
+def upload_file_stream(client: Minio, bucket: str, object_name: str, file_path: str, *, content_type: Optional[str] = None, part_size: int = 5 * 1024 * 1024, max_retries: int = 3) -> str:
+    """Stream a file with put_object and return its sha256, computed from the bytes as they are sent."""
     guessed, _ = mimetypes.guess_type(object_name)
     ct = content_type or guessed or "application/octet-stream"
     size = Path(file_path).stat().st_size
-    attempt = 0
-    delay = 0.5
-    while True:
-        try:
-            with open(file_path, "rb") as data:
-                client.put_object(bucket, object_name, data, length=size, part_size=part_size, content_type=ct)
-            return
-        except Exception:
-            attempt += 1
-            if attempt > max_retries:
-                raise
-            time.sleep(delay)
-            delay = min(4.0, delay * 2)
+
+    def _put() -> str:
+        ensure_bucket(client, bucket)
+        with open(file_path, "rb") as f:
+            data = HashingReader(f)
+            res = client.put_object(bucket, object_name, cast(BinaryIO, data), length=size, part_size=part_size, content_type=ct)
+        get_object_meta_cache().put(bucket, object_name, meta_from_write(res, size=size, content_type=ct))
+        return data.hasher.hexdigest()
+
+    return _with_retries(_put, max_retries=max_retries, bucket=bucket)
+
+
+def copy_object(client: Minio, src_bucket: str, src_object: str, bucket: str, object_name: str, *, max_retries: int = 3) -> None:
+    """Server-side copy; object bytes never pass through the API process."""
+
+    def _copy() -> None:
+        ensure_bucket(client, bucket)
+        res = client.copy_object(bucket, object_name, CopySource(src_bucket, src_object))
+        cache = get_object_meta_cache()
+        src = cache.get(src_bucket, src_object)
+        if src is not None:
+            cache.put(bucket, object_name, meta_from_write(res, size=src.size, content_type=src.content_type))
+        else:
+            cache.invalidate(bucket, object_name)
+
+    _with_retries(_copy, max_retries=max_retries, bucket=bucket)
 
 
 def presigned_get_url(
@@ -78,19 +267,304 @@ def presigned_get_url(
     )
 
 
+# Presigned multipart uploads. minio-py keeps the multipart primitives private; they are thin,
+# stable wrappers over the S3 API (CreateMultipartUpload / ListParts / CompleteMultipartUpload).
+
+def create_multipart_upload(client: Minio, bucket: str, object_name: str, *, content_type: Optional[str] = None) -> str:
+    """Start a multipart upload and return its S3 upload id."""
+    ensure_bucket(client, bucket)
+    guessed, _ = mimetypes.guess_type(object_name)
+    headers: Dict[str, Union[str, List[str], Tuple[str]]] = {"Content-Type": content_type or guessed or "application/octet-stream"}
+    return client._create_multipart_upload(bucket, object_name, headers)  # type: ignore[attr-defined]
+
+
+def presigned_part_urls(
+    client: Minio,
+    bucket: str,
+    object_name: str,
+    upload_id: str,
+    part_numbers: Iterable[int],
+    *,
+    expires: int = 3600,
+) -> Dict[int, str]:
+    """Presigned PUT URLs clients use to send parts straight to the object store."""
+    return {
+        int(n): client.get_presigned_url(
+            "PUT",
+            bucket,
+            object_name,
+            expires=timedelta(seconds=expires),
+            extra_query_params={"uploadId": upload_id, "partNumber": str(int(n))},
+        )
+        for n in part_numbers
+    }
+
+
+def list_uploaded_parts(client: Minio, bucket: str, object_name: str, upload_id: str) -> List[Tuple[int, str]]:
+    """(part_number, etag) of every part the store has received, in part order."""
+    parts: List[Tuple[int, str]] = []
+    marker: Optional[str] = None
+    while True:
+        res = client._list_parts(bucket, object_name, upload_id, part_number_marker=marker)  # type: ignore[attr-defined]
+        parts.extend((p.part_number, p.etag) for p in res.parts)
+        if not res.is_truncated:
+            break
+        marker = str(res.next_part_number_marker)
+    return sorted(parts)
+
+
+def complete_multipart_upload(
+    client: Minio,
+    bucket: str,
+    object_name: str,
+    upload_id: str,
+    parts: Optional[List[Tuple[int, str]]] = None,
+) -> str:
+    """Assemble the uploaded parts (listed from the store when not given); returns the object etag."""
+    if parts is None:
+        parts = list_uploaded_parts(client, bucket, object_name, upload_id)
+    if not parts:
+        raise ValueError("No parts uploaded")
+    res = client._complete_multipart_upload(  # type: ignore[attr-defined]
+        bucket, object_name, upload_id, [Part(n, etag) for n, etag in sorted(parts)]
+    )
+    get_object_meta_cache().invalidate(bucket, object_name)
+    return str(res.etag or "")
+
+
+def abort_multipart_upload(client: Minio, bucket: str, object_name: str, upload_id: str) -> None:
+    client._abort_multipart_upload(bucket, object_name, upload_id)  # type: ignore[attr-defined]
+
+
+def download_file_hashed(client: Minio, bucket: str, object_name: str, dest_path: str, *, chunk_size: int = 8 * 1024 * 1024, max_retries: int = 3) -> Tuple[str, int]:
+    """Download to ``dest_path`` and return (sha256, size) computed while the bytes arrive."""
+    Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
+
+    def _get() -> Tuple[str, int]:
+        hasher = StreamHasher()
+        resp = client.get_object(bucket, object_name)
+        try:
+            with open(dest_path, "wb") as out:
+                for chunk in resp.stream(chunk_size):
+                    hasher.update(chunk)
+                    out.write(chunk)
+        finally:
+            resp.close()
+            resp.release_conn()
+        return hasher.hexdigest(), hasher.size
+
+    return _with_retries(_get, max_retries=max_retries)
+
+
+def open_object(
+    client: Minio,
+    bucket: str,
+    object_name: str,
+    *,
+    offset: int = 0,
+    length: int = 0,
+    if_match: Optional[str] = None,
+    chunk_size: int = 1024 * 1024,
+) -> Tuple[Any, Iterator[bytes]]:
+    """GET an object (``length`` bytes from ``offset``; 0 = to the end): (response headers, byte iterator).
+
+    The GET is issued before returning, so a missing object raises here rather than mid-stream;
+    the connection goes back to the pool when iteration finishes or the iterator is closed. With
+    ``if_match`` the store refuses (S3Error ``PreconditionFailed``) once the object's ETag differs.
+    """
+    request_headers = {"If-Match": f'"{if_match}"'} if if_match else None
+    resp = client.get_object(bucket, object_name, offset=offset, length=length, request_headers=request_headers)
+
+    def _chunks() -> Iterator[bytes]:
+        try:
+            for chunk in resp.stream(chunk_size):
+                yield chunk
+        finally:
+            resp.close()
+            resp.release_conn()
+
+    return resp.headers, _chunks()
+
+
+def stream_object(client: Minio, bucket: str, object_name: str, *, offset: int = 0, length: int = 0, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Byte iterator of ``open_object``."""
+    return open_object(client, bucket, object_name, offset=offset, length=length, chunk_size=chunk_size)[1]
+
+
 def download_file(client: Minio, bucket: str, object_name: str, dest_path: str, *, max_retries: int = 3) -> None:
     Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
-    attempt = 0
-    delay = 0.5
-    while True:
+    _with_retries(lambda: client.fget_object(bucket, object_name, dest_path), max_retries=max_retries)
+
+
+# Batched transfers for stages that produce or consume several objects. Each object is moved on a
+# bounded thread pool (sharing the pooled client) with the usual per-object retries, so a batch
+# takes about as long as its slowest object; failures are reported per object, never raised.
+
+@dataclass
+class TransferResult:
+    bucket: str
+    object_name: str
+    path: str
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class TransferError(RuntimeError):
+    def __init__(self, failures: List[TransferResult]) -> None:
+        self.failures = failures
+        names = ", ".join(f.object_name for f in failures[:5])
+        super().__init__(f"{len(failures)} transfer(s) failed: {names}")
+
+
+def raise_for_failures(results: List[TransferResult]) -> List[TransferResult]:
+    """Raise TransferError when any transfer failed; returns ``results`` otherwise."""
+    failures = [r for r in results if not r.ok]
+    if failures:
+        raise TransferError(failures)
+    return results
+
+
+def _run_transfers(jobs: List[Tuple[TransferResult, Callable[[], Any]]], max_workers: Optional[int]) -> List[TransferResult]:
+    if not jobs:
+        return []
+    workers = max(1, min(len(jobs), max_workers or settings.minio_transfer_workers, settings.minio_pool_maxsize))
+
+    def _one(job: Tuple[TransferResult, Callable[[], Any]]) -> TransferResult:
+        res, op = job
         try:
-            client.fget_object(bucket, object_name, dest_path)
-            return
-        except Exception:
-            attempt += 1
-            if attempt > max_retries:
-                raise
-            time.sleep(delay)
-            delay = min(4.0, delay * 2)
+            op()
+        except Exception as exc:
+            logger.warning("Transfer of %s/%s failed", res.bucket, res.object_name, exc_info=True)
+            res.error = str(exc) or type(exc).__name__
+        return res
+
+    if workers == 1:
+        return [_one(j) for j in jobs]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="minio-transfer") as pool:
+        return list(pool.map(_one, jobs))
+
+
+def upload_many(
+    client: Minio,
+    bucket: str,
+    items: Iterable[Tuple[str, ...]],
+    *,
+    content_type: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    max_retries: int = 3,
+) -> List[TransferResult]:
+    """Upload ``(object_name, file_path[, content_type])`` items concurrently; results keep input order."""
+    ensure_bucket(client, bucket)
+    jobs: List[Tuple[TransferResult, Callable[[], Any]]] = []
+    for item in items:
+        object_name, file_path = item[0], item[1]
+        ct = item[2] if len(item) > 2 else content_type
+
+        def _op(o: str = object_name, f: str = file_path, c: Optional[str] = ct) -> None:
+            upload_file(client, bucket, o, f, content_type=c, max_retries=max_retries)
+
+        jobs.append((TransferResult(bucket, object_name, file_path), _op))
+    return _run_transfers(jobs, max_workers)
 
 
+def download_many(
+    client: Minio,
+    items: Iterable[Tuple[str, str, str]],
+    *,
+    max_workers: Optional[int] = None,
+    max_retries: int = 3,
+) -> List[TransferResult]:
+    """Download ``(bucket, object_name, dest_path)`` items concurrently; results keep input order."""
+    jobs: List[Tuple[TransferResult, Callable[[], Any]]] = []
+    for bucket, object_name, dest_path in items:
+
+        def _op(b: str = bucket, o: str = object_name, d: str = dest_path) -> None:
+            download_file(client, b, o, d, max_retries=max_retries)
+
+        jobs.append((TransferResult(bucket, object_name, dest_path), _op))
+    return _run_transfers(jobs, max_workers)
+
+
+def stat_many(
+    client: Minio,
+    objects: Iterable[Tuple[str, str]],
+    *,
+    max_workers: Optional[int] = None,
+) -> Dict[Tuple[str, str], Optional[ObjectMeta]]:
+    """Metadata of ``(bucket, object_name)`` items: cache hits first, misses stat'ed concurrently.
+
+    Objects whose stat fails map to None.
+    """
+    cache = get_object_meta_cache()
+    out: Dict[Tuple[str, str], Optional[ObjectMeta]] = {}
+    jobs: List[Tuple[TransferResult, Callable[[], Any]]] = []
+    for bucket, object_name in dict.fromkeys(objects):
+        meta = cache.get(bucket, object_name)
+        out[(bucket, object_name)] = meta
+        if meta is not None:
+            continue
+
+        def _op(b: str = bucket, o: str = object_name) -> None:
+            fresh = meta_from_stat(client.stat_object(b, o))
+            cache.put(b, o, fresh)
+            out[(b, o)] = fresh
+
+        jobs.append((TransferResult(bucket, object_name, ""), _op))
+    _run_transfers(jobs, max_workers)
+    return out
+
+
+def remove_many(
+    client: Minio,
+    objects: Iterable[Tuple[str, str]],
+    *,
+    max_workers: Optional[int] = None,
+    batch_size: int = 1000,
+    max_retries: int = 3,
+) -> List[TransferResult]:
+    """Delete ``(bucket, object_name)`` items with multi-object DELETEs; results keep input order.
+
+    Objects are grouped per bucket into requests of up to ``batch_size`` keys (the S3 limit is
+    1000) that run concurrently. Keys the store refuses to delete, or whose whole batch failed
+    after retries, come back with ``error`` set. Deleting a missing key counts as success.
+    """
+    results = [TransferResult(bucket, key, "") for bucket, key in objects]
+    batches: List[List[TransferResult]] = []
+    by_bucket: Dict[str, List[TransferResult]] = {}
+    for r in results:
+        by_bucket.setdefault(r.bucket, []).append(r)
+    size = max(1, min(1000, batch_size))
+    for rs in by_bucket.values():
+        batches.extend(rs[i:i + size] for i in range(0, len(rs), size))
+    if not batches:
+        return results
+
+    def _remove(batch: List[TransferResult]) -> None:
+        bucket = batch[0].bucket
+
+        def _op() -> Dict[str, str]:
+            errors = client.remove_objects(bucket, [DeleteObject(r.object_name) for r in batch])
+            return {str(e.name): f"{e.code}: {e.message}" for e in errors}
+
+        try:
+            failed = _with_retries(_op, max_retries=max_retries)
+        except Exception as exc:
+            logger.warning("Bulk delete of %d objects in %s failed", len(batch), bucket, exc_info=True)
+            failed = {r.object_name: str(exc) or type(exc).__name__ for r in batch}
+        cache = get_object_meta_cache()
+        for r in batch:
+            r.error = failed.get(r.object_name)
+            if r.error is None:
+                cache.invalidate(bucket, r.object_name)
+
+    workers = max(1, min(len(batches), max_workers or settings.minio_transfer_workers, settings.minio_pool_maxsize))
+    if workers == 1:
+        for b in batches:
+            _remove(b)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="minio-delete") as pool:
+            list(pool.map(_remove, batches))
+    return results
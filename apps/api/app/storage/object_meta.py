@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+
+
+@dataclass
+class ObjectMeta:
+    size: Optional[int]
+    content_type: Optional[str]
+    last_modified: Optional[float]  # epoch seconds
+    etag: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return parsedate_to_datetime(str(value)).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def meta_from_stat(stat: Any) -> ObjectMeta:
+    return ObjectMeta(
+        size=getattr(stat, "size", None),
+        content_type=getattr(stat, "content_type", None),
+        last_modified=_timestamp(getattr(stat, "last_modified", None)),
+        etag=(getattr(stat, "etag", None) or "").strip('"') or None,
+    )
+
+
+def meta_from_write(result: Any, *, size: Optional[int], content_type: Optional[str]) -> ObjectMeta:
+    """Metadata of an object we just wrote, from the PUT/COPY/complete response (no extra request)."""
+    headers = getattr(result, "http_headers", None) or {}
+    last_modified = _timestamp(getattr(result, "last_modified", None))
+    if last_modified is None:
+        # Writes return no Last-Modified; the response Date is the store's clock at commit time
+        last_modified = _timestamp(headers.get("Date") if hasattr(headers, "get") else None) or time.time()
+    return ObjectMeta(
+        size=size,
+        content_type=content_type,
+        last_modified=last_modified,
+        etag=(getattr(result, "etag", None) or "").strip('"') or None,
+    )
+
+
+class ObjectMetaCache:
+    """Bounded LRU of object metadata keyed by (bucket, key), with a per-entry TTL.
+
+    Entries are written when the API uploads or copies an object and when a stat misses, and are
+    dropped when the object is deleted, so artifact lookups normally skip ``stat_object``.
+    """
+
+    def __init__(self, max_entries: int, ttl_s: float) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple[str, str], Tuple[ObjectMeta, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, bucket: str, key: str) -> Optional[ObjectMeta]:
+        with self._lock:
+            rec = self._data.get((bucket, key))
+            if rec is not None and rec[1] > time.monotonic():
+                self._data.move_to_end((bucket, key))
+                self.hits += 1
+                return rec[0]
+            if rec is not None:
+                del self._data[(bucket, key)]
+            self.misses += 1
+            return None
+
+    def put(self, bucket: str, key: str, meta: ObjectMeta) -> None:
+        with self._lock:
+            self._data[(bucket, key)] = (meta, time.monotonic() + self.ttl_s)
+            self._data.move_to_end((bucket, key))
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, bucket: str, key: str) -> None:
+        with self._lock:
+            self._data.pop((bucket, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._data), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+_CACHE = ObjectMetaCache(settings.object_meta_cache_max_entries, settings.object_meta_cache_ttl_s)
+
+
+def get_object_meta_cache() -> ObjectMetaCache:
+    return _CACHE
+
+
+def object_meta(client: Any, bucket: str, key: str) -> ObjectMeta:
+    """Cached metadata of an object, falling back to one ``stat_object`` on a miss."""
+    meta = _CACHE.get(bucket, key)
+    if meta is None:
+        meta = meta_from_stat(client.stat_object(bucket, key))
+        _CACHE.put(bucket, key, meta)
+    return meta
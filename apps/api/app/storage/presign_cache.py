@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import abc
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+
+
+# Presigned GET URLs keyed by everything that changes the URL: artifact id, content disposition
+# and filename. Callers store an expiry a little before the URL's own, so a cached URL is never
+# handed out about to lapse. The memory backend is a per-process LRU; the sqlite backend is one
+# small WAL-mode database per node so every worker process reuses the same URLs. Hit/miss counts
+# are per process (the Prometheus counter aggregates them across workers).
+
+Key = Tuple[str, str, str]
+
+
+def presign_key(artifact_id: str, disposition: Optional[str], filename: Optional[str]) -> Key:
+    return (str(artifact_id), disposition or "", filename or "")
+
+
+class PresignCache(abc.ABC):
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._count_lock = threading.Lock()
+
+    def _count(self, hit: bool) -> None:
+        with self._count_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @abc.abstractmethod
+    def get(self, key: Key) -> Optional[Tuple[str, float]]:
+        """(url, expires_at epoch seconds) of a live entry, or None."""
+
+    @abc.abstractmethod
+    def put(self, key: Key, url: str, expires_at: float) -> None:
+        ...
+
+    @abc.abstractmethod
+    def invalidate(self, artifact_id: str) -> None:
+        """Drop every cached URL of an artifact, whatever its disposition."""
+
+    @abc.abstractmethod
+    def size(self) -> int:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "entries": self.size(),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+class MemoryPresignCache(PresignCache):
+    def __init__(self, max_entries: int) -> None:
+        super().__init__(max_entries)
+        self._data: "OrderedDict[Key, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Key) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            rec = self._data.get(key)
+            if rec is not None and rec[1] <= time.time():
+                del self._data[key]
+                rec = None
+            if rec is not None:
+                self._data.move_to_end(key)
+        self._count(rec is not None)
+        return rec
+
+    def put(self, key: Key, url: str, expires_at: float) -> None:
+        with self._lock:
+            self._data[key] = (url, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, artifact_id: str) -> None:
+        with self._lock:
+            for k in [k for k in self._data if k[0] == str(artifact_id)]:
+                del self._data[k]
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class SqlitePresignCache(PresignCache):
+    def __init__(self, path: str, max_entries: int) -> None:
+        super().__init__(max_entries)
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS presigned ("
+                " artifact_id TEXT NOT NULL, disposition TEXT NOT NULL, filename TEXT NOT NULL,"
+                " url TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL,"
+                " PRIMARY KEY (artifact_id, disposition, filename))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS presigned_used ON presigned (used_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: Key) -> Optional[Tuple[str, float]]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT url, expires_at FROM presigned WHERE artifact_id=? AND disposition=? AND filename=? AND expires_at>?",
+            (*key, now),
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE presigned SET used_at=? WHERE artifact_id=? AND disposition=? AND filename=?", (now, *key)
+            )
+        self._count(row is not None)
+        return (str(row[0]), float(row[1])) if row is not None else None
+
+    def put(self, key: Key, url: str, expires_at: float) -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO presigned (artifact_id, disposition, filename, url, expires_at, used_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, url, expires_at, now),
+        )
+        # Expired rows first, then least recently used beyond the cap
+        conn.execute("DELETE FROM presigned WHERE expires_at<=?", (now,))
+        conn.execute(
+            "DELETE FROM presigned WHERE rowid IN (SELECT rowid FROM presigned ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def invalidate(self, artifact_id: str) -> None:
+        self._conn().execute("DELETE FROM presigned WHERE artifact_id=?", (str(artifact_id),))
+
+    def size(self) -> int:
+        return int(self._conn().execute("SELECT COUNT(*) FROM presigned").fetchone()[0])
+
+
+_CACHE: Optional[PresignCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_presign_cache() -> PresignCache:
+    """Process-wide presign cache using the configured backend (memory or sqlite)."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                if settings.presign_cache_backend == "sqlite":
+                    _CACHE = SqlitePresignCache(settings.presign_cache_sqlite_path, settings.presign_cache_max_entries)
+                else:
+                    _CACHE = MemoryPresignCache(settings.presign_cache_max_entries)
+    return _CACHE
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import uuid
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import SceneTile
+
+
+BBox = Tuple[float, float, float, float]
+
+
+def parse_bbox(value: str) -> BBox:
+    """Parse "minx,miny,maxx,maxy"."""
+    parts = [float(p) for p in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must be minx,miny,maxx,maxy")
+    minx, miny, maxx, maxy = parts
+    if minx > maxx or miny > maxy:
+        raise ValueError("bbox min must not exceed max")
+    return minx, miny, maxx, maxy
+
+
+def tiles_in_bbox(db: Session, scene_id: uuid.UUID, bbox: Optional[BBox] = None) -> List[SceneTile]:
+    """Tiles of a scene whose point bounds intersect ``bbox`` (all tiles when bbox is None)."""
+    q = select(SceneTile).where(SceneTile.scene_id == scene_id)
+    if bbox is not None:
+        minx, miny, maxx, maxy = bbox
+        q = q.where(SceneTile.maxx >= minx, SceneTile.minx <= maxx, SceneTile.maxy >= miny, SceneTile.miny <= maxy)
+    return list(db.execute(q.order_by(SceneTile.ix.asc(), SceneTile.iy.asc())).scalars().all())
+
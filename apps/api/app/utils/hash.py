@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+from typing import BinaryIO
 
 
 def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
@@ -14,3 +15,30 @@ def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
     return h.hexdigest()
 
 
+class StreamHasher:
+    """Running sha256 + byte count, fed chunk by chunk while data is copied elsewhere."""
+
+    def __init__(self) -> None:
+        self._h = hashlib.sha256()
+        self.size = 0
+
+    def update(self, chunk: bytes) -> None:
+        self._h.update(chunk)
+        self.size += len(chunk)
+
+    def hexdigest(self) -> str:
+        return self._h.hexdigest()
+
+
+class HashingReader:
+    """File-like wrapper that hashes everything read through it (e.g. by an uploader)."""
+
+    def __init__(self, raw: BinaryIO, hasher: StreamHasher | None = None) -> None:
+        self._raw = raw
+        self.hasher = hasher or StreamHasher()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        if data:
+            self.hasher.update(data)
+        return data
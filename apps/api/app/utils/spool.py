@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from .hash import StreamHasher
+
+
+class UploadTooLarge(HTTPException):
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+
+
+def _write_hashed(out: BinaryIO, hasher: StreamHasher, chunk: bytes) -> None:
+    hasher.update(chunk)
+    out.write(chunk)
+
+
+async def spool_upload(file: UploadFile, dest: Path, *, max_bytes: int = 0, chunk_size: int = 8 * 1024 * 1024) -> StreamHasher:
+    """Copy an upload to ``dest`` in fixed-size chunks, hashing as it goes.
+
+    Hashing and disk writes run on a worker thread so the event loop is never blocked on I/O, and
+    at most one chunk is held in memory. Raises 413 (removing the partial file) past ``max_bytes``.
+    """
+    if max_bytes and file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    hasher = StreamHasher()
+    try:
+        with open(dest, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                if max_bytes and hasher.size + len(chunk) > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                await run_in_threadpool(_write_hashed, out, hasher, chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return hasher
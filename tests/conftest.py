@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def write_las(
+    path: Path,
+    xyz: Optional[np.ndarray] = None,
+    *,
+    intensity: Optional[np.ndarray] = None,
+    count: Optional[int] = None,
+    scale: float = 0.001,
+    offset: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+    bounds: Optional[Dict[str, float]] = None,
+    epsg: Optional[int] = None,
+    point_format: int = 0,
+) -> None:
+    """Hand-rolled LAS 1.2 file with 20-byte point format 0 records (X, Y, Z, intensity).
+
+    Without ``xyz`` only the header (and optional GeoKey VLR) is written, claiming ``count``
+    points within ``bounds``; with ``xyz`` the header bounds default to the points' own.
+    """
+    n = len(xyz) if xyz is not None else 0
+    vlrs = b""
+    if epsg is not None:
+        # GeoKeyDirectory: header quad + one ProjectedCSTypeGeoKey entry
+        payload = struct.pack("<8H", 1, 1, 0, 1, 3072, 0, 1, epsg)
+        vlrs = struct.pack("<H16sHH32s", 0, b"LASF_Projection", 34735, len(payload), b"") + payload
+    if bounds is None:
+        lo, hi = (xyz.min(axis=0), xyz.max(axis=0)) if xyz is not None and n else (np.zeros(3), np.zeros(3))
+        bounds = {"minx": lo[0], "miny": lo[1], "minz": lo[2], "maxx": hi[0], "maxy": hi[1], "maxz": hi[2]}
+    header = bytearray(227)
+    header[0:4] = b"LASF"
+    header[24], header[25] = 1, 2
+    struct.pack_into("<H", header, 94, 227)
+    struct.pack_into("<I", header, 96, 227 + len(vlrs))
+    struct.pack_into("<I", header, 100, 1 if vlrs else 0)
+    header[104] = point_format
+    struct.pack_into("<H", header, 105, 20)
+    struct.pack_into("<I", header, 107, n if count is None else count)
+    struct.pack_into("<3d", header, 131, scale, scale, scale)
+    struct.pack_into("<3d", header, 155, *offset)
+    struct.pack_into(
+        "<6d", header, 179,
+        bounds["maxx"], bounds["minx"], bounds["maxy"], bounds["miny"], bounds["maxz"], bounds["minz"],
+    )
+    rec = np.zeros(n, dtype=np.dtype({
+        "names": ["X", "Y", "Z", "intensity"],
+        "formats": ["<i4", "<i4", "<i4", "<u2"],
+        "offsets": [0, 4, 8, 12],
+        "itemsize": 20,
+    }))
+    if xyz is not None and n:
+        ints = np.round((xyz - np.asarray(offset)) / scale).astype(np.int32)
+        rec["X"], rec["Y"], rec["Z"] = ints[:, 0], ints[:, 1], ints[:, 2]
+    if intensity is not None:
+        rec["intensity"] = intensity
+    path.write_bytes(bytes(header) + vlrs + rec.tobytes())
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+from apps.api.app.storage.artifact_cache import ArtifactCache
+
+
+class _FakeStore:
+    def __init__(self, objects: dict[str, bytes]) -> None:
+        self.objects = objects
+        self.gets = 0
+
+    def stat_object(self, bucket: str, key: str):  # type: ignore[no-untyped-def]
+        return SimpleNamespace(etag=f'"{len(self.objects[key])}"')
+
+    def fget_object(self, bucket: str, key: str, dest: str) -> None:
+        self.gets += 1
+        Path(dest).write_bytes(self.objects[key])
+
+
+def test_cache_hits_refills_on_new_etag_and_evicts_lru(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    store = _FakeStore({"a": b"x" * 40, "b": b"y" * 40, "c": b"z" * 40})
+    cache = ArtifactCache(str(tmp_path / "cache"), max_bytes=100)
+
+    pa = cache.fetch(store, "bkt", "a")  # type: ignore[arg-type]
+    assert Path(pa).read_bytes() == b"x" * 40
+    assert cache.fetch(store, "bkt", "a") == pa and store.gets == 1  # type: ignore[arg-type]
+    assert not list((tmp_path / "cache" / "tmp").iterdir())
+
+    dest = cache.materialize(store, "bkt", "a", str(tmp_path / "work" / "a.las"))  # type: ignore[arg-type]
+    assert os.stat(dest).st_ino == os.stat(pa).st_ino and store.gets == 1
+
+    # A rewritten object has a new etag, hence a new entry
+    store.objects["a"] = b"x" * 41
+    assert Path(cache.fetch(store, "bkt", "a")).read_bytes() == b"x" * 41 and store.gets == 2  # type: ignore[arg-type]
+
+    # 81 bytes cached; make the new "a" the most recently used, then overflow the cap with b + c
+    os.utime(pa, (1, 1))
+    pb = cache.fetch(store, "bkt", "b")  # type: ignore[arg-type]
+    os.utime(pb, (2, 2))
+    pc = cache.fetch(store, "bkt", "c")  # type: ignore[arg-type]
+    assert not Path(pa).exists() and not Path(pb).exists() and Path(pc).exists()
+    assert cache.usage() == (2, 81)
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 4
+
+
+class _HashingStore(_FakeStore):
+    def get_object(self, bucket: str, key: str, offset: int = 0, length: int = 0):  # type: ignore[no-untyped-def]
+        self.gets += 1
+        data = self.objects[key]
+
+        class _Resp:
+            def stream(self, amt: int = 65536):  # type: ignore[no-untyped-def]
+                for i in range(0, len(data), amt):
+                    yield data[i:i + amt]
+
+            def close(self) -> None:
+                pass
+
+            def release_conn(self) -> None:
+                pass
+
+        return _Resp()
+
+
+def test_materialize_hashed_keeps_digest_and_refetches_evicted_entry(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import hashlib
+
+    store = _HashingStore({"a": b"q" * 30})
+    cache = ArtifactCache(str(tmp_path / "cache"), max_bytes=1000)
+    want = (hashlib.sha256(b"q" * 30).hexdigest(), 30)
+    assert cache.materialize_hashed(store, "bkt", "a", str(tmp_path / "w1" / "a.las")) == want  # type: ignore[arg-type]
+    assert cache.materialize_hashed(store, "bkt", "a", str(tmp_path / "w2" / "a.las")) == want  # type: ignore[arg-type]
+    assert store.gets == 1  # the hit reads the digest sidecar, not the object
+
+    # Another process evicts the entry between fetch() returning and the hard link
+    real_fetch = cache.fetch
+    calls = []
+
+    def racing_fetch(*args, **kwargs):  # type: ignore[no-untyped-def]
+        path = real_fetch(*args, **kwargs)
+        calls.append(path)
+        if len(calls) == 1:
+            Path(path).unlink()
+        return path
+
+    monkeypatch.setattr(cache, "fetch", racing_fetch)
+    dest = cache.materialize(store, "bkt", "a", str(tmp_path / "w3" / "a.las"))  # type: ignore[arg-type]
+    assert Path(dest).read_bytes() == b"q" * 30 and len(calls) == 2 and store.gets == 2
+
+
+def test_eviction_scans_only_when_the_running_size_overflows(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    store = _FakeStore({k: b"z" * 10 for k in "abcdef"})
+    cache = ArtifactCache(str(tmp_path / "cache"), max_bytes=45)
+    scans = []
+    real_evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda keep=None: scans.append(keep) or real_evict(keep=keep))
+    for k in "abcd":
+        cache.fetch(store, "bkt", k)  # type: ignore[arg-type]
+    assert len(scans) == 1  # the first miss establishes the size; 40 bytes stay under the cap
+    cache.fetch(store, "bkt", "e")  # type: ignore[arg-type]
+    assert len(scans) == 2 and cache.usage()[1] <= 45
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi.testclient import TestClient
+from minio.error import S3Error
+
+from apps.api.app.main import app
+from apps.api.app.routers import artifacts as artifacts_router
+from apps.api.app.storage.object_meta import get_object_meta_cache
+
+
+client = TestClient(app)
+
+_DATA = bytes(range(256)) * 4  # 1 KiB
+
+
+class _Resp:
+    def __init__(self, data: bytes, headers: Dict[str, str]) -> None:
+        self.data = data
+        self.headers = headers
+        self.released = False
+
+    def stream(self, chunk_size: int) -> Iterator[bytes]:
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i:i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        self.released = True
+
+
+class _FakeMinio:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.etag = "abc123"
+        self.gets: list[tuple[int, int]] = []
+        self.stats = 0
+
+    def stat_object(self, bucket: str, key: str) -> Any:
+        self.stats += 1
+        return SimpleNamespace(
+            size=len(self.data), etag=f'"{self.etag}"', content_type="application/json",
+            last_modified=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        )
+
+    def get_object(
+        self, bucket: str, key: str, offset: int = 0, length: int = 0, request_headers: Optional[Dict[str, str]] = None
+    ) -> _Resp:
+        if request_headers and request_headers.get("If-Match") != f'"{self.etag}"':
+            raise S3Error("PreconditionFailed", "etag changed", key, None, None, None)  # type: ignore[arg-type]
+        self.gets.append((offset, length))
+        body = self.data[offset:offset + length] if length else self.data[offset:]
+        headers = {"Content-Length": str(len(body))}
+        if length:
+            headers["Content-Range"] = f"bytes {offset}-{offset + len(body) - 1}/{len(self.data)}"
+        return _Resp(body, headers)
+
+
+def _patch(monkeypatch, data: bytes = _DATA) -> _FakeMinio:  # type: ignore[no-untyped-def]
+    fake = _FakeMinio(data)
+    get_object_meta_cache().clear()
+    art = SimpleNamespace(type="change_delta", uri="s3://roborouter-processed/change/delta.json")
+    monkeypatch.setattr(artifacts_router, "_s3_artifact", lambda artifact_id: (art, "roborouter-processed", "change/delta.json"))
+    monkeypatch.setattr(artifacts_router, "get_minio_client", lambda: fake)
+    return fake
+
+
+def test_content_streams_ranges_and_honours_etags(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    fake = _patch(monkeypatch)
+    url = f"/artifacts/{uuid.uuid4()}/content"
+
+    r = client.get(url)
+    assert r.status_code == 200 and r.content == _DATA
+    assert r.headers["etag"] == '"abc123"' and r.headers["accept-ranges"] == "bytes"
+    assert r.headers["last-modified"] == "Tue, 02 Jan 2024 03:04:05 GMT"
+
+    r = client.get(url, headers={"Range": "bytes=10-19"})
+    assert r.status_code == 206 and r.content == _DATA[10:20]
+    assert r.headers["content-range"] == "bytes 10-19/1024" and r.headers["content-length"] == "10"
+    assert fake.gets[-1] == (10, 10)
+
+    r = client.get(url, headers={"Range": "bytes=-4"})
+    assert r.status_code == 206 and r.content == _DATA[-4:]
+    r = client.get(url, headers={"Range": "bytes=1000-"})
+    assert r.status_code == 206 and r.content == _DATA[1000:]
+
+    r = client.get(url, headers={"Range": "bytes=5000-"})
+    assert r.status_code == 416 and r.headers["content-range"] == "bytes */1024"
+
+    calls = len(fake.gets)
+    r = client.get(url, headers={"If-None-Match": 'W/"other", "abc123"'})
+    assert r.status_code == 304 and len(fake.gets) == calls
+
+    # Stale If-Range: the whole object is sent
+    r = client.get(url, headers={"Range": "bytes=0-0", "If-Range": '"old"'})
+    assert r.status_code == 200 and len(r.content) == len(_DATA)
+
+
+def test_content_revalidates_when_the_object_was_overwritten(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    fake = _patch(monkeypatch)
+    url = f"/artifacts/{uuid.uuid4()}/content"
+    assert client.get(url).status_code == 200  # caches size 1024 / etag abc123
+
+    # Another worker rewrites the object under the same key
+    fake.data, fake.etag = b"x" * 100, "new"
+    r = client.get(url, headers={"If-None-Match": '"abc123"'})
+    assert r.status_code == 200 and r.content == b"x" * 100
+    assert r.headers["etag"] == '"new"' and r.headers["content-length"] == "100"
+
+    fake.data, fake.etag = b"y" * 50, "newer"
+    r = client.get(url, headers={"Range": "bytes=10-19"})
+    assert r.status_code == 206 and r.content == b"y" * 10
+    assert r.headers["content-range"] == "bytes 10-19/50" and r.headers["etag"] == '"newer"'
+
+
+def test_csv_reads_through_pooled_client(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    _patch(monkeypatch, b'{"added": 3, "removed": 1}')
+    r = client.get(f"/artifacts/{uuid.uuid4()}/csv")
+    assert r.status_code == 200
+    assert r.text == "type,count\nadded,3\nremoved,1\n"
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from apps.api.app.db import Base
+from apps.api.app.main import app
+from apps.api.app.models import Artifact, Scene
+from apps.api.app.routers import artifacts as artifacts_router
+from apps.api.app.storage import minio_client
+from apps.api.app.storage.object_meta import ObjectMetaCache
+from apps.api.app.storage.presign_cache import MemoryPresignCache
+
+
+client = TestClient(app)
+
+
+class _FakeMinio:
+    def __init__(self) -> None:
+        self.presigned = 0
+        self.stats: list[str] = []
+        self.allow_stat = False
+
+    def presigned_get_object(self, bucket: str, key: str, expires: Any = None, response_headers: Any = None) -> str:
+        self.presigned += 1
+        return f"http://minio/{bucket}/{key}?sig={self.presigned}"
+
+    def stat_object(self, bucket: str, key: str) -> Any:
+        if not self.allow_stat:
+            raise AssertionError("include_meta=false must not stat")
+        self.stats.append(key)
+        return SimpleNamespace(size=len(key), content_type="image/png", last_modified=None, etag=f'"{key}"')
+
+
+def _setup(monkeypatch, tmp_path: Path) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    now = datetime.utcnow()
+    with factory() as db:
+        scene = Scene(source_uri="s3://raw/x.laz", crs="EPSG:3857")
+        db.add(scene)
+        db.flush()
+        arts = [
+            Artifact(scene_id=scene.id, type="overlay", uri="s3://processed/a/old.png", created_at=now - timedelta(hours=1)),
+            Artifact(scene_id=scene.id, type="overlay", uri="s3://processed/a/new.png", created_at=now),
+            Artifact(scene_id=scene.id, type="residuals", uri="s3://processed/a/res.json", created_at=now),
+        ]
+        db.add_all(arts)
+        db.commit()
+        ids = {"scene": str(scene.id), "old": str(arts[0].id), "new": str(arts[1].id), "res": str(arts[2].id)}
+    fake = _FakeMinio()
+    monkeypatch.setattr(artifacts_router, "SessionLocal", factory)
+    monkeypatch.setattr(artifacts_router, "get_minio_client", lambda: fake)
+    presign_cache = MemoryPresignCache(100)
+    meta_cache = ObjectMetaCache(100, 60)
+    monkeypatch.setattr(artifacts_router, "get_presign_cache", lambda: presign_cache)
+    monkeypatch.setattr(minio_client, "get_object_meta_cache", lambda: meta_cache)
+    ids["fake"] = fake
+    return ids
+
+
+def test_resolve_by_ids_reports_missing_and_reuses_cached_urls(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    ids = _setup(monkeypatch, tmp_path)
+    unknown = str(uuid.uuid4())
+    body = {"artifact_ids": [ids["new"], ids["res"], unknown], "include_meta": False}
+    r = client.post("/artifacts/resolve", json=body)
+    assert r.status_code == 200
+    data = r.json()
+    assert set(data["artifacts"]) == {ids["new"], ids["res"]}
+    assert data["missing"] == [unknown]
+    assert data["artifacts"][ids["res"]]["type"] == "residuals"
+    assert data["artifacts"][ids["res"]]["url"].startswith("http://minio/processed/a/res.json")
+    again = client.post("/artifacts/resolve", json=body).json()
+    assert {k: v["url"] for k, v in again["artifacts"].items()} == {k: v["url"] for k, v in data["artifacts"].items()}
+    assert ids["fake"].presigned == 2  # second call served from the presign cache
+
+
+def test_resolve_by_scene_and_types(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    ids = _setup(monkeypatch, tmp_path)
+    r = client.post(
+        "/artifacts/resolve",
+        json={"scene_id": ids["scene"], "types": ["overlay", "export_potree"], "include_meta": False},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert set(data["artifacts"]) == {ids["old"], ids["new"]}
+    assert data["latest"] == {"overlay": ids["new"]}
+    assert data["missing_types"] == ["export_potree"] and data["truncated"] is False
+
+
+def test_resolve_requires_exactly_one_selector(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    ids = _setup(monkeypatch, tmp_path)
+    assert client.post("/artifacts/resolve", json={}).status_code == 400
+    both = {"artifact_ids": [ids["new"]], "scene_id": ids["scene"]}
+    assert client.post("/artifacts/resolve", json=both).status_code == 400
+
+
+def test_resolve_scene_latest_only_limit_and_metadata(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    ids = _setup(monkeypatch, tmp_path)
+    ids["fake"].allow_stat = True
+    r = client.post("/artifacts/resolve", json={"scene_id": ids["scene"], "latest_only": True})
+    assert r.status_code == 200
+    data = r.json()
+    assert set(data["artifacts"]) == {ids["new"], ids["res"]}
+    assert data["latest"] == {"overlay": ids["new"], "residuals": ids["res"]}
+    assert data["artifacts"][ids["new"]]["size_bytes"] == len("a/new.png")
+    assert data["artifacts"][ids["res"]]["etag"] == "a/res.json"
+    assert sorted(ids["fake"].stats) == ["a/new.png", "a/res.json"]
+    client.post("/artifacts/resolve", json={"scene_id": ids["scene"], "latest_only": True})
+    assert len(ids["fake"].stats) == 2  # served from the object metadata cache
+
+    page = client.post("/artifacts/resolve", json={"scene_id": ids["scene"], "limit": 2, "include_meta": False}).json()
+    assert len(page["artifacts"]) == 2 and page["truncated"] is True
+    assert ids["old"] not in page["artifacts"]  # newest first
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Iterable, List
+
+from minio.deleteobjects import DeleteError
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from apps.api.app.db import Base
+from apps.api.app.models import Artifact, Metric, Scene
+from apps.api.app.storage.cleanup import run_retention_cleanup
+
+
+class _FakeStore:
+    def __init__(self, refuse: Iterable[str] = ()) -> None:
+        self.refuse = set(refuse)
+        self.batches: List[List[str]] = []
+
+    def remove_objects(self, bucket: str, objects: Iterable[Any]) -> Iterable[DeleteError]:
+        names = [o._name for o in objects]
+        self.batches.append(names)
+        return iter([DeleteError("AccessDenied", "nope", n, None) for n in names if n in self.refuse])
+
+
+def _scene(db: Session, age_days: int, n_artifacts: int) -> uuid.UUID:
+    created = datetime.utcnow() - timedelta(days=age_days)
+    scene = Scene(source_uri="s3://raw/x.laz", crs="EPSG:3857", created_at=created)
+    db.add(scene)
+    db.flush()
+    for i in range(n_artifacts):
+        db.add(Artifact(scene_id=scene.id, type="t", uri=f"s3://processed/{scene.id}/{i}", created_at=created))
+    db.add(Metric(scene_id=scene.id, name="m", value=1.0, created_at=created))
+    db.commit()
+    return scene.id
+
+
+def test_retention_cleanup_batches_deletes_and_keeps_scenes_with_failures() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        old = [_scene(db, 40, 3) for _ in range(5)]
+        fresh = _scene(db, 1, 2)
+        stubborn = f"{old[2]}/1"
+        store = _FakeStore(refuse=[stubborn])
+        cutoff = datetime.utcnow() - timedelta(days=30)
+
+        res = run_retention_cleanup(db, store, cutoff, batch_scenes=2)  # type: ignore[arg-type]
+        assert res["deleted"]["scenes"] == 4 and res["kept_scenes"] == 1
+        assert res["objects"]["requested"] == 15 and res["objects"]["removed"] == 14
+        assert res["objects"]["failed"] == [{"uri": f"s3://processed/{stubborn}", "error": "AccessDenied: nope"}]
+        assert [len(b) for b in store.batches] == [6, 6, 3]  # one bulk request per scene batch
+        remaining = set(db.execute(select(Scene.id)).scalars().all())
+        assert remaining == {old[2], fresh}
+        assert db.execute(select(func.count(Artifact.id)).where(Artifact.scene_id == fresh)).scalar() == 2
+
+        # Re-running resumes: only the kept scene is retried
+        store.refuse.clear()
+        store.batches.clear()
+        res = run_retention_cleanup(db, store, cutoff, batch_scenes=2)  # type: ignore[arg-type]
+        assert res["deleted"]["scenes"] == 1 and store.batches == [[f"{old[2]}/{i}" for i in range(3)]]
+        assert set(db.execute(select(Scene.id)).scalars().all()) == {fresh}
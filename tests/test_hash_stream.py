@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from pathlib import Path
+
+from apps.api.app.utils.hash import HashingReader, StreamHasher, sha256_file
+
+
+def test_stream_hasher_matches_file_hash(tmp_path: Path) -> None:
+    data = b"point cloud bytes " * 1000
+    p = tmp_path / "in.laz"
+    p.write_bytes(data)
+    h = StreamHasher()
+    for i in range(0, len(data), 777):
+        h.update(data[i : i + 777])
+    assert h.size == len(data)
+    assert h.hexdigest() == sha256_file(str(p))
+
+
+def test_hashing_reader_hashes_what_is_read() -> None:
+    data = b"abc" * 5000
+    r = HashingReader(io.BytesIO(data))
+    while r.read(1024):
+        pass
+    assert r.hasher.size == len(data)
+    assert r.hasher.hexdigest() == hashlib.sha256(data).hexdigest()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from apps.api.app.db import Base
+from apps.api.app.main import app
+from apps.api.app.models import AuditLog, Metric, Scene
+from apps.api.app.routers import ingest as ingest_router
+from apps.api.app.schemas import IngestResponse
+
+
+client = TestClient(app)
+
+
+def test_ingest_batch_reports_invalid_items_individually() -> None:
+    items = [
+        {"source_uri": "/nonexistent/scan.laz", "crs": "EPSG:3857"},
+        {"source_uri": "/nonexistent/scan.laz", "crs": "NOT-A-CRS"},
+    ]
+    r = client.post("/ingest/batch", json={"items": items})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["total"] == 2 and body["succeeded"] == 0 and body["failed"] == 2
+    assert [i["status"] for i in body["items"]] == ["invalid", "invalid"]
+    assert body["items"][0]["error"] == "Source file not found"
+    assert body["items"][1]["error"] == "Invalid CRS"
+
+
+def test_ingest_batch_rejects_empty() -> None:
+    r = client.post("/ingest/batch", json={"items": []})
+    assert r.status_code == 400
+
+
+def _sqlite_batch(monkeypatch, tmp_path: Path, bad_source: Optional[str] = None):  # type: ignore[no-untyped-def]
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    def fake_ingest(scene_id: uuid.UUID, source: str, crs: str, *, client: Any = None, deferred: Any = None, **_: Any) -> IngestResponse:
+        deferred.append(AuditLog(scene_id=scene_id, action="ingest", details={"source_uri": source}))
+        # A NULL metric value violates NOT NULL and makes that item's rows unrecordable
+        value = None if source == bad_source else 1.5
+        deferred.append(Metric(scene_id=scene_id, name="point_count_out", value=value))
+        return IngestResponse(scene_id=scene_id, artifact_ids=[], metrics={"point_count_out": 1.5})
+
+    monkeypatch.setattr(ingest_router, "SessionLocal", factory)
+    monkeypatch.setattr(ingest_router, "_ingest_scene", fake_ingest)
+    monkeypatch.setattr(ingest_router, "get_minio_client", lambda: object())
+    monkeypatch.setattr(ingest_router, "validate_crs", lambda crs: True)
+    sources = []
+    for name in ("a.las", "b.las"):
+        (tmp_path / name).write_bytes(b"x")
+        sources.append(str(tmp_path / name))
+    return factory, sources
+
+
+def test_ingest_batch_records_audit_and_metrics_for_succeeded_items(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    factory, sources = _sqlite_batch(monkeypatch, tmp_path)
+    r = client.post("/ingest/batch", json={"items": [{"source_uri": s, "crs": "EPSG:3857"} for s in sources]})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["succeeded"] == 2 and body["failed"] == 0
+    with factory() as db:
+        assert db.execute(select(func.count(Scene.id))).scalar() == 2
+        assert db.execute(select(func.count(AuditLog.id))).scalar() == 2
+        assert db.execute(select(func.count(Metric.id))).scalar() == 2
+
+
+def test_ingest_batch_marks_only_items_whose_rows_fail_to_commit(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    factory, sources = _sqlite_batch(monkeypatch, tmp_path, bad_source=str(tmp_path / "b.las"))
+    r = client.post("/ingest/batch", json={"items": [{"source_uri": s, "crs": "EPSG:3857"} for s in sources]})
+    assert r.status_code == 200
+    body = r.json()
+    by_source = {i["source_uri"]: i for i in body["items"]}
+    assert by_source[sources[0]]["status"] == "succeeded"
+    assert by_source[sources[1]]["status"] == "failed" and "recording audit/metrics" in by_source[sources[1]]["error"]
+    assert body["succeeded"] == 1 and body["failed"] == 1
+    with factory() as db:
+        assert db.execute(select(func.count(Metric.id))).scalar() == 1
+        assert db.execute(select(func.count(AuditLog.id))).scalar() == 1
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from apps.api.app.db import Base
+from apps.api.app.jobs import QueueFullError
+from apps.api.app.main import app
+from apps.api.app.models import Scene
+from apps.api.app.routers import ingest as ingest_router
+
+
+client = TestClient(app)
+
+
+class _FullManager:
+    def submit(self, *args: Any, **kwargs: Any) -> Any:
+        raise QueueFullError("ingest queue is full")
+
+
+def test_queue_full_removes_the_unqueued_scene(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(ingest_router, "SessionLocal", factory)
+    monkeypatch.setattr(ingest_router, "get_job_manager", lambda name: _FullManager())
+    (tmp_path / "scan.las").write_bytes(b"x")
+
+    for _ in range(2):  # a client retrying on Retry-After
+        r = client.post("/ingest", params={"background": "true"}, json={"source_uri": str(tmp_path / "scan.las"), "crs": "EPSG:3857"})
+        assert r.status_code == 503 and r.headers["Retry-After"] == "30"
+        assert r.json()["detail"] == {"message": "ingest queue is full"}
+
+    r = client.post("/ingest/stream", params={"background": "true"}, files={"file": ("s.las", b"abc", "application/octet-stream")})
+    assert r.status_code == 503 and r.json()["detail"] == {"message": "ingest queue is full"}
+    with factory() as db:
+        assert db.execute(select(func.count(Scene.id))).scalar() == 0
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from apps.api.app.config import settings
+from apps.api.app.db import Base
+from apps.api.app.models import Artifact, IngestHash, Metric
+from apps.api.app.routers import ingest as ingest_router
+
+
+def _setup(monkeypatch, tmp_path: Path, engine_name: str = "pdal") -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    state: Dict[str, Any] = {"factory": factory, "runs": 0, "copies": [], "uploads": [], "during_run": None}
+
+    def fake_stages(input_path: str, output_path: str, crs: str, work_dir: str):  # type: ignore[no-untyped-def]
+        state["runs"] += 1
+        if state["during_run"]:
+            state["during_run"]()
+        Path(output_path).write_bytes(b"processed:" + Path(input_path).read_bytes())
+        return engine_name, None
+
+    def fake_upload(client: Any, bucket: str, object_name: str, path: str) -> str:
+        state["uploads"].append(object_name)
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+    monkeypatch.setattr(ingest_router, "SessionLocal", factory)
+    monkeypatch.setattr(ingest_router, "_ingest_engine", lambda: engine_name)
+    monkeypatch.setattr(ingest_router, "_run_ingest_stages", fake_stages)
+    monkeypatch.setattr(ingest_router, "upload_file_stream", fake_upload)
+    monkeypatch.setattr(ingest_router, "copy_object", lambda client, *args: state["copies"].append(args))
+    monkeypatch.setattr(settings, "ingest_tile_index_enabled", False)
+    monkeypatch.setattr(settings, "ingest_columnar_enabled", False)
+    (tmp_path / "scan.las").write_bytes(b"raw points")
+    state["source"] = str(tmp_path / "scan.las")
+    return state
+
+
+def _ingest(state: Dict[str, Any]) -> Any:
+    scene_id = ingest_router.create_scene(state["source"], "EPSG:3857", None)
+    return ingest_router._ingest_scene(scene_id, state["source"], "EPSG:3857", client=object())
+
+
+def _metrics(state: Dict[str, Any], scene_id: Any) -> Dict[str, float]:
+    with state["factory"]() as db:
+        rows: List[Metric] = list(db.execute(select(Metric).where(Metric.scene_id == scene_id)).scalars())
+        return {m.name: float(m.value) for m in rows}
+
+
+def test_digest_hit_copies_the_object_and_metrics_without_reprocessing(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    state = _setup(monkeypatch, tmp_path)
+    first = _ingest(state)
+    assert state["runs"] == 1 and first.metrics["dedupe_hit"] == 0.0
+
+    second = _ingest(state)
+    assert state["runs"] == 1 and state["uploads"] == [f"ingest/{first.scene_id}.laz"]  # no second processing run
+    bucket = settings.minio_bucket_processed
+    assert state["copies"] == [(bucket, f"ingest/{first.scene_id}.laz", bucket, f"ingest/{second.scene_id}.laz")]
+    assert second.metrics["dedupe_hit"] == 1.0
+    copied = _metrics(state, second.scene_id)
+    original = _metrics(state, first.scene_id)
+    assert {k: v for k, v in copied.items() if k != "dedupe_hit"} == {k: v for k, v in original.items() if k != "dedupe_hit"}
+    with state["factory"]() as db:
+        art = db.get(Artifact, second.artifact_ids[0])
+        assert art is not None and art.uri == f"s3://{bucket}/ingest/{second.scene_id}.laz"
+
+
+def test_placeholder_outputs_are_not_indexed_for_reuse(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    state = _setup(monkeypatch, tmp_path, engine_name="none")
+    _ingest(state)
+    _ingest(state)
+    assert state["runs"] == 2 and state["copies"] == []
+    with state["factory"]() as db:
+        assert db.execute(select(func.count(IngestHash.id))).scalar() == 0
+
+
+def test_concurrent_identical_ingest_falls_back_cleanly(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    state = _setup(monkeypatch, tmp_path)
+
+    def twin_finishes_first() -> None:
+        # Another worker ingests the same input while this one is processing, and indexes it first
+        state["during_run"] = None
+        state["twin"] = _ingest(state).scene_id
+
+    state["during_run"] = twin_finishes_first
+    res = _ingest(state)
+    assert state["runs"] == 2  # both missed the lookup
+    assert res.metrics["dedupe_hit"] == 1.0  # identical output already indexed for the twin
+    with state["factory"]() as db:
+        hashes = db.execute(select(IngestHash)).scalars().all()
+        assert [h.scene_id for h in hashes] == [state["twin"]]  # the losing insert was rolled back
+        assert db.get(Artifact, res.artifact_ids[0]) is not None
+    assert _metrics(state, res.scene_id)["dedupe_hit"] == 1.0
+
+
+def test_tile_settings_are_part_of_the_reuse_key(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(settings, "ingest_tile_index_enabled", False)
+    off = ingest_router._ingest_settings_key("EPSG:3857", "pdal")
+    monkeypatch.setattr(settings, "ingest_tile_index_enabled", True)
+    monkeypatch.setattr(settings, "ingest_tile_index_size_m", 50.0)
+    fifty = ingest_router._ingest_settings_key("EPSG:3857", "pdal")
+    monkeypatch.setattr(settings, "ingest_tile_index_size_m", 25.0)
+    assert len({off, fifty, ingest_router._ingest_settings_key("EPSG:3857", "pdal")}) == 3
+
+
+def test_columnar_settings_are_part_of_the_reuse_key(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(settings, "ingest_columnar_enabled", False)
+    off = ingest_router._ingest_settings_key("EPSG:3857", "pdal")
+    monkeypatch.setattr(settings, "ingest_columnar_enabled", True)
+    monkeypatch.setattr(settings, "ingest_columnar_columns", "x,y,z")
+    xyz = ingest_router._ingest_settings_key("EPSG:3857", "pdal")
+    monkeypatch.setattr(settings, "ingest_columnar_columns", "x,y,z,intensity")
+    assert len({off, xyz, ingest_router._ingest_settings_key("EPSG:3857", "pdal")}) == 3
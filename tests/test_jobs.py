@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from apps.api.app.jobs import JobManager, QueueFullError
+
+
+def _wait(mgr: JobManager, job_id: str, timeout: float = 5.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = mgr.get(job_id)
+        if job is not None and job.done:
+            return
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_reports_progress_and_result() -> None:
+    mgr = JobManager(max_workers=1, max_pending=4)
+
+    def work(job):  # type: ignore[no-untyped-def]
+        job.update("processing", 0.5)
+        return {"ok": True}
+
+    job = mgr.submit("ingest", work, meta={"scene_id": "s1"})
+    _wait(mgr, job.id)
+    body = mgr.get(job.id).to_dict()  # type: ignore[union-attr]
+    assert body["status"] == "succeeded" and body["stage"] == "done"
+    assert body["progress"] == 1.0 and body["result"] == {"ok": True}
+
+
+def test_job_failure_and_cleanup() -> None:
+    mgr = JobManager(max_workers=1, max_pending=4)
+    cleaned: list[bool] = []
+
+    def work(job):  # type: ignore[no-untyped-def]
+        raise ValueError("boom")
+
+    job = mgr.submit("ingest", work, on_finish=lambda: cleaned.append(True))
+    _wait(mgr, job.id)
+    assert job.status == "failed" and job.error == "boom"
+    assert cleaned == [True]
+
+
+def test_queue_is_bounded() -> None:
+    mgr = JobManager(max_workers=1, max_pending=1)
+    gate = threading.Event()
+    job = mgr.submit("ingest", lambda j: gate.wait(5) and {})
+    with pytest.raises(QueueFullError):
+        mgr.submit("ingest", lambda j: {})
+    gate.set()
+    _wait(mgr, job.id)
+    assert mgr.active_count() == 0
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from apps.api.app.pipeline.pdal import get_bounds_and_srs, get_point_count, read_las_header
+from conftest import write_las
+
+
+def test_read_las_header_fields(tmp_path: Path) -> None:
+    src = tmp_path / "scan.laz"
+    write_las(
+        src,
+        count=1234,
+        scale=0.01,
+        offset=(100.0, 200.0, 0.0),
+        bounds={"minx": 100.0, "maxx": 110.0, "miny": 200.0, "maxy": 220.0, "minz": -1.0, "maxz": 5.0},
+        epsg=3857,
+        point_format=0x80 | 3,
+    )
+    hdr = read_las_header(str(src))
+    assert hdr is not None
+    assert hdr.version == "1.2"
+    assert hdr.point_format == 3 and hdr.compressed
+    assert hdr.point_count == 1234
+    assert hdr.scale == (0.01, 0.01, 0.01)
+    assert hdr.offset == (100.0, 200.0, 0.0)
+    assert hdr.bounds["minx"] == 100.0 and hdr.bounds["maxy"] == 220.0 and hdr.bounds["minz"] == -1.0
+    assert hdr.srs == "EPSG:3857"
+    assert get_point_count(str(src)) == 1234
+    bounds, srs = get_bounds_and_srs(str(src))
+    assert bounds is not None and bounds["maxx"] == 110.0
+    assert srs == "EPSG:3857"
+
+
+def test_read_las_header_cache_tracks_mtime(tmp_path: Path) -> None:
+    src = tmp_path / "scan.las"
+    write_las(src, count=10)
+    assert read_las_header(str(src)).point_count == 10  # type: ignore[union-attr]
+    write_las(src, count=20)
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert read_las_header(str(src)).point_count == 20  # type: ignore[union-attr]
+
+
+def test_read_las_header_rejects_non_las(tmp_path: Path) -> None:
+    src = tmp_path / "empty.laz"
+    src.touch()
+    assert read_las_header(str(src)) is None
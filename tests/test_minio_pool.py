@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from minio.error import S3Error
+
+from apps.api.app.config import settings
+from apps.api.app.storage import minio_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self) -> None:  # bucket_exists
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:  # bucket location lookup, done once per client
+        body = b'<LocationConstraint xmlns="http://s3.amazonaws.com/doc/2006-03-01/">us-east-1</LocationConstraint>'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:  # type: ignore[no-untyped-def]
+        pass
+
+
+def test_shared_client_reuses_connections(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(settings, "minio_endpoint", f"127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(settings, "minio_secure", False)
+    monkeypatch.setattr(settings, "minio_pool_maxsize", 2)
+    minio_client.reset_minio_client()
+    try:
+        client = minio_client.get_minio_client()
+        assert minio_client.get_minio_client() is client
+        for _ in range(5):
+            assert client.bucket_exists("roborouter-raw")
+        stats = minio_client.pool_stats()
+        assert stats["requests"] == 6  # location lookup + 5 HEADs
+        assert stats["opened"] == 1  # keep-alive: one connection served every call
+        assert stats["in_use"] == 0 and stats["idle"] == 1 and stats["maxsize"] == 2
+    finally:
+        minio_client.reset_minio_client()
+        server.shutdown()
+    assert minio_client.pool_stats()["pools"] == 0
+
+
+class _FakeStore:
+    def __init__(self) -> None:
+        self.buckets: set[str] = set()
+        self.calls: list[str] = []
+
+    def bucket_exists(self, bucket: str) -> bool:
+        self.calls.append("exists")
+        return bucket in self.buckets
+
+    def make_bucket(self, bucket: str) -> None:
+        self.calls.append("make")
+        self.buckets.add(bucket)
+
+    def fput_object(self, bucket: str, object_name: str, file_path: str, content_type: str) -> None:
+        self.calls.append("put")
+        if bucket not in self.buckets:
+            raise S3Error("NoSuchBucket", "gone", bucket, "r", "h", None, bucket_name=bucket)  # type: ignore[arg-type]
+
+
+def test_bucket_cache_skips_checks_and_recovers_from_deleted_bucket(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(minio_client.time, "sleep", lambda s: None)
+    minio_client.reset_minio_client()
+    store = _FakeStore()
+    src = tmp_path / "a.json"
+    src.write_text("{}")
+
+    assert minio_client.provision_buckets(store) == [settings.minio_bucket_raw, settings.minio_bucket_processed]  # type: ignore[arg-type]
+    store.calls.clear()
+    for _ in range(3):
+        minio_client.upload_file(store, settings.minio_bucket_processed, "k.json", str(src))  # type: ignore[arg-type]
+    assert store.calls == ["put", "put", "put"]
+
+    store.buckets.discard(settings.minio_bucket_processed)
+    store.calls.clear()
+    minio_client.upload_file(store, settings.minio_bucket_processed, "k.json", str(src))  # type: ignore[arg-type]
+    assert store.calls == ["put", "exists", "make", "put"]
+    minio_client.reset_minio_client()
+
+
+def test_upload_many_runs_concurrently_and_reports_per_object(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(minio_client.time, "sleep", lambda s: None)
+    store = _FakeStore()
+    store.buckets.add("roborouter-processed")
+    # Every object's first attempt waits for the other two, so a serial loop would time out
+    barrier = threading.Barrier(3, timeout=5)
+    seen: set[str] = set()
+
+    def _put(bucket: str, object_name: str, file_path: str, content_type: str) -> None:
+        if object_name not in seen:
+            seen.add(object_name)
+            barrier.wait()
+        if object_name == "bad.json":
+            raise OSError("disk on fire")
+        store.buckets.add(f"{object_name}:{content_type}")
+
+    monkeypatch.setattr(store, "fput_object", _put)
+    src = tmp_path / "a.json"
+    src.write_text("{}")
+    items = [("a.json", str(src)), ("bad.json", str(src)), ("c.html", str(src), "text/html")]
+    results = minio_client.upload_many(store, "roborouter-processed", items, max_workers=4, max_retries=1)  # type: ignore[arg-type]
+    assert [r.object_name for r in results] == ["a.json", "bad.json", "c.html"]
+    assert [r.ok for r in results] == [True, False, True]
+    assert "disk on fire" in (results[1].error or "")
+    assert {"a.json:application/json", "c.html:text/html"} <= store.buckets
+    with pytest.raises(minio_client.TransferError) as err:
+        minio_client.raise_for_failures(results)
+    assert [f.object_name for f in err.value.failures] == ["bad.json"]
+
+
+def test_uploads_fill_object_meta_cache_and_deletes_drop_it(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    from apps.api.app.storage.object_meta import get_object_meta_cache, object_meta
+
+    store = _FakeStore()
+    store.buckets.add("roborouter-processed")
+    stats: list[str] = []
+    store.stat_object = lambda b, k: stats.append(k) or SimpleNamespace(  # type: ignore[attr-defined]
+        size=1, content_type="x/y", last_modified=None, etag='"e"'
+    )
+    store.remove_objects = lambda b, objs: iter([])  # type: ignore[attr-defined]
+    src = tmp_path / "delta.json"
+    src.write_text('{"a": 1}')
+    get_object_meta_cache().clear()
+
+    minio_client.upload_file(store, "roborouter-processed", "change/delta.json", str(src))  # type: ignore[arg-type]
+    meta = object_meta(store, "roborouter-processed", "change/delta.json")
+    assert (meta.size, meta.content_type) == (8, "application/json") and meta.last_modified
+    assert stats == []
+
+    minio_client.remove_many(store, [("roborouter-processed", "change/delta.json")])  # type: ignore[arg-type]
+    assert object_meta(store, "roborouter-processed", "change/delta.json").etag == "e"
+    assert stats == ["change/delta.json"]
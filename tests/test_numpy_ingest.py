@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from apps.api.app.pipeline.columnar import load_columns, write_columns, xyz_from_columns
+from apps.api.app.pipeline.numpy_ingest import las_xyz, run_numpy_ingest, voxel_first_indices
+from apps.api.app.pipeline.pdal import read_las_header
+from apps.api.app.pipeline.tile_index import build_tile_index
+from apps.api.app.storage.tiles import parse_bbox
+from conftest import write_las
+
+
+def test_voxel_first_indices_keeps_one_per_voxel() -> None:
+    pts = np.array([[0.0, 0.0, 0.0], [0.05, 0.05, 0.0], [1.0, 0.0, 0.0], [1.02, 0.0, 0.0]])
+    assert voxel_first_indices(pts, 0.1).tolist() == [0, 2]
+    assert voxel_first_indices(pts, 0.0).tolist() == [0, 1, 2, 3]
+
+
+def test_run_numpy_ingest_filters_and_writes_las(tmp_path: Path) -> None:
+    # 10x10x10 lattice at 0.1 m spacing plus one far outlier; one lattice point fails the intensity range
+    g = np.arange(10) * 0.1
+    xyz = np.stack(np.meshgrid(g, g, g, indexing="ij"), axis=-1).reshape(-1, 3)
+    xyz = np.vstack([xyz, [[50.0, 50.0, 50.0]]])
+    intensity = np.full(len(xyz), 100, dtype=np.uint16)
+    intensity[0] = 5000
+    src = tmp_path / "in.las"
+    write_las(src, xyz, intensity=intensity)
+
+    out = tmp_path / "out.las"
+    res = run_numpy_ingest(
+        str(src), str(out), voxel_size=0.2, stddev_mult=2.0, mean_k=8,
+        intensity_min=0.0, intensity_max=1000.0, chunk_points=300,
+    )
+    assert res.input is not None and res.input.count == 1001
+    assert res.stages["filters.statisticaloutlier"].count == 1000
+    assert res.stages["filters.voxelgrid"].count == 125
+    assert res.output is not None and res.output.count == 124
+
+    hdr = read_las_header(str(out))
+    assert hdr is not None and not hdr.compressed
+    assert hdr.point_count == 124
+    assert hdr.bounds["maxx"] <= 0.9 + 1e-9
+    assert out.stat().st_size == hdr.point_data_offset + 124 * hdr.record_length
+
+
+def test_run_numpy_ingest_tiles_match_single_pass(tmp_path: Path) -> None:
+    # Same cloud processed as one tile and as 0.4 m tiles with a 0.3 m k-NN margin
+    g = np.arange(10) * 0.1
+    xyz = np.stack(np.meshgrid(g, g, g, indexing="ij"), axis=-1).reshape(-1, 3)
+    xyz = np.vstack([xyz, [[0.45, 0.45, 5.0]]])
+    src = tmp_path / "in.las"
+    write_las(src, xyz, intensity=np.full(len(xyz), 100, dtype=np.uint16))
+    kwargs = dict(voxel_size=0.2, stddev_mult=2.0, mean_k=8, intensity_min=0.0, intensity_max=1000.0, chunk_points=300)
+
+    whole = run_numpy_ingest(str(src), str(tmp_path / "whole.las"), tile_size=100.0, **kwargs)  # type: ignore[arg-type]
+    tiled = run_numpy_ingest(str(src), str(tmp_path / "tiled.las"), tile_size=0.4, buffer=0.3, **kwargs)  # type: ignore[arg-type]
+    for stage in ("filters.statisticaloutlier", "filters.voxelgrid", "filters.range", "filters.info"):
+        assert tiled.stages[stage].count == whole.stages[stage].count, stage
+    assert tiled.stages["filters.statisticaloutlier"].count == 1000
+    a, b = read_las_header(str(tmp_path / "whole.las")), read_las_header(str(tmp_path / "tiled.las"))
+    assert a is not None and b is not None and a.bounds == b.bounds
+    whole_pts = sorted(map(tuple, np.round(las_xyz(str(tmp_path / "whole.las"), a), 6)))
+    tiled_pts = sorted(map(tuple, np.round(las_xyz(str(tmp_path / "tiled.las"), b), 6)))
+    assert whole_pts == tiled_pts
+
+
+def test_build_tile_index_splits_by_cell(tmp_path: Path) -> None:
+    xs, ys = np.meshgrid(np.arange(0.0, 20.0, 0.5), np.arange(0.0, 10.0, 0.5), indexing="ij")
+    xyz = np.stack([xs.ravel(), ys.ravel(), np.zeros(xs.size)], axis=-1)
+    src = tmp_path / "scene.las"
+    write_las(src, xyz, intensity=np.full(len(xyz), 10, dtype=np.uint16))
+
+    entries = build_tile_index(str(src), str(tmp_path / "tiles"), 5.0, chunk_points=100)
+    assert sorted((e.ix, e.iy) for e in entries) == [(i, j) for i in range(4) for j in range(2)]
+    assert sum(e.point_count for e in entries) == len(xyz)
+    tile = next(e for e in entries if (e.ix, e.iy) == (1, 0))
+    assert tile.bounds["minx"] >= 5.0 and tile.bounds["maxx"] < 10.0
+    hdr = read_las_header(tile.path)
+    assert hdr is not None and hdr.point_count == tile.point_count == 100
+    # Streamed in 100-point chunks: records keep input order and the scratch buckets are gone
+    pts = las_xyz(tile.path, hdr)
+    assert np.array_equal(pts, xyz[(xyz[:, 0] >= 5.0) & (xyz[:, 0] < 10.0) & (xyz[:, 1] < 5.0)])
+    assert not list((tmp_path / "tiles").glob(".split_*"))
+    assert parse_bbox("0,0,5,5") == (0.0, 0.0, 5.0, 5.0)
+
+
+def test_write_columns_roundtrip_memmap(tmp_path: Path) -> None:
+    xyz = np.array([[1.0, 2.0, 3.0], [4.5, 5.5, 6.5], [-1.25, 0.0, 7.0]])
+    src = tmp_path / "scene.las"
+    write_las(src, xyz, intensity=np.array([7, 8, 9], dtype=np.uint16))
+
+    paths = write_columns(str(src), str(tmp_path / "cols"), columns=("x", "y", "z", "intensity"), chunk_points=2)
+    assert set(paths) == {"x", "y", "z", "intensity"}
+    cols = load_columns(str(tmp_path / "cols"), ["x", "y", "z"])
+    assert isinstance(cols["x"], np.memmap)
+    assert np.allclose(xyz_from_columns(cols), xyz)
+    assert load_columns(str(tmp_path / "cols"))["intensity"].tolist() == [7, 8, 9]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from apps.api.app.pipeline import pdal as pdal_mod
+from apps.api.app.pipeline.pdal import (
+    PipelineResult,
+    StageMetadata,
+    build_ingest_pipeline,
+    parse_pipeline_metadata,
+    plan_tiles,
+    run_tiled_ingest,
+)
+from conftest import write_las
+
+
+def test_build_ingest_pipeline_with_info_stage() -> None:
+    p = build_ingest_pipeline(
+        "in.laz",
+        "out.laz",
+        voxel_size=0.05,
+        stddev_mult=1.0,
+        mean_k=8,
+        intensity_min=0.0,
+        intensity_max=1.0,
+        out_srs="EPSG:3857",
+        with_info=True,
+    )
+    types = [s["type"] for s in p["pipeline"] if isinstance(s, dict)]
+    assert types[-2:] == ["filters.info", "writers.las"]
+
+
+def test_parse_pipeline_metadata_reader_and_info() -> None:
+    meta = {
+        "stages": {
+            "readers.las": {
+                "count": 1000,
+                "minx": 1.0, "miny": 2.0, "minz": 3.0, "maxx": 4.0, "maxy": 5.0, "maxz": 6.0,
+                "comp_spatialreference": "PROJCS[\"WGS 84 / UTM zone 15N\"]",
+            },
+            "filters.voxelgrid": {},
+            "filters.info": {
+                "num_points": 250,
+                "bbox": {"minx": 1.0, "miny": 2.0, "minz": 3.0, "maxx": 4.0, "maxy": 5.0, "maxz": 6.0},
+                "srs": {"horizontal": "PROJCS[\"WGS 84 / Pseudo-Mercator\",AUTHORITY[\"EPSG\",\"3857\"]]"},
+            },
+        }
+    }
+    res = parse_pipeline_metadata(meta)
+    assert res.input is not None and res.input.count == 1000
+    assert res.input.bounds is not None and res.input.bounds["maxz"] == 6.0
+    assert res.input.srs is not None and "UTM" in res.input.srs
+    assert res.output is not None and res.output.count == 250
+    assert res.output.srs is not None and "3857" in res.output.srs
+    assert res.stages["filters.voxelgrid"].count is None
+
+
+def test_plan_tiles_covers_bounds_with_buffer() -> None:
+    bounds = {"minx": 0.0, "miny": 0.0, "minz": 0.0, "maxx": 250.0, "maxy": 90.0, "maxz": 1.0}
+    tiles = plan_tiles(bounds, 100.0, 2.0)
+    assert len(tiles) == 3  # 3 columns x 1 row
+    last = max(tiles, key=lambda t: t.ix)
+    assert last.core["maxx"] == 250.0 and last.last_x and last.last_y
+    assert last.buffered["minx"] == last.core["minx"] - 2.0
+    first = min(tiles, key=lambda t: t.ix)
+    assert "X < 100.0" in first.core_expression()
+    assert "X <= 250.0" in last.core_expression()
+
+
+def test_run_tiled_ingest_reports_source_as_input(tmp_path: Path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    xs = np.linspace(0.0, 250.0, 1000)
+    src = tmp_path / "in.las"
+    write_las(src, np.stack([xs, xs * 0.2, np.ones_like(xs)], axis=1))
+
+    def fake_run(pipeline: dict, *, metadata: bool = False) -> Optional[PipelineResult]:
+        stages = pipeline["pipeline"]
+        writer = stages[-1]
+        if isinstance(stages[0], dict) and stages[0].get("tag") == "src":
+            # Split pass: every buffered tile gets 100 points
+            for st in stages:
+                if st.get("type") == "writers.las":
+                    write_las(Path(st["filename"]), np.ones((100, 3)))
+            return None
+        if not metadata:
+            write_las(Path(writer["filename"]), np.ones((40, 3)))  # tile ingest drops points
+            return None
+        return PipelineResult(stages={
+            "readers.las": StageMetadata(name="readers.las", count=40, srs="EPSG:3857"),
+            "filters.info": StageMetadata(name="filters.info", count=120),
+        })
+
+    monkeypatch.setattr(pdal_mod, "run_pipeline", fake_run)
+    res = run_tiled_ingest(
+        str(src), str(tmp_path / "out.las"), str(tmp_path / "work"), tile_size=100.0, buffer=2.0,
+        voxel_size=0.05, stddev_mult=1.0, mean_k=8, intensity_min=0.0, intensity_max=1.0,
+    )
+    assert res.input is not None and res.output is not None
+    assert res.input.count == 1000 and res.output.count == 120
+    assert res.input.count != res.output.count
+    assert res.input.bounds is not None and res.input.bounds["maxx"] == 250.0
+    assert res.stages["tiles"].count == 3
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from apps.api.app.storage.presign_cache import MemoryPresignCache, SqlitePresignCache, presign_key
+
+
+def test_memory_cache_is_lru_and_keyed_by_disposition() -> None:
+    cache = MemoryPresignCache(max_entries=2)
+    inline = presign_key("a", "inline", "x.las")
+    attach = presign_key("a", "attachment", "x.las")
+    later = time.time() + 60
+    cache.put(inline, "u-inline", later)
+    cache.put(attach, "u-attach", later)
+    assert cache.get(inline) == ("u-inline", later)  # inline is now most recently used
+    cache.put(presign_key("b", None, None), "u-b", later)
+    assert cache.get(attach) is None
+    assert cache.get(inline) is not None
+    assert cache.size() == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_memory_cache_expiry_and_invalidate() -> None:
+    cache = MemoryPresignCache(max_entries=10)
+    cache.put(presign_key("a", None, None), "old", time.time() - 1)
+    assert cache.get(presign_key("a", None, None)) is None
+    cache.put(presign_key("a", "inline", "f"), "u1", time.time() + 60)
+    cache.put(presign_key("a", "attachment", "f"), "u2", time.time() + 60)
+    cache.put(presign_key("b", None, None), "u3", time.time() + 60)
+    cache.invalidate("a")
+    assert cache.size() == 1
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "presign.sqlite")
+    one = SqlitePresignCache(path, max_entries=2)
+    two = SqlitePresignCache(path, max_entries=2)
+    later = time.time() + 60
+    one.put(presign_key("a", None, None), "u-a", later)
+    assert two.get(presign_key("a", None, None)) == ("u-a", later)
+    two.put(presign_key("b", None, None), "u-b", later)
+    time.sleep(0.01)
+    assert one.get(presign_key("a", None, None)) is not None  # refresh a's recency
+    one.put(presign_key("c", None, None), "u-c", later)
+    assert two.get(presign_key("b", None, None)) is None
+    assert two.size() == 2
+    one.invalidate("a")
+    assert two.get(presign_key("a", None, None)) is None
+    one.put(presign_key("d", None, None), "gone", time.time() - 1)
+    assert two.get(presign_key("d", None, None)) is None
+
+
+def test_presign_cache_base_is_abstract() -> None:
+    import pytest
+
+    from apps.api.app.storage.presign_cache import PresignCache
+
+    with pytest.raises(TypeError):
+        PresignCache(10)  # type: ignore[abstract]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from apps.api.app.pipeline.icp import icp_point_to_plane, voxel_downsample
+from apps.api.app.pipeline.numpy_ingest import las_field_view, las_xyz
+from apps.api.app.pipeline.pdal import read_las_header
+from apps.api.app.pipeline.registration import (
+    _write_aligned,
+    nearest_distances,
+    register_clouds,
+    residual_stats,
+    sample_indices,
+    select_engine,
+)
+from conftest import write_las
+
+
+def test_nearest_distances_and_residual_stats() -> None:
+    g = np.arange(0.0, 20.0, 0.5)
+    target = np.stack(np.meshgrid(g, g, g[:13]), axis=-1).reshape(-1, 3)[:20_000]  # 0.5 m grid
+    source = target + np.array([0.0, 0.0, 0.01])
+    source[:100, :2] += 0.25  # midway between grid points: gross outliers
+    d = nearest_distances(source, target)
+    assert d.shape == (20_000,)
+    assert np.allclose(d[100:], 0.01, atol=1e-9)
+
+    stats = residual_stats(d, inlier_threshold=0.035, bins=10)
+    assert abs(stats["rmse"] - 0.01) < 1e-9
+    assert stats["rmse_all"] > stats["rmse"]
+    assert stats["inlier_ratio"] == (20_000 - 100) / 20_000
+    hist = stats["histogram"]
+    assert len(hist["edges"]) == 11 and sum(hist["counts"]) + hist["overflow"] == 20_000
+    assert hist["overflow"] == 100
+    assert len(stats["residuals_sample"]) == 1000
+
+
+def test_sample_indices_and_empty_residuals() -> None:
+    idx = sample_indices(1000, 100)
+    assert len(idx) == 100 and np.all(np.diff(idx) > 0)
+    assert np.array_equal(idx, sample_indices(1000, 100))
+    assert len(sample_indices(50, 100)) == 50 and len(sample_indices(50, 0)) == 50
+    assert residual_stats(np.zeros(0), 0.1)["inlier_ratio"] == 1.0
+
+
+def _surface(n: int = 120) -> np.ndarray:
+    x, y = np.meshgrid(np.linspace(0, 12, n), np.linspace(0, 12, n))
+    z = np.sin(x / 2.0) + 0.5 * np.cos(y / 3.0)
+    wall = np.stack([np.full(n * 20, 4.0), np.linspace(0, 12, n * 20), np.tile(np.linspace(0, 2, 20), n)], axis=1)
+    return np.vstack([np.stack([x.ravel(), y.ravel(), z.ravel()], axis=1), wall])
+
+
+def _moved(xyz: np.ndarray) -> np.ndarray:
+    a = np.deg2rad(1.0)
+    rot = np.array([[np.cos(a), -np.sin(a), 0.0], [np.sin(a), np.cos(a), 0.0], [0.0, 0.0, 1.0]])
+    return (xyz - 6.0) @ rot.T + 6.0 + np.array([0.03, -0.02, 0.02])
+
+
+def test_icp_point_to_plane_recovers_small_rigid_motion() -> None:
+    target = _surface()
+    source = _moved(target)
+    res = icp_point_to_plane(
+        voxel_downsample(source, 0.05), voxel_downsample(target, 0.05), max_correspondence=0.2, max_iter=50
+    )
+    assert res.converged and res.fitness > 0.99
+    aligned = source @ res.transformation[:3, :3].T + res.transformation[:3, 3]
+    assert np.abs(aligned - target).max() < 1e-3
+
+
+def test_icp_converges_on_an_exact_fit() -> None:
+    target = voxel_downsample(_surface(), 0.05)
+    res = icp_point_to_plane(target + np.array([1e-3, -2e-3, 1e-3]), target, max_correspondence=0.2, max_iter=50)
+    # RMSE drops to rounding noise, where a relative-only criterion never fires
+    assert res.converged and res.iterations < 10 and res.inlier_rmse < 1e-9
+
+
+def test_write_aligned_rederives_the_offset_outside_int32(tmp_path: Path) -> None:
+    xyz = _surface(20)
+    write_las(tmp_path / "src.las", xyz)
+    src = str(tmp_path / "src.las")
+    header = read_las_header(src)
+    assert header is not None
+    far = xyz + np.array([3.0e6, -2.5e6, 0.0])  # beyond +-2147 km at 1 mm scale with offset 0
+    out = _write_aligned(src, (src, header), far, str(tmp_path / "far.las"), str(tmp_path))
+    moved = read_las_header(out)
+    assert moved is not None and moved.offset[0] != 0.0 and moved.offset[2] == 0.0
+    assert np.abs(las_xyz(out, moved) - far).max() < 1e-3
+
+    with pytest.raises(ValueError):
+        huge = xyz.copy()
+        huge[0, 0] = 5.0e6  # a 5000 km span cannot be stored at 1 mm
+        _write_aligned(src, (src, header), huge, str(tmp_path / "huge.las"), str(tmp_path))
+
+
+def test_register_clouds_numpy_engine_writes_aligned_las(tmp_path: Path) -> None:
+    target = _surface(80)
+    source = _moved(target)
+    write_las(tmp_path / "src.las", source, intensity=np.arange(len(source)) % 65535)
+    np.save(tmp_path / "tgt.npy", target)
+    assert select_engine(str(tmp_path / "src.las")) == "numpy"
+
+    res = register_clouds(str(tmp_path / "src.las"), str(tmp_path / "aligned.las"), target_path=str(tmp_path / "tgt.npy"))
+    header = read_las_header(res.aligned_path)
+    assert header is not None and header.point_count == len(source)
+    aligned = las_xyz(res.aligned_path, header)
+    assert np.abs(aligned - target).max() < 5e-3  # 1 mm LAS quantisation plus ICP tolerance
+    intensity = np.asarray(las_field_view(res.aligned_path, header)["intensity"])
+    assert np.array_equal(intensity, np.arange(len(source)) % 65535)  # other fields untouched
+    stats = json.loads(Path(res.residuals_path).read_text())
+    assert stats["engine"] == "numpy" and stats["icp"]["converged"]
+    assert res.rmse < 0.005 and res.inlier_ratio > 0.99
+
+
+def test_register_clouds_reads_a_columnar_target(tmp_path: Path) -> None:
+    from apps.api.app.pipeline.columnar import write_columns
+
+    target = _surface(60)
+    source = _moved(target)
+    write_las(tmp_path / "src.las", source)
+    write_las(tmp_path / "tgt.las", target)
+    write_columns(str(tmp_path / "tgt.las"), str(tmp_path / "tgt_cols"), columns=("x", "y", "z"))
+    assert select_engine(str(tmp_path / "tgt_cols")) == "numpy"
+
+    res = register_clouds(str(tmp_path / "src.las"), str(tmp_path / "aligned.las"), target_path=str(tmp_path / "tgt_cols"))
+    header = read_las_header(res.aligned_path)
+    assert header is not None
+    assert np.abs(las_xyz(res.aligned_path, header) - target).max() < 5e-3
+
+
+def test_register_clouds_stub_engine(tmp_path: Path) -> None:
+    res = register_clouds(str(tmp_path / "in.laz"), str(tmp_path / "out.laz"), engine="stub")
+    assert res.rmse == 0.05 and Path(res.aligned_path).exists()
@@ -41,3 +41,142 @@ def test_chunked_upload_roundtrip(tmp_path) -> None:  # type: ignore[no-redef]
     assert data == b"hello world"
 
 
+
+
+def _send_chunk(upload_id: str, idx: int, total: int, data: bytes, sha256: str | None = None):  # type: ignore[no-untyped-def]
+    files = {
+        "upload_id": (None, upload_id),
+        "chunk_index": (None, str(idx)),
+        "total_chunks": (None, str(total)),
+        "chunk": (f"chunk{idx}", data, "application/octet-stream"),
+    }
+    if sha256 is not None:
+        files["sha256"] = (None, sha256)
+    return client.post("/upload/chunk", files=files)
+
+
+def test_chunked_upload_out_of_order_with_offsets_and_status() -> None:
+    import hashlib
+
+    r = client.post("/upload/chunk/init", params={"filename": "offsets.txt", "chunk_size": 4, "total_size": 11})
+    assert r.status_code == 200
+    upload_id = r.json()["upload_id"]
+    chunks = [b"hell", b"o wo", b"rld"]
+    assert _send_chunk(upload_id, 2, 3, chunks[2]).status_code == 200
+    assert _send_chunk(upload_id, 0, 3, chunks[0], hashlib.sha256(chunks[0]).hexdigest()).status_code == 200
+    # wrong checksum is rejected and the chunk stays missing
+    assert _send_chunk(upload_id, 1, 3, chunks[1], "0" * 64).status_code == 400
+
+    st = client.get("/upload/chunk/status", params={"upload_id": upload_id}).json()
+    assert st["received"] == [0, 2] and st["missing"] == [1] and not st["complete"]
+    assert client.post("/upload/chunk/complete", params={"upload_id": upload_id}).status_code == 400
+
+    assert _send_chunk(upload_id, 1, 3, chunks[1]).status_code == 200
+    rc = client.post("/upload/chunk/complete", params={"upload_id": upload_id})
+    assert rc.status_code == 200
+    body = rc.json()
+    assert body["size"] == 11 and body["chunks"] == 3
+    with open(body["path"], "rb") as f:
+        assert f.read() == b"hello world"
+
+
+def test_upload_streams_and_reports_digest(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import hashlib
+
+    from apps.api.app.config import settings
+
+    payload = b"x" * 50_000
+    monkeypatch.setattr(settings, "upload_chunk_bytes", 4096)
+    r = client.post("/upload", files={"file": ("stream.bin", payload, "application/octet-stream")})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["size"] == len(payload)
+    assert body["sha256"] == hashlib.sha256(payload).hexdigest()
+
+    monkeypatch.setattr(settings, "upload_max_bytes", 1000)
+    r = client.post("/upload", files={"file": ("big.bin", payload, "application/octet-stream")})
+    assert r.status_code == 413
+
+
+def test_chunked_complete_with_ingest_hands_file_over_by_rename(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import os
+    import uuid
+    from types import SimpleNamespace
+
+    from apps.api.app.routers import upload as upload_router
+
+    queued = {}
+    scene_id = uuid.uuid4()
+
+    def _fake_queue(sid, source, crs, **kw):  # type: ignore[no-untyped-def]
+        queued.update(source=source, crs=crs, ino=os.stat(source).st_ino, data=open(source, "rb").read(), **kw)
+        return SimpleNamespace(id="job-1")
+
+    monkeypatch.setattr(upload_router, "create_scene", lambda uri, crs, meta: scene_id)
+    monkeypatch.setattr(upload_router, "queue_ingest", _fake_queue)
+
+    upload_id = client.post("/upload/chunk/init", params={"filename": "scan.las", "chunk_size": 4}).json()["upload_id"]
+    assert _send_chunk(upload_id, 1, 2, b"5678").status_code == 200
+    assert _send_chunk(upload_id, 0, 2, b"1234").status_code == 200
+    data_ino = os.stat(upload_router._session_dir(upload_id) / "data").st_ino
+
+    rc = client.post("/upload/chunk/complete", params={"upload_id": upload_id, "ingest": "true"})
+    assert rc.status_code == 200
+    body = rc.json()
+    assert body["scene_id"] == str(scene_id) and body["job_id"] == "job-1" and "path" not in body
+    assert queued["data"] == b"12345678" and queued["ino"] == data_ino
+    assert queued["cleanup_dir"] and queued["source"].startswith(queued["cleanup_dir"])
+
+    r = client.post(
+        "/upload", params={"ingest": "true"}, files={"file": ("direct.las", b"abc", "application/octet-stream")}
+    )
+    assert r.status_code == 200
+    assert queued["data"] == b"abc" and queued["input_digest"] == (r.json()["sha256"], 3)
+    assert client.post("/upload/chunk/complete", params={"upload_id": upload_id, "ingest": "true", "crs": "bogus"}).status_code == 400
+
+
+def test_chunked_complete_keeps_the_file_when_the_ingest_queue_is_full(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import shutil
+    import uuid
+    from pathlib import Path
+
+    from apps.api.app.jobs import QueueFullError
+    from apps.api.app.routers import upload as upload_router
+
+    def _full_queue(sid, source, crs, *, cleanup_dir=None, **kw):  # type: ignore[no-untyped-def]
+        shutil.rmtree(cleanup_dir, ignore_errors=True)  # what queue_ingest does on QueueFullError
+        raise QueueFullError("ingest queue is full")
+
+    monkeypatch.setattr(upload_router, "create_scene", lambda uri, crs, meta: uuid.uuid4())
+    monkeypatch.setattr(upload_router, "queue_ingest", _full_queue)
+
+    name = f"full-{uuid.uuid4().hex}.las"
+    upload_id = client.post("/upload/chunk/init", params={"filename": name, "chunk_size": 4}).json()["upload_id"]
+    assert _send_chunk(upload_id, 0, 2, b"abcd").status_code == 200
+    assert _send_chunk(upload_id, 1, 2, b"ef").status_code == 200
+
+    rc = client.post("/upload/chunk/complete", params={"upload_id": upload_id, "ingest": "true"})
+    assert rc.status_code == 503
+    saved = Path(rc.json()["detail"]["path"])
+    try:
+        assert saved.name == name and saved.read_bytes() == b"abcdef"
+        assert not list(Path("uploads").glob(f".{name}.*"))
+    finally:
+        saved.unlink(missing_ok=True)
+
+
+def test_failed_resend_of_a_recorded_offset_chunk_marks_it_missing() -> None:
+    upload_id = client.post("/upload/chunk/init", params={"filename": "resend.bin", "chunk_size": 4}).json()["upload_id"]
+    assert _send_chunk(upload_id, 0, 2, b"1234").status_code == 200
+    assert _send_chunk(upload_id, 1, 2, b"56").status_code == 200
+    # Oversize re-send of an already recorded index: the old record must not survive
+    assert _send_chunk(upload_id, 0, 2, b"abcdefgh").status_code == 400
+    status = client.get("/upload/chunk/status", params={"upload_id": upload_id}).json()
+    assert status["missing"] == [0]
+    rc = client.post("/upload/chunk/complete", params={"upload_id": upload_id})
+    assert rc.status_code == 400 and rc.json()["detail"]["missing"] == [0]
+    assert _send_chunk(upload_id, 0, 2, b"1234").status_code == 200
+    rc = client.post("/upload/chunk/complete", params={"upload_id": upload_id})
+    assert rc.status_code == 200
+    with open(rc.json()["path"], "rb") as f:
+        assert f.read() == b"123456"
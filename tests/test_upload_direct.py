@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+
+from apps.api.app.main import app
+from apps.api.app.routers import upload as upload_router
+
+
+client = TestClient(app)
+
+
+class _FakeMinio:
+    def __init__(self) -> None:
+        self.completed: List[Any] = []
+
+    def bucket_exists(self, bucket: str) -> bool:
+        return True
+
+    def _create_multipart_upload(self, bucket: str, object_name: str, headers: Dict[str, str]) -> str:
+        return "mp-1"
+
+    def get_presigned_url(self, method: str, bucket: str, object_name: str, **kw: Any) -> str:
+        q = kw["extra_query_params"]
+        return f"http://minio/{bucket}/{object_name}?uploadId={q['uploadId']}&partNumber={q['partNumber']}"
+
+    def _complete_multipart_upload(self, bucket: str, object_name: str, upload_id: str, parts: List[Any]) -> Any:
+        self.completed = [(p.part_number, p.etag) for p in parts]
+        return SimpleNamespace(etag="final-etag")
+
+    def stat_object(self, bucket: str, object_name: str) -> Any:
+        return SimpleNamespace(size=12 * 1024 * 1024)
+
+
+def test_direct_upload_presigns_parts_and_completes(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    fake = _FakeMinio()
+    monkeypatch.setattr(upload_router, "get_minio_client", lambda: fake)
+    r = client.post("/upload/direct/init", json={"filename": "scan.laz", "size": 12 * 1024 * 1024, "part_size": 5 * 1024 * 1024})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["upload_id"] == "mp-1" and body["object_name"].startswith("uploads/")
+    assert [p["part_number"] for p in body["parts"]] == [1, 2, 3]
+    assert "partNumber=3" in body["parts"][2]["url"]
+
+    parts = [{"part_number": 2, "etag": "b"}, {"part_number": 1, "etag": "a"}, {"part_number": 3, "etag": "c"}]
+    rc = client.post("/upload/direct/complete", json={"object_name": body["object_name"], "upload_id": "mp-1", "parts": parts})
+    assert rc.status_code == 200
+    done = rc.json()
+    assert done["uri"] == f"s3://{body['bucket']}/{body['object_name']}" and done["etag"] == "final-etag"
+    assert fake.completed == [(1, "a"), (2, "b"), (3, "c")]
+
+
+def test_direct_upload_rejects_foreign_objects() -> None:
+    r = client.post("/upload/direct/complete", json={"object_name": "ingest/other.laz", "upload_id": "x"})
+    assert r.status_code == 400